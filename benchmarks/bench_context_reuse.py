@@ -0,0 +1,60 @@
+"""
+Benchmark prefill time with and without Ollama context reuse.
+
+Runs the same multi-turn tutor conversation twice against a live Ollama
+server: once continuing from the stored context tokens, and once replaying the
+full history every turn. Prints prefill tokens and seconds per turn.
+
+Usage:
+    python -m benchmarks.bench_context_reuse [--turns 6] [--model llama3.2]
+"""
+import argparse
+from ollama_setup import OllamaManager
+from models.tutor_model import EngineeringTutor
+
+QUESTIONS = [
+    "What is enthalpy?",
+    "How does it differ from internal energy?",
+    "Why do we use enthalpy for open systems?",
+    "Can you give an example with a steam turbine?",
+    "What assumptions did that example make?",
+    "How would heat losses change the result?",
+    "How would I check my answer?",
+    "What is a common mistake students make here?",
+]
+
+
+def run_conversation(tutor, turns, replay_history):
+    """Run one conversation and return the per-turn prefill records"""
+    session_id = "replay" if replay_history else "context"
+    tutor.reset_conversation(session_id)
+    start = len(tutor.prefill_turns)
+    for question in QUESTIONS[:turns]:
+        if replay_history:
+            tutor.invalidate_context(session_id)
+        tutor.answer_question(question, session_id=session_id)
+    return list(tutor.prefill_turns)[start:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--model", default="llama3.2")
+    args = parser.parse_args()
+
+    tutor = EngineeringTutor(OllamaManager(model_name=args.model))
+    reused = run_conversation(tutor, args.turns, replay_history=False)
+    replayed = run_conversation(tutor, args.turns, replay_history=True)
+
+    print(f"{'turn':>4} {'replay tok':>10} {'replay s':>9} {'reuse tok':>10} {'reuse s':>8} {'saved s':>8}")
+    for i, (full, ctx) in enumerate(zip(replayed, reused), 1):
+        saved = full["prefill_seconds"] - ctx["prefill_seconds"]
+        print(f"{i:>4} {full['prompt_tokens']:>10} {full['prefill_seconds']:>9.3f} "
+              f"{ctx['prompt_tokens']:>10} {ctx['prefill_seconds']:>8.3f} {saved:>8.3f}")
+
+    total_saved = sum(f["prefill_seconds"] for f in replayed) - sum(c["prefill_seconds"] for c in reused)
+    print(f"\nPrefill seconds saved per turn: {total_saved / max(len(reused), 1):.3f}")
+
+
+if __name__ == "__main__":
+    main()
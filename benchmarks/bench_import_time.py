@@ -0,0 +1,103 @@
+"""
+Benchmark cold import time of the app's page and model modules.
+
+Each module is imported in a fresh interpreter with `python -X importtime`.
+The script prints its cumulative import time and the heavy libraries it pulled
+in. With --check it exits non-zero when a module imports a library it must not
+import, or when it takes longer than --max-ms, so CI catches regressions.
+Modules that fail to import (a broken environment rather than a regression)
+are reported separately and do not fail the check unless --strict is given.
+
+Usage:
+    python -m benchmarks.bench_import_time [--check] [--strict] [--max-ms 1500] [--repeat 3]
+"""
+import re
+import sys
+import argparse
+import subprocess
+
+# Heavy libraries to report on
+HEAVY = ("pandas", "numpy", "plotly", "sklearn", "pydantic", "ollama")
+
+# Module -> heavy libraries or submodules it must not import (directly or indirectly).
+# Streamlit itself imports pandas and the top-level plotly package, so views are
+# only checked for plotly.express, which the chart pages use.
+FORBIDDEN = {
+    "models.tutor_model": ("pandas", "plotly"),
+    "models.scenario_generator": ("pandas", "plotly"),
+    "ollama_setup": ("pandas", "plotly"),
+    "views.tutor": ("plotly.express",),
+    "views.scenarios": ("plotly.express",),
+    "views.settings": ("plotly.express",),
+    "views.dashboard": (),
+    "views.assessment": (),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        tuple: (cumulative ms or None, imported module names, import error or None); the
+               names imported before a failed import are still reported
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+
+    cumulative, imported = None, set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            imported.add(match.group(4))
+            if match.group(4) == module:
+                cumulative = int(match.group(2)) / 1000
+    if result.returncode == 0:
+        return cumulative, imported, None
+    lines = result.stderr.strip().splitlines()
+    return None, imported, lines[-1] if lines else f"exit code {result.returncode}"
+
+
+def violations(module, imported, ms=None, max_ms=None):
+    """Forbidden imports of a module, and its import time when above max_ms"""
+    found = [f"{module} imports {lib}" for lib in FORBIDDEN.get(module, ())
+             if any(name == lib or name.startswith(lib + ".") for name in imported)]
+    if max_ms is not None and ms is not None and ms > max_ms:
+        found.append(f"{module} took {ms:.1f} ms (limit {max_ms:.0f} ms)")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=list(FORBIDDEN))
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per module; the fastest is reported")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail --check above this cumulative time")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on forbidden imports or slow modules")
+    parser.add_argument("--strict", action="store_true", help="With --check, also fail when a module cannot be imported")
+    args = parser.parse_args()
+
+    failures, errors = [], []
+    print(f"{'module':<28} {'import ms':>10}  heavy libraries")
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        ms, imported, error = min(runs, key=lambda r: float("inf") if r[0] is None else r[0])
+        roots = {name.split(".")[0] for name in imported}
+        heavy = [lib for lib in HEAVY if lib in roots]
+        timing = "failed" if error else f"{ms:.1f}"
+        print(f"{module:<28} {timing:>10}  {', '.join(heavy) or '-'}")
+        if error:
+            errors.append(f"{module}: {error}")
+        failures += violations(module, imported, ms, args.max_ms)
+
+    if errors:
+        print("\nImport errors (environment problems, not import-time regressions):\n" + "\n".join(errors))
+    if failures:
+        print("\nViolations:\n" + "\n".join(failures))
+    if args.check and (failures or (args.strict and errors)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
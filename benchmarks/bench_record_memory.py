@@ -0,0 +1,91 @@
+"""
+Benchmark memory of conversation turns and scenarios as dicts vs __slots__ records.
+
+Dicts: every turn stored twice, once as a UI chat dict (with an id) and once
+as a tutor history dict, and every scenario as a nested dict whose facet
+strings are separate objects. Records: one shared Message per turn and one
+ScenarioRecord per scenario with interned facets. Message text is allocated
+before measuring, since both layouts reference the same strings; scenarios are
+decoded from JSON in both layouts, so their text is counted in both.
+
+Usage:
+    python -m benchmarks.bench_record_memory [--turns 5000] [--scenarios 1000]
+"""
+import json
+import uuid
+import argparse
+import tracemalloc
+from models.records import Message, ScenarioRecord
+
+FACETS = {
+    "topic": ["Phase Equilibria", "Mass Balances", "Heat Exchanger Design", "Water Treatment"],
+    "difficulty": ["Introductory", "Intermediate", "Challenging", "Advanced"],
+    "type": ["Conceptual Understanding", "Numerical Analysis", "Design Challenge", "Case Study"],
+    "industry": ["Oil & Gas", "Pharmaceuticals", "Food Processing", "Environmental"],
+}
+
+
+def measure(build):
+    """Return bytes allocated by build(), keeping its result alive while measuring"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def scenario_dict(i, text):
+    """Scenario dict in the generator's format"""
+    metadata = {name: values[i % len(values)] for name, values in FACETS.items()}
+    metadata["generated_timestamp"] = f"2025-02-{i % 28 + 1:02d}T10:00:00.{i:06d}"
+    return {"id": uuid.uuid4().hex, "scenario_text": text, "sections": None, "metadata": metadata,
+            "duplicate_of": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--scenarios", type=int, default=1000)
+    args = parser.parse_args()
+
+    texts = [f"Turn {i}: " + "entropy " * 40 for i in range(args.turns)]
+    roles = ["user", "assistant"]
+
+    def turn_dicts():
+        ui, tutor = [], []
+        for i, text in enumerate(texts):
+            role = "".join(roles[i % 2])
+            ui.append({"id": uuid.uuid4().hex, "role": role, "content": text})
+            tutor.append({"role": role, "content": text})
+        return ui, tutor
+
+    def turn_records():
+        return [Message.create("".join(roles[i % 2]), text) for i, text in enumerate(texts)]
+
+    scenario_texts = [f"Scenario {i}: " + "reactor " * 200 for i in range(args.scenarios)]
+    serialized = [json.dumps(scenario_dict(i, text)) for i, text in enumerate(scenario_texts)]
+
+    def scenario_dicts():
+        return [json.loads(raw) for raw in serialized]
+
+    def scenario_records():
+        return [ScenarioRecord.from_dict(json.loads(raw)) for raw in serialized]
+
+    rows = [
+        ("turns as dicts (UI + tutor)", measure(turn_dicts), args.turns),
+        ("turns as Message", measure(turn_records), args.turns),
+        ("scenarios as dicts", measure(scenario_dicts), args.scenarios),
+        ("scenarios as ScenarioRecord", measure(scenario_records), args.scenarios),
+    ]
+    print(f"{'layout':<30} {'total KB':>10} {'bytes/item':>11}")
+    for name, allocated, count in rows:
+        print(f"{name:<30} {allocated / 1024:>10.1f} {allocated / count:>11.0f}")
+
+    print(f"\nTurns: {1 - rows[1][1] / rows[0][1]:.0%} less memory; "
+          f"scenarios: {1 - rows[3][1] / rows[2][1]:.0%} less memory")
+
+
+if __name__ == "__main__":
+    main()
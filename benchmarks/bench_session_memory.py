@@ -0,0 +1,56 @@
+"""
+Benchmark per-session memory of the seeded reference data.
+
+Simulates many browser sessions and measures, with tracemalloc, the memory
+allocated for their reference data when every session builds its own copy
+(the previous init_session_state behaviour) and when sessions share the
+read-only seed and copy a field only on first edit.
+
+Usage:
+    python -m benchmarks.bench_session_memory [--sessions 500] [--edit-fraction 0.1]
+"""
+import argparse
+import tracemalloc
+from utils.seed_data import SEED_DATA, seed_session, editable, thaw
+
+
+def measure(build, sessions):
+    """Return bytes allocated per session by build(), keeping every session alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [build(i) for i in range(sessions)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del states
+    return allocated / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--edit-fraction", type=float, default=0.1,
+                        help="Share of sessions that edit assessment_questions (copy-on-write)")
+    args = parser.parse_args()
+    edit_every = int(1 / args.edit_fraction) if args.edit_fraction > 0 else 0
+
+    def per_session_copies(_):
+        return {name: thaw(value) for name, value in SEED_DATA.items()}
+
+    def shared_seed(i):
+        state = {}
+        seed_session(state)
+        if edit_every and i % edit_every == 0:
+            editable(state, "assessment_questions")
+        return state
+
+    copies = measure(per_session_copies, args.sessions)
+    shared = measure(shared_seed, args.sessions)
+    print(f"{'strategy':<22} {'bytes/session':>14}")
+    print(f"{'per-session copies':<22} {copies:>14.0f}")
+    print(f"{'shared seed + CoW':<22} {shared:>14.0f}")
+    print(f"\nReduction: {1 - shared / copies:.0%} across {args.sessions} sessions "
+          f"({args.edit_fraction:.0%} editing assessment_questions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import logging
+
+logger = logging.getLogger("EngE-AI.database")
+
+# Default location of the EngE-AI database
+DB_PATH = os.getenv("ENGE_AI_DB_PATH", os.path.join("database", "enge_ai.db"))
+
+# Table and index definitions, applied idempotently by init_db
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS scenarios (
+        id TEXT PRIMARY KEY,
+        topic TEXT,
+        difficulty TEXT,
+        type TEXT,
+        industry TEXT,
+        variant TEXT,
+        scenario_text TEXT NOT NULL,
+        sections TEXT,
+        metadata TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        duplicate_of TEXT,
+        created_at TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_scenarios_facets ON scenarios (topic, difficulty, type, industry)",
+    "CREATE INDEX IF NOT EXISTS idx_scenarios_difficulty ON scenarios (difficulty)",
+    "CREATE INDEX IF NOT EXISTS idx_scenarios_type ON scenarios (type)",
+    "CREATE INDEX IF NOT EXISTS idx_scenarios_industry ON scenarios (industry)",
+    """CREATE TABLE IF NOT EXISTS scenario_views (
+        instructor_id TEXT NOT NULL,
+        scenario_id TEXT NOT NULL,
+        served_at TEXT NOT NULL,
+        PRIMARY KEY (instructor_id, scenario_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS grades (
+        answer_hash TEXT NOT NULL,
+        rubric_version TEXT NOT NULL,
+        model TEXT NOT NULL,
+        score REAL NOT NULL,
+        level TEXT NOT NULL,
+        dimension_scores TEXT NOT NULL,
+        feedback TEXT,
+        graded_at TEXT NOT NULL,
+        PRIMARY KEY (answer_hash, rubric_version, model)
+    )""",
+    """CREATE TABLE IF NOT EXISTS stage_guidance (
+        problem_hash TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        prompt_hash TEXT NOT NULL,
+        model TEXT NOT NULL,
+        guidance TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (problem_hash, stage, prompt_hash, model)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_stage_guidance_prompt ON stage_guidance (prompt_hash)",
+    """CREATE TABLE IF NOT EXISTS scaffolds (
+        topic TEXT NOT NULL,
+        course TEXT NOT NULL,
+        framework_version TEXT NOT NULL,
+        framework TEXT NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (topic, course, framework_version)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_scaffolds_last_used ON scaffolds (last_used)",
+]
+
+# Columns added after their table was first created: (table, column, type), added by init_db if missing
+ADDED_COLUMNS = [
+    ("scenarios", "variant", "TEXT"),
+]
+
+
+def get_connection(db_path=None):
+    """
+    Open a connection to the EngE-AI database
+
+    Args:
+        db_path (str, optional): Path to the SQLite file (defaults to DB_PATH)
+
+    Returns:
+        sqlite3.Connection: Connection usable from multiple threads with rows as sqlite3.Row
+    """
+    db_path = db_path or DB_PATH
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def init_db(db_path=None):
+    """
+    Create all tables and indexes if they do not exist
+
+    Args:
+        db_path (str, optional): Path to the SQLite file (defaults to DB_PATH)
+
+    Returns:
+        sqlite3.Connection: Initialized connection
+    """
+    conn = get_connection(db_path)
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for table, column, column_type in ADDED_COLUMNS:
+            columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    logger.info(f"Database initialized at {db_path or DB_PATH}")
+    return conn
@@ -0,0 +1,73 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+from database.db_setup import init_db
+
+logger = logging.getLogger("EngE-AI.grade_cache")
+
+
+class GradeCache:
+    """
+    Persistent cache of rubric grades keyed by (answer hash, rubric version, model)
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Open (or create) the grade cache
+
+        Args:
+            db_path (str, optional): Path to the SQLite database
+        """
+        self._conn = init_db(db_path)
+        self._lock = threading.Lock()
+
+    def get(self, answer_hash: str, rubric_version: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached grade
+
+        Args:
+            answer_hash (str): Hash of the question and normalized answer
+            rubric_version (str): Rubric version the grade was produced under
+            model (str): Model that produced the grade
+
+        Returns:
+            dict: Cached grade or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, level, dimension_scores, feedback FROM grades "
+                "WHERE answer_hash = ? AND rubric_version = ? AND model = ?",
+                (answer_hash, rubric_version, model)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "score": row["score"],
+            "level": row["level"],
+            "dimension_scores": json.loads(row["dimension_scores"]),
+            "feedback": row["feedback"]
+        }
+
+    def put(self, answer_hash: str, rubric_version: str, model: str, grade: Dict[str, Any]):
+        """
+        Store a grade, replacing any previous grade for the same key
+
+        Args:
+            answer_hash (str): Hash of the question and normalized answer
+            rubric_version (str): Rubric version the grade was produced under
+            model (str): Model that produced the grade
+            grade (dict): Grade with score, level, dimension_scores and feedback
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO grades (answer_hash, rubric_version, model, score, level, "
+                "dimension_scores, feedback, graded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (answer_hash, rubric_version, model, grade["score"], grade["level"],
+                 json.dumps(grade["dimension_scores"]), grade.get("feedback"), datetime.now().isoformat())
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM grades").fetchone()[0]
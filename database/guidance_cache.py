@@ -0,0 +1,80 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Optional, Iterable
+from database.db_setup import init_db
+
+logger = logging.getLogger("EngE-AI.guidance_cache")
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of a problem or prompt text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class GuidanceCache:
+    """
+    Persistent cache of critical thinking stage guidance.
+
+    Entries are keyed by (problem hash, stage, prompt hash, model); the prompt
+    hash covers the stage prompt and system prompt, so editing a problem or a
+    stage prompt simply misses the cache instead of serving stale guidance.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Open (or create) the guidance cache
+
+        Args:
+            db_path (str, optional): Path to the SQLite database
+        """
+        self._conn = init_db(db_path)
+        self._lock = threading.Lock()
+
+    def get(self, problem_hash: str, stage: str, prompt_hash: str, model: str) -> Optional[str]:
+        """Look up cached guidance, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT guidance FROM stage_guidance "
+                "WHERE problem_hash = ? AND stage = ? AND prompt_hash = ? AND model = ?",
+                (problem_hash, stage, prompt_hash, model)
+            ).fetchone()
+        return row["guidance"] if row else None
+
+    def put(self, problem_hash: str, stage: str, prompt_hash: str, model: str, guidance: str):
+        """Store guidance, replacing any previous entry for the same key"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_guidance (problem_hash, stage, prompt_hash, model, guidance, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (problem_hash, stage, prompt_hash, model, guidance, datetime.now().isoformat())
+            )
+
+    def prune(self, problem_hashes: Iterable[str], prompt_hashes: Iterable[str]) -> int:
+        """
+        Delete entries for problems or prompts that no longer exist
+
+        Args:
+            problem_hashes (iterable): Hashes of the current problems
+            prompt_hashes (iterable): Hashes of the current stage prompts
+
+        Returns:
+            int: Number of entries deleted
+        """
+        problem_hashes, prompt_hashes = list(problem_hashes), list(prompt_hashes)
+        problems = ", ".join("?" * len(problem_hashes)) or "NULL"
+        prompts = ", ".join("?" * len(prompt_hashes)) or "NULL"
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"DELETE FROM stage_guidance WHERE problem_hash NOT IN ({problems}) "
+                f"OR prompt_hash NOT IN ({prompts})",
+                problem_hashes + prompt_hashes
+            )
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} stale stage guidance entries")
+        return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM stage_guidance").fetchone()[0]
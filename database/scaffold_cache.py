@@ -0,0 +1,64 @@
+import json
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+from database.db_setup import init_db
+
+logger = logging.getLogger("EngE-AI.scaffold_cache")
+
+
+class ScaffoldCache:
+    """
+    Persistent LRU cache of topic-specific critical thinking scaffolds
+
+    Entries are keyed by (topic, course, framework version) and the least
+    recently used entries are evicted once the cache holds max_entries.
+    """
+
+    def __init__(self, db_path=None, max_entries=500):
+        """
+        Open (or create) the scaffold cache
+
+        Args:
+            db_path (str, optional): Path to the SQLite database
+            max_entries (int): Number of scaffolds kept before LRU eviction
+        """
+        self.max_entries = max_entries
+        self._conn = init_db(db_path)
+        self._lock = threading.Lock()
+
+    def get(self, topic: str, course: Optional[str], version: str) -> Optional[Dict[str, Any]]:
+        """Look up a scaffold and mark it as recently used, or return None"""
+        key = (topic, course or "", version)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT framework FROM scaffolds WHERE topic = ? AND course = ? AND framework_version = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE scaffolds SET last_used = ? WHERE topic = ? AND course = ? AND framework_version = ?",
+                (time.time(),) + key
+            )
+        return json.loads(row["framework"])
+
+    def put(self, topic: str, course: Optional[str], version: str, framework: Dict[str, Any]):
+        """Store a scaffold, evicting the least recently used entries beyond max_entries"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scaffolds (topic, course, framework_version, framework, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (topic, course or "", version, json.dumps(framework), time.time())
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM scaffolds WHERE rowid IN (SELECT rowid FROM scaffolds "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if cursor.rowcount:
+            logger.info(f"Evicted {cursor.rowcount} least recently used scaffolds")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scaffolds").fetchone()[0]
@@ -0,0 +1,369 @@
+import re
+import json
+import uuid
+import zlib
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from database.db_setup import init_db
+
+logger = logging.getLogger("EngE-AI.scenario_bank")
+
+# Prime just above 2**32 for the universal hash family used by MinHash
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# Facet name -> database column
+FACETS = {
+    "topic": "topic",
+    "difficulty": "difficulty",
+    "scenario_type": "type",
+    "industry": "industry",
+    "variant": "variant",
+}
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles of scenario text
+    """
+
+    def __init__(self, num_perm=128, shingle_size=3, seed=42):
+        """
+        Initialize the hash permutations
+
+        Args:
+            num_perm (int): Number of hash permutations (signature length)
+            shingle_size (int): Number of consecutive words per shingle
+            seed (int): Seed for the permutation parameters, fixed so signatures stay comparable
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set:
+        """Split normalized text into word shingles"""
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text (str): Scenario text
+
+        Returns:
+            np.ndarray: uint32 signature of length num_perm
+        """
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in self.shingles(text)), dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two signatures"""
+        return float(np.mean(sig_a == sig_b))
+
+
+class ScenarioBank:
+    """
+    Persistent scenario bank with near-duplicate detection and faceted lookup.
+
+    Scenarios are stored in SQLite with indexed facet columns. MinHash
+    signatures are kept in an in-memory LSH index so near-duplicates are found
+    at insert time without comparing against every stored scenario.
+    """
+
+    def __init__(self, db_path=None, num_perm=128, bands=16,
+                 similarity_threshold=0.8, duplicate_policy="reject"):
+        """
+        Open (or create) the scenario bank
+
+        Args:
+            db_path (str, optional): Path to the SQLite database
+            num_perm (int): MinHash signature length
+            bands (int): Number of LSH bands (num_perm must be divisible by bands)
+            similarity_threshold (float): Estimated Jaccard similarity above which scenarios are near-duplicates
+            duplicate_policy (str): "reject" to drop near-duplicates, "flag" to store them with duplicate_of set
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        if duplicate_policy not in ("reject", "flag"):
+            raise ValueError("duplicate_policy must be 'reject' or 'flag'")
+
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.similarity_threshold = similarity_threshold
+        self.duplicate_policy = duplicate_policy
+        self.stats = {"inserted": 0, "flagged": 0, "rejected": 0}
+
+        self._conn = init_db(db_path)
+        self._lock = threading.RLock()
+        self._buckets = {}
+        self._signatures = {}
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the in-memory LSH index from stored signatures"""
+        rows = self._conn.execute("SELECT id, signature FROM scenarios WHERE duplicate_of IS NULL").fetchall()
+        for row in rows:
+            self._index(row["id"], np.frombuffer(row["signature"], dtype=np.uint32))
+        logger.info(f"Loaded scenario bank with {len(rows)} unique scenarios")
+
+    def _band_keys(self, signature: np.ndarray):
+        """Yield one hashable key per LSH band"""
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _index(self, scenario_id: str, signature: np.ndarray):
+        """Add a signature to the LSH buckets"""
+        self._signatures[scenario_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(scenario_id)
+
+    def find_near_duplicate(self, scenario_text: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar stored scenario above the similarity threshold
+
+        Args:
+            scenario_text (str): Text to check
+
+        Returns:
+            tuple: (scenario_id, similarity) or None if no near-duplicate exists
+        """
+        signature = self.hasher.signature(scenario_text)
+        with self._lock:
+            return self._best_match(signature)
+
+    def _best_match(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Compare a signature against its LSH candidates only"""
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        best = None
+        for candidate_id in candidates:
+            similarity = self.hasher.similarity(signature, self._signatures[candidate_id])
+            if similarity >= self.similarity_threshold and (best is None or similarity > best[1]):
+                best = (candidate_id, similarity)
+        return best
+
+    def add(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a scenario, checking for near-duplicates first
+
+        Args:
+            scenario (dict): Scenario as returned by ScenarioGenerator.generate_scenario
+
+        Returns:
+            dict: {"id": stored id or None if rejected, "duplicate_of": matching id or None, "similarity": float}
+        """
+        metadata = scenario.get("metadata", {})
+        signature = self.hasher.signature(scenario["scenario_text"])
+
+        with self._lock:
+            match = self._best_match(signature)
+            if match and self.duplicate_policy == "reject":
+                self.stats["rejected"] += 1
+                logger.info(f"Rejected near-duplicate of scenario {match[0]} (similarity {match[1]:.2f})")
+                return {"id": None, "duplicate_of": match[0], "similarity": match[1]}
+
+            scenario_id = scenario.get("id") or uuid.uuid4().hex
+            duplicate_of = match[0] if match else None
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO scenarios (id, topic, difficulty, type, industry, variant, scenario_text, sections, "
+                    "metadata, signature, duplicate_of, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (scenario_id, metadata.get("topic"), metadata.get("difficulty"), metadata.get("type"),
+                     metadata.get("industry"), metadata.get("variant"), scenario["scenario_text"],
+                     json.dumps(scenario.get("sections")) if scenario.get("sections") else None,
+                     json.dumps(metadata), signature.tobytes(), duplicate_of,
+                     metadata.get("generated_timestamp") or datetime.now().isoformat())
+                )
+            if duplicate_of:
+                self.stats["flagged"] += 1
+            else:
+                self._index(scenario_id, signature)
+                self.stats["inserted"] += 1
+
+        return {"id": scenario_id, "duplicate_of": duplicate_of, "similarity": match[1] if match else 0.0}
+
+    def _query(self, query: str, params=()):
+        """Run a read query under the bank lock and fetch all rows"""
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    @staticmethod
+    def _row_to_scenario(row) -> Dict[str, Any]:
+        """Convert a database row back into the scenario dictionary format"""
+        return {
+            "id": row["id"],
+            "scenario_text": row["scenario_text"],
+            "sections": json.loads(row["sections"]) if row["sections"] else None,
+            "metadata": json.loads(row["metadata"]),
+            "duplicate_of": row["duplicate_of"],
+        }
+
+    def get(self, scenario_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single scenario by id"""
+        rows = self._query("SELECT * FROM scenarios WHERE id = ?", (scenario_id,))
+        return self._row_to_scenario(rows[0]) if rows else None
+
+    def headers(self, scenario_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the facet columns of several scenarios without their text
+
+        Args:
+            scenario_ids (list): Scenario ids
+
+        Returns:
+            dict: id -> {"id", "topic", "difficulty", "type", "industry", "created_at"}
+        """
+        if not scenario_ids:
+            return {}
+        rows = self._query("SELECT id, topic, difficulty, type, industry, created_at FROM scenarios "
+                           "WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(list(scenario_ids)),))
+        return {row["id"]: dict(row) for row in rows}
+
+    def search_ids(self, scenario_ids: List[str], query: str) -> set:
+        """
+        Find which of the given scenarios mention a search text
+
+        Args:
+            scenario_ids (list): Scenario ids to search within
+            query (str): Case-insensitive text matched against the facets and scenario text
+
+        Returns:
+            set: Ids of matching scenarios
+        """
+        if not scenario_ids:
+            return set()
+        pattern = "%" + re.sub(r"([%_\\])", r"\\\1", query) + "%"
+        rows = self._query("SELECT id FROM scenarios WHERE id IN (SELECT value FROM json_each(?)) AND "
+                           "(topic LIKE ? ESCAPE '\\' OR industry LIKE ? ESCAPE '\\' "
+                           "OR scenario_text LIKE ? ESCAPE '\\')",
+                           (json.dumps(list(scenario_ids)), pattern, pattern, pattern))
+        return {row["id"] for row in rows}
+
+    def _facet_filter(self, facets: Dict[str, Optional[str]], include_duplicates: bool):
+        """Build a WHERE clause over the indexed facet columns"""
+        clauses, params = [], []
+        for name, value in facets.items():
+            if value is not None:
+                clauses.append(f"{FACETS[name]} = ?")
+                params.append(value)
+        if not include_duplicates:
+            clauses.append("duplicate_of IS NULL")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def find(self, topic=None, difficulty=None, scenario_type=None, industry=None, variant=None,
+             limit=None, include_duplicates=False) -> List[Dict[str, Any]]:
+        """
+        Faceted lookup using the indexed columns
+
+        Args:
+            topic (str, optional): Topic to match
+            difficulty (str, optional): Difficulty to match
+            scenario_type (str, optional): Scenario type to match
+            industry (str, optional): Industry to match
+            variant (str, optional): Prompt-instructions key to match (see scenario_generator.instructions_variant)
+            limit (int, optional): Maximum number of scenarios to return
+            include_duplicates (bool): Whether to include flagged near-duplicates
+
+        Returns:
+            list: Matching scenarios, newest first
+        """
+        where, params = self._facet_filter(
+            {"topic": topic, "difficulty": difficulty, "scenario_type": scenario_type, "industry": industry,
+             "variant": variant},
+            include_duplicates)
+        query = f"SELECT * FROM scenarios{where} ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [self._row_to_scenario(row) for row in self._query(query, params)]
+
+    def count(self, topic=None, difficulty=None, scenario_type=None, industry=None, variant=None,
+              include_duplicates=False) -> int:
+        """Count scenarios matching the given facets"""
+        where, params = self._facet_filter(
+            {"topic": topic, "difficulty": difficulty, "scenario_type": scenario_type, "industry": industry,
+             "variant": variant},
+            include_duplicates)
+        return self._query(f"SELECT COUNT(*) FROM scenarios{where}", params)[0][0]
+
+    def find_unseen(self, instructor_id: str, topic=None, difficulty=None, scenario_type=None,
+                    industry=None, variant=None, limit=1) -> List[Dict[str, Any]]:
+        """
+        Find scenarios matching the facets that an instructor has not been served yet
+
+        Args:
+            instructor_id (str): Instructor to check against
+            topic (str, optional): Topic to match
+            difficulty (str, optional): Difficulty to match
+            scenario_type (str, optional): Scenario type to match
+            industry (str, optional): Industry to match
+            variant (str, optional): Prompt-instructions key to match (see scenario_generator.instructions_variant)
+            limit (int): Maximum number of scenarios to return
+
+        Returns:
+            list: Unseen scenarios, oldest first so the bank is consumed in order
+        """
+        where, params = self._facet_filter(
+            {"topic": topic, "difficulty": difficulty, "scenario_type": scenario_type, "industry": industry,
+             "variant": variant},
+            include_duplicates=False)
+        query = (f"SELECT * FROM scenarios{where} AND NOT EXISTS (SELECT 1 FROM scenario_views v "
+                 f"WHERE v.instructor_id = ? AND v.scenario_id = scenarios.id) ORDER BY created_at LIMIT ?")
+        rows = self._query(query, params + [instructor_id, limit])
+        return [self._row_to_scenario(row) for row in rows]
+
+    def count_unseen(self, instructor_id: str, topic=None, difficulty=None, scenario_type=None,
+                     industry=None, variant=None) -> int:
+        """Count scenarios matching the facets that an instructor has not been served yet"""
+        where, params = self._facet_filter(
+            {"topic": topic, "difficulty": difficulty, "scenario_type": scenario_type, "industry": industry,
+             "variant": variant},
+            include_duplicates=False)
+        query = (f"SELECT COUNT(*) FROM scenarios{where} AND NOT EXISTS (SELECT 1 FROM scenario_views v "
+                 f"WHERE v.instructor_id = ? AND v.scenario_id = scenarios.id)")
+        return self._query(query, params + [instructor_id])[0][0]
+
+    def mark_seen(self, instructor_id: str, scenario_id: str):
+        """Record that a scenario has been served to an instructor"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO scenario_views (instructor_id, scenario_id, served_at) VALUES (?, ?, ?)",
+                (instructor_id, scenario_id, datetime.now().isoformat())
+            )
+
+    def __len__(self):
+        return self.count(include_duplicates=True)
+
+    def export(self, output_file: str, include_duplicates=False) -> int:
+        """
+        Stream scenarios to a JSON Lines file without loading the whole bank
+
+        Args:
+            output_file (str): Path to output file
+            include_duplicates (bool): Whether to export flagged near-duplicates
+
+        Returns:
+            int: Number of scenarios exported
+        """
+        where = "" if include_duplicates else " WHERE duplicate_of IS NULL"
+        exported = 0
+        with open(output_file, "w") as f:
+            for row in self._conn.execute(f"SELECT * FROM scenarios{where} ORDER BY created_at"):
+                f.write(json.dumps(self._row_to_scenario(row), separators=(",", ":")) + "\n")
+                exported += 1
+        return exported
@@ -0,0 +1,181 @@
+import re
+import threading
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+# Record fields with a sorted index
+SORT_FIELDS = ("pre_score", "post_score", "improvement")
+
+
+class StudentStore:
+    """
+    In-memory store of student assessment records with secondary indexes.
+
+    Records are looked up through a hash index on student_id. Scores and
+    improvement are kept in sorted (value, student_id) lists maintained with
+    bisect, so sorted pages and score-range filters never sort or scan the
+    whole cohort. Lower-cased ids, full names and each word of a name are kept
+    sorted for prefix (typeahead) search, so "smi" finds "Taylor Smith".
+    Records are treated as immutable: upsert replaces a record rather than
+    modifying it, so copies of a store can share records.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), read_only=False):
+        """
+        Build the store and its indexes
+
+        Args:
+            records (iterable): Assessment records with student_id
+            read_only (bool): Reject writes; shared stores are edited through copy()
+        """
+        self._records = {}
+        self._sorted = {field: [] for field in SORT_FIELDS}
+        self._names = []
+        self._lock = threading.Lock()
+        for record in records:
+            self._insert(record)
+        self.read_only = read_only
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._records.values()))
+
+    def get(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a record by student id"""
+        return self._records.get(student_id)
+
+    @staticmethod
+    def _name_keys(record: Dict[str, Any]) -> List[Tuple[str, str]]:
+        student_id = record["student_id"]
+        name = str(record.get("name") or "").lower().strip()
+        keys = {student_id.lower(), name, *re.split(r"[\s-]+", name)}
+        return [(key, student_id) for key in keys if key]
+
+    def _index(self, record: Dict[str, Any]):
+        for field, index in self._sorted.items():
+            if record.get(field) is not None:
+                insort(index, (record[field], record["student_id"]))
+        for key in self._name_keys(record):
+            insort(self._names, key)
+
+    def _unindex(self, record: Dict[str, Any]):
+        for field, index in self._sorted.items():
+            if record.get(field) is not None:
+                del index[bisect_left(index, (record[field], record["student_id"]))]
+        for key in self._name_keys(record):
+            del self._names[bisect_left(self._names, key)]
+
+    def _insert(self, record: Dict[str, Any]):
+        self._records[record["student_id"]] = record
+        self._index(record)
+
+    def upsert(self, record: Dict[str, Any]):
+        """
+        Insert a record or replace the record with the same student id
+
+        Args:
+            record (dict): Assessment record with student_id
+        """
+        if self.read_only:
+            raise RuntimeError("StudentStore is read-only; edit a copy()")
+        with self._lock:
+            existing = self._records.get(record["student_id"])
+            if existing is not None:
+                self._unindex(existing)
+            # A replaced record keeps its place in insertion order
+            self._insert(record)
+
+    def copy(self) -> "StudentStore":
+        """Writable copy sharing the (immutable) records"""
+        store = StudentStore()
+        with self._lock:
+            store._records = dict(self._records)
+            store._sorted = {field: list(index) for field, index in self._sorted.items()}
+            store._names = list(self._names)
+        return store
+
+    def page(self, offset=0, limit=25, sort_by: Optional[str] = None, descending=False,
+             min_value: Optional[float] = None, max_value: Optional[float] = None,
+             dimension: Optional[str] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        One page of records, sorted and filtered through the indexes
+
+        Args:
+            offset (int): Number of matching records to skip
+            limit (int): Maximum number of records to return
+            sort_by (str, optional): One of SORT_FIELDS; insertion order when omitted
+            descending (bool): Sort from highest to lowest
+            min_value (float, optional): Lowest sort_by value to include (requires sort_by)
+            max_value (float, optional): Highest sort_by value to include (requires sort_by)
+            dimension (str, optional): Only records whose weakest_dimension matches
+
+        Returns:
+            tuple: (number of matching records, records on the page)
+        """
+        with self._lock:
+            if sort_by is None:
+                if dimension is None:
+                    page_ids = list(islice(self._records, offset, offset + limit))
+                    return len(self._records), [self._records[student_id] for student_id in page_ids]
+                ids = list(self._records)
+            else:
+                if sort_by not in self._sorted:
+                    raise ValueError(f"Cannot sort by {sort_by}; choose one of {', '.join(SORT_FIELDS)}")
+                index = self._sorted[sort_by]
+                lo = 0 if min_value is None else bisect_left(index, (min_value,))
+                hi = len(index) if max_value is None else bisect_right(index, (max_value, chr(0x10FFFF)))
+                # An empty range (min_value > max_value) matches nothing
+                hi = max(lo, hi)
+                # Records without a value sort last unless a range filter excludes them
+                missing = []
+                if min_value is None and max_value is None and len(index) < len(self._records):
+                    indexed = {student_id for _, student_id in index}
+                    missing = [student_id for student_id in self._records if student_id not in indexed]
+
+                if dimension is None:
+                    # Only the requested page is read from the index
+                    start, stop = min(lo + offset, hi), min(lo + offset + limit, hi)
+                    if descending:
+                        start, stop = max(hi - offset - limit, lo), max(hi - offset, lo)
+                    entries = index[start:stop]
+                    page_ids = [student_id for _, student_id in (reversed(entries) if descending else entries)]
+                    page_ids += missing[max(0, offset - (hi - lo)):max(0, offset + limit - (hi - lo))]
+                    return hi - lo + len(missing), [self._records[student_id] for student_id in page_ids]
+
+                ranged = index[lo:hi]
+                ids = [student_id for _, student_id in (reversed(ranged) if descending else ranged)] + missing
+            records = self._records
+
+        if dimension is not None:
+            ids = [student_id for student_id in ids if records[student_id].get("weakest_dimension") == dimension]
+        return len(ids), [records[student_id] for student_id in ids[offset:offset + limit]]
+
+    def search(self, prefix: str, limit=10) -> List[Dict[str, Any]]:
+        """
+        Typeahead search on student id or name prefix
+
+        Args:
+            prefix (str): Case-insensitive prefix of a student id, full name or any word of the name
+            limit (int): Maximum number of records to return
+
+        Returns:
+            list: Matching records in alphabetical order of the matched key
+        """
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        matches, seen = [], set()
+        with self._lock:
+            position = bisect_left(self._names, (prefix,))
+            while position < len(self._names) and len(matches) < limit:
+                key, student_id = self._names[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if student_id not in seen:
+                    seen.add(student_id)
+                    matches.append(self._records[student_id])
+        return matches
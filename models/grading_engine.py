@@ -0,0 +1,288 @@
+import re
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from pydantic import ValidationError
+from utils.critical_thinking import CriticalThinkingFramework
+from models.grading_schema import GradeResult
+from database.grade_cache import GradeCache
+
+logger = logging.getLogger("EngE-AI.grading")
+
+GRADER_SYSTEM_PROMPT = """You are an experienced chemical engineering instructor grading written critical thinking assessment responses.
+Grade strictly against the rubric. Judge the quality of reasoning, not the length or style of the answer.
+Score every critical thinking dimension out of 100, give an overall score out of 100, name the rubric level
+that matches the overall score, and write two or three sentences of actionable feedback addressed to the student."""
+
+
+class GradingEngine:
+    """
+    Grades written critical thinking responses against the rubric with Ollama.
+
+    Grades are cached by (answer hash, rubric version, model), so re-running a
+    cohort only sends new or edited answers to the model and an interrupted
+    batch resumes where it stopped. With a pre-scorer, answers that closely
+    match graded exemplars are scored from embeddings alone.
+    """
+
+    def __init__(self, ollama_manager, ct_framework=None, grade_cache=None, model=None,
+                 max_workers=4, max_retries=2, prescorer=None):
+        """
+        Initialize the grading engine
+
+        Args:
+            ollama_manager: Instance of OllamaManager
+            ct_framework (CriticalThinkingFramework, optional): Source of the rubric and dimensions
+            grade_cache (GradeCache, optional): Persistent grade cache
+            model (str, optional): Grading model (defaults to the manager's model)
+            max_workers (int): Concurrent grading requests in a batch
+            max_retries (int): Re-prompts after a grade fails schema validation
+            prescorer (EmbeddingPreScorer, optional): Scores confident answers without an LLM call
+        """
+        self.ollama = ollama_manager
+        self.ct_framework = ct_framework or CriticalThinkingFramework()
+        self.cache = grade_cache if grade_cache is not None else GradeCache()
+        self.model = model
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.prescorer = prescorer
+        self.rubric_prompt = self.ct_framework.get_rubric_prompt()
+
+    @property
+    def model_name(self) -> str:
+        """Model used for grading"""
+        return self.model or self.ollama.model_name
+
+    @staticmethod
+    def answer_hash(question: str, answer: str) -> str:
+        """
+        Hash a question and a whitespace/case-normalized answer
+
+        Args:
+            question (str): Assessment question text
+            answer (str): Student's written response
+
+        Returns:
+            str: Hex digest identifying the answer
+        """
+        normalized = re.sub(r"\s+", " ", answer).strip().lower()
+        return hashlib.sha256(f"{question}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def _build_prompt(self, question: Dict[str, Any], answer: str) -> str:
+        """Build the grading prompt for one response"""
+        schema = json.dumps(GradeResult.model_json_schema())
+        dimensions = ", ".join(self.ct_framework.dimensions)
+        return (f"Question ({question.get('dimension', 'General')}, {question.get('points', 10)} points):\n"
+                f"{question['question']}\n\n"
+                f"{self.rubric_prompt}\n"
+                f"Student response:\n\"\"\"\n{answer}\n\"\"\"\n\n"
+                f"Respond only with a JSON object that matches this JSON schema:\n{schema}\n"
+                f"dimension_scores must contain exactly these keys: {dimensions}.")
+
+    def _grade_with_llm(self, question: Dict[str, Any], answer: str) -> Optional[Dict[str, Any]]:
+        """Ask the model for a grade, re-prompting with validation errors"""
+        prompt = self._build_prompt(question, answer)
+        for attempt in range(self.max_retries + 1):
+            raw = self.ollama.generate_response(
+                prompt=prompt,
+                system_prompt=GRADER_SYSTEM_PROMPT,
+                temperature=0.1,
+                format="json",
+                model=self.model_name
+            )
+            try:
+                grade = GradeResult.model_validate_json(
+                    raw, context={"dimensions": list(self.ct_framework.dimensions)}).model_dump()
+            except ValidationError as e:
+                logger.warning(f"Grade failed validation (attempt {attempt + 1}): {e.error_count()} errors")
+                prompt = (f"{self._build_prompt(question, answer)}\n"
+                          f"Your previous answer was invalid:\n{str(e)}\nFix these errors.")
+                continue
+            # The level is derived from the score so it always agrees with the rubric ranges
+            grade["level"] = self.ct_framework.get_rubric_level(grade["score"])
+            return grade
+
+        logger.error("Grading failed after all retries")
+        return None
+
+    def grade(self, question: Dict[str, Any], answer: str) -> Optional[Dict[str, Any]]:
+        """
+        Grade one response, using the cache when the answer is unchanged
+
+        Args:
+            question (dict): Assessment question with 'question', 'dimension' and 'points'
+            answer (str): Student's written response
+
+        Returns:
+            dict: score, level, dimension_scores, feedback, points_awarded and cached flag, or None on failure
+        """
+        key = self.answer_hash(question["question"], answer)
+        version = self.ct_framework.rubric_version
+        grade = self.cache.get(key, version, self.model_name)
+        cached = grade is not None
+
+        if not cached:
+            grade = self._grade_with_llm(question, answer)
+            if grade is None:
+                return None
+            self.cache.put(key, version, self.model_name, grade)
+
+        grade["points_awarded"] = round(grade["score"] / 100 * question.get("points", 10), 2)
+        grade["cached"] = cached
+        return grade
+
+    def grade_cohort(self, submissions: List[Dict[str, Any]],
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Grade a cohort's responses concurrently
+
+        Each grade is cached as soon as it completes, so calling this again
+        after an interruption only grades the remaining responses.
+
+        Args:
+            submissions (list): Dicts with 'student_id', 'question' (question dict), 'answer'
+                                and optionally 'phase' ("pre" or "post")
+            progress_callback (callable, optional): Called with (completed, total) after each response
+
+        Returns:
+            dict: Per-submission results, graded/prescored/cached/failed counts,
+                  LLM-call reduction from pre-scoring and responses per minute
+        """
+        start = time.monotonic()
+        results = [None] * len(submissions)
+        completed = 0
+
+        # Identical answers to the same question are graded once
+        groups = {}
+        for i, s in enumerate(submissions):
+            groups.setdefault(self.answer_hash(s["question"]["question"], s["answer"]), []).append(i)
+
+        def assign(indices, grade):
+            for n, i in enumerate(indices):
+                duplicate = dict(grade, cached=True) if grade and n else grade
+                results[i] = {**submissions[i], "grade": duplicate}
+
+        # Confident embedding pre-scores skip the LLM entirely
+        pending = list(groups.items())
+        if self.prescorer is not None:
+            pending = []
+            for key, indices, grade in self._prescore(submissions, groups):
+                if grade is None:
+                    pending.append((key, indices))
+                else:
+                    assign(indices, grade)
+                    completed += len(indices)
+            if progress_callback and completed:
+                progress_callback(completed, len(submissions))
+
+        for indices, grade in self._grade_groups(submissions, pending):
+            assign(indices, grade)
+            completed += len(indices)
+            if progress_callback:
+                progress_callback(completed, len(submissions))
+
+        elapsed = time.monotonic() - start
+        graded_results = [r["grade"] for r in results if r["grade"]]
+        prescored = sum(1 for g in graded_results if g.get("prescored") and not g["cached"])
+        graded = sum(1 for g in graded_results if not g["cached"]) - prescored
+        cached = sum(1 for g in graded_results if g["cached"])
+        failed = len(results) - len(graded_results)
+        return {
+            "results": results,
+            "graded": graded,
+            "prescored": prescored,
+            "cached": cached,
+            "failed": failed,
+            "llm_call_reduction": round(prescored / (prescored + graded), 3) if prescored + graded else 0.0,
+            "elapsed_seconds": round(elapsed, 2),
+            "responses_per_minute": round(len(graded_results) / elapsed * 60, 1) if elapsed else 0.0,
+            "llm_responses_per_minute": round(graded / elapsed * 60, 1) if elapsed else 0.0
+        }
+
+    def _grade_groups(self, submissions: List[Dict[str, Any]], pending: List[Tuple[str, List[int]]]):
+        """
+        Grade one submission per group of identical answers concurrently
+
+        Yields:
+            tuple: (submission indices, grade or None on failure) in completion order
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.grade, submissions[indices[0]]["question"],
+                                       submissions[indices[0]]["answer"]): indices
+                       for _, indices in pending}
+            for future in as_completed(futures):
+                indices = futures[future]
+                try:
+                    grade = future.result()
+                except Exception as e:
+                    logger.error(f"Error grading submission {indices[0]}: {str(e)}")
+                    grade = None
+                yield indices, grade
+
+    def _prescore(self, submissions: List[Dict[str, Any]], groups: Dict[str, List[int]]):
+        """
+        Pre-score uncached answers with the embedding pre-scorer
+
+        Yields:
+            tuple: (answer hash, submission indices, grade or None if the LLM should grade it)
+        """
+        version = self.ct_framework.rubric_version
+        by_question = {}
+        for key, indices in groups.items():
+            if self.cache.get(key, version, self.model_name) is not None:
+                yield key, indices, None
+            else:
+                question = submissions[indices[0]]["question"]
+                by_question.setdefault(question["question"], []).append((key, indices))
+
+        for question_text, entries in by_question.items():
+            question = submissions[entries[0][1][0]]["question"]
+            answers = [submissions[indices[0]]["answer"] for _, indices in entries]
+            for (key, indices), grade in zip(entries, self.prescorer.prescore(question_text, answers)):
+                if grade is not None:
+                    grade["points_awarded"] = round(grade["score"] / 100 * question.get("points", 10), 2)
+                    grade["cached"] = False
+                yield key, indices, grade
+
+    @staticmethod
+    def summarize_students(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Turn graded responses into per-student assessment records
+
+        Args:
+            results (list): "results" from grade_cohort
+
+        Returns:
+            list: Dicts with student_id, pre_score, post_score, improvement,
+                  strongest_dimension and weakest_dimension
+        """
+        students = {}
+        for r in results:
+            if not r.get("grade"):
+                continue
+            student = students.setdefault(r["student_id"], {"phases": {"pre": [], "post": []}, "dimensions": {}})
+            # Responses from other phases (e.g. "practice") count toward dimensions only
+            phase_scores = student["phases"].get(r.get("phase", "post"))
+            if phase_scores is not None:
+                phase_scores.append(r["grade"]["score"])
+            dimension = r["question"].get("dimension", "General")
+            student["dimensions"].setdefault(dimension, []).append(r["grade"]["score"])
+
+        records = []
+        for student_id, s in students.items():
+            pre_scores, post_scores = s["phases"]["pre"], s["phases"]["post"]
+            pre = round(sum(pre_scores) / len(pre_scores), 1) if pre_scores else None
+            post = round(sum(post_scores) / len(post_scores), 1) if post_scores else None
+            averages = {d: sum(v) / len(v) for d, v in s["dimensions"].items()}
+            records.append({
+                "student_id": student_id,
+                "pre_score": pre,
+                "post_score": post,
+                "improvement": round(post - pre, 1) if pre is not None and post is not None else None,
+                "strongest_dimension": max(averages, key=averages.get),
+                "weakest_dimension": min(averages, key=averages.get)
+            })
+        return records
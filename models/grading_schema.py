@@ -0,0 +1,32 @@
+from typing import Dict
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+
+
+class GradeResult(BaseModel):
+    """
+    Rubric grade for one written assessment response, produced by constrained JSON generation
+
+    Validate with context={"dimensions": [...]} to require exactly the rubric's dimensions.
+    """
+
+    score: float = Field(ge=0, le=100, description="Overall critical thinking score out of 100")
+    level: str = Field(min_length=1, description="Rubric level matching the score")
+    dimension_scores: Dict[str, float] = Field(description="Score out of 100 for each critical thinking dimension")
+    feedback: str = Field(min_length=1, description="Two or three sentences of feedback for the student")
+
+    @field_validator("dimension_scores")
+    @classmethod
+    def check_dimensions(cls, value: Dict[str, float], info: ValidationInfo) -> Dict[str, float]:
+        """Require scores out of 100 and, when the rubric is given, exactly its dimensions"""
+        out_of_range = [key for key, score in value.items() if not 0 <= score <= 100]
+        if out_of_range:
+            raise ValueError(f"scores must be between 0 and 100: {', '.join(out_of_range)}")
+
+        dimensions = (info.context or {}).get("dimensions")
+        if dimensions is not None:
+            unknown = [key for key in value if key not in dimensions]
+            missing = [key for key in dimensions if key not in value]
+            if unknown or missing:
+                raise ValueError(f"keys must be exactly the rubric dimensions; unknown: {', '.join(unknown) or 'none'}, "
+                                 f"missing: {', '.join(missing) or 'none'}")
+        return value
@@ -0,0 +1,195 @@
+import os
+import re
+import logging
+import threading
+from collections import deque
+from typing import List, Dict, Any, Tuple
+
+logger = logging.getLogger("EngE-AI.router")
+
+# Keywords that signal multi-step reasoning or calculation
+COMPLEX_KEYWORDS = (
+    "derive", "derivation", "calculate", "compute", "solve", "design", "prove", "estimate",
+    "compare", "optimize", "step", "steps", "multi", "mixture", "equilibrium", "iterate",
+    "balance", "why does", "how would", "what if", "trade-off", "analyze", "evaluate"
+)
+
+# Keywords that signal short definitional questions
+SIMPLE_KEYWORDS = (
+    "what is", "what are", "define", "definition", "meaning", "stand for", "units of",
+    "example of", "who", "when", "difference between", "in simple terms"
+)
+
+# Labelled seed questions used to fit the classifier (0 = simple, 1 = complex)
+SEED_QUESTIONS = [
+    ("What is enthalpy?", 0),
+    ("Define entropy.", 0),
+    ("What are the units of heat capacity?", 0),
+    ("What does CSTR stand for?", 0),
+    ("What is a control volume?", 0),
+    ("Can you explain entropy in simple terms?", 0),
+    ("What is the difference between heat and work?", 0),
+    ("What is Gibbs free energy?", 0),
+    ("Give an example of an isothermal process.", 0),
+    ("What is a mole fraction?", 0),
+    ("What is the ideal gas law?", 0),
+    ("What is a unit operation?", 0),
+    ("Define fugacity.", 0),
+    ("What is Raoult's law?", 0),
+    ("What is the meaning of a degree of freedom?", 0),
+    ("Derive the Clausius-Clapeyron equation from the Gibbs phase rule and explain each assumption.", 1),
+    ("Calculate the bubble point temperature of a 40 mol% benzene / 60 mol% toluene mixture at 1 atm.", 1),
+    ("Solve for the outlet temperature of an adiabatic reactor with 85% conversion, given dH_rxn = -92 kJ/mol.", 1),
+    ("How do I solve problems involving phase equilibria for a non-ideal binary mixture using activity coefficients?", 1),
+    ("Design a flash drum to separate a propane/butane feed at 10 bar and compute the vapor fraction.", 1),
+    ("Compare the efficiency of a Rankine cycle with reheat versus regeneration and explain the trade-offs.", 1),
+    ("Set up the material and energy balances for a recycle process with a purge stream and solve them step by step.", 1),
+    ("Why does the chemical potential have to be equal in both phases at equilibrium, and how would I use that to find the composition?", 1),
+    ("Estimate the work required to compress 5 kg/s of air from 1 bar to 8 bar in a two-stage compressor with intercooling.", 1),
+    ("What if the heat exchanger fouls over time; how would you analyze the effect on the overall heat transfer coefficient and outlet temperatures?", 1),
+    ("Evaluate whether a Peng-Robinson or van der Waals equation of state is more appropriate for CO2 at 60 bar and justify with calculations.", 1),
+    ("Walk me through the multi-step derivation of the Gibbs-Duhem equation and how to check thermodynamic consistency of VLE data.", 1),
+    ("Optimize the reflux ratio for a distillation column given the minimum reflux ratio of 1.4 and cost data.", 1),
+    ("Analyze the reaction equilibrium of ammonia synthesis at 450 C and 200 bar including non-ideal fugacity corrections.", 1),
+]
+
+
+def extract_features(question: str) -> List[float]:
+    """
+    Turn a question into a small numeric feature vector
+
+    Args:
+        question (str): The student's question
+
+    Returns:
+        list: Feature values (length, structure, math and keyword signals)
+    """
+    text = question.lower()
+    words = text.split()
+    return [
+        min(len(words), 80) / 80.0,
+        text.count("?") + text.count(". "),
+        min(len(re.findall(r"\d+(?:\.\d+)?", text)), 10) / 10.0,
+        len(re.findall(r"[=^/%]|\bmol\b|\bkj\b|\bbar\b|\bkg\b|\batm\b", text)),
+        sum(1 for k in COMPLEX_KEYWORDS if k in text),
+        sum(1 for k in SIMPLE_KEYWORDS if k in text),
+        1.0 if " and " in text else 0.0,
+    ]
+
+
+class ModelRouter:
+    """
+    Routes tutor questions to a small or large model tier.
+
+    A logistic-regression classifier over cheap question features picks the
+    tier; definitional questions go to the small (quantized) model and
+    multi-step questions to the large model. Truncated small-model answers are
+    escalated by the caller via record().
+    """
+
+    TIERS = ("small", "large")
+
+    def __init__(self, small_model=None, large_model=None, complex_threshold=0.5, latency_window=500):
+        """
+        Initialize the router
+
+        Args:
+            small_model (str, optional): Model for simple questions
+            large_model (str, optional): Model for complex questions
+            complex_threshold (float): Probability of "complex" above which the large tier is used
+            latency_window (int): Number of recent latencies kept per tier
+        """
+        self.small_model = small_model or os.getenv("OLLAMA_SMALL_MODEL", "llama3.2:1b")
+        self.large_model = large_model or os.getenv("OLLAMA_LARGE_MODEL", "llama3.2")
+        self.complex_threshold = complex_threshold
+        self.stats = {tier: {"routed": 0, "escalated": 0, "latencies": deque(maxlen=latency_window)}
+                      for tier in self.TIERS}
+        self._classifier = None
+        self._lock = threading.Lock()
+
+    def _get_classifier(self):
+        """Fit the classifier on the seed questions on first use"""
+        if self._classifier is None:
+            from sklearn.linear_model import LogisticRegression
+
+            features = [extract_features(q) for q, _ in SEED_QUESTIONS]
+            labels = [label for _, label in SEED_QUESTIONS]
+            self._classifier = LogisticRegression(class_weight="balanced").fit(features, labels)
+        return self._classifier
+
+    def ensure_models(self, ollama_manager) -> Dict[str, str]:
+        """
+        Make sure both tier models are available, pulling them if needed
+
+        The small tier falls back to the large model when its model cannot be
+        pulled, so routing never sends questions to a model that is not there.
+
+        Args:
+            ollama_manager: OllamaManager used to check and pull models
+
+        Returns:
+            dict: Tier -> model name in use
+        """
+        if not ollama_manager.ensure_model(self.large_model):
+            logger.error(f"Large tier model {self.large_model} is not available")
+        if self.small_model != self.large_model and not ollama_manager.ensure_model(self.small_model):
+            logger.warning(f"Small tier model {self.small_model} is not available; "
+                           f"routing every question to {self.large_model}")
+            self.small_model = self.large_model
+        return {tier: self.model_for(tier) for tier in self.TIERS}
+
+    def model_for(self, tier: str) -> str:
+        """Model name for a tier"""
+        return self.small_model if tier == "small" else self.large_model
+
+    def route(self, question: str) -> Tuple[str, str]:
+        """
+        Pick a tier for a question
+
+        Args:
+            question (str): The student's question
+
+        Returns:
+            tuple: (tier, model name)
+        """
+        probability = self._get_classifier().predict_proba([extract_features(question)])[0][1]
+        tier = "large" if probability >= self.complex_threshold else "small"
+        with self._lock:
+            self.stats[tier]["routed"] += 1
+        return tier, self.model_for(tier)
+
+    def record(self, tier: str, latency: float, escalated: bool = False):
+        """
+        Record the latency of an answer served by a tier
+
+        Args:
+            tier (str): Tier that produced the final answer
+            latency (float): End-to-end seconds for the answer
+            escalated (bool): Whether the answer was escalated from the small tier
+        """
+        with self._lock:
+            self.stats[tier]["latencies"].append(latency)
+            if escalated:
+                self.stats["small"]["escalated"] += 1
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Per-tier hit rates, escalations and latency percentiles
+
+        Returns:
+            dict: Report keyed by tier
+        """
+        with self._lock:
+            total = sum(s["routed"] for s in self.stats.values())
+            report = {}
+            for tier, s in self.stats.items():
+                latencies = sorted(s["latencies"])
+                report[tier] = {
+                    "model": self.model_for(tier),
+                    "routed": s["routed"],
+                    "hit_rate": round(s["routed"] / total, 3) if total else 0.0,
+                    "escalated": s["escalated"],
+                    "p50_latency": latencies[len(latencies) // 2] if latencies else None,
+                    "p95_latency": latencies[int(len(latencies) * 0.95)] if latencies else None,
+                }
+            return report
@@ -0,0 +1,165 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger("EngE-AI.practice")
+
+# Post-assessment score thresholds (aligned with the rubric levels) -> practice difficulty
+DIFFICULTY_BANDS = [
+    (85, "Advanced"),
+    (70, "Challenging"),
+    (60, "Intermediate"),
+    (0, "Introductory"),
+]
+
+
+class PersonalizedPracticePipeline:
+    """
+    Batch generation of practice scenarios targeted at each student's weakest dimension.
+
+    Students are grouped by (course, weakest dimension, difficulty) and each
+    group gets one shared pool of scenarios, so the number of LLM calls grows
+    with the number of groups rather than the number of students. Pools are
+    generated concurrently in round-robin order (the first scenario of every
+    group before the second of any) within a fixed time budget, and students
+    are assigned scenarios from their group's pool round-robin.
+    """
+
+    def __init__(self, scenario_generator, pool_size=3, max_workers=4, time_budget=300.0,
+                 scenario_type="Case Study"):
+        """
+        Initialize the pipeline
+
+        Args:
+            scenario_generator: Instance of ScenarioGenerator
+            pool_size (int): Maximum scenarios generated per group
+            max_workers (int): Concurrent generation requests
+            time_budget (float): Seconds after which no new generations are started
+            scenario_type (str): Scenario type used for practice problems
+        """
+        self.generator = scenario_generator
+        self.pool_size = pool_size
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.scenario_type = scenario_type
+
+    @staticmethod
+    def difficulty_for(student: Dict[str, Any]) -> str:
+        """
+        Pick a practice difficulty from a student's latest score
+
+        Args:
+            student (dict): Assessment record with post_score and/or pre_score
+
+        Returns:
+            str: Difficulty level
+        """
+        if student.get("difficulty"):
+            return student["difficulty"]
+        score = student.get("post_score")
+        if score is None:
+            score = student.get("pre_score") or 0
+        return next(name for threshold, name in DIFFICULTY_BANDS if score >= threshold)
+
+    def group_students(self, students: List[Dict[str, Any]],
+                       course: Optional[str] = None) -> Dict[Tuple[str, str, str], List[Dict[str, Any]]]:
+        """
+        Group students by (course, weakest dimension, difficulty)
+
+        Args:
+            students (list): Assessment records with weakest_dimension
+            course (str, optional): Course for records that do not name one
+
+        Returns:
+            dict: Group key -> students in the group
+        """
+        groups = {}
+        for student in students:
+            key = (student.get("course") or course, student["weakest_dimension"], self.difficulty_for(student))
+            groups.setdefault(key, []).append(student)
+        return groups
+
+    def _generate(self, key: Tuple[str, str, str], topic: str, industry: Optional[str]) -> Dict[str, Any]:
+        """Generate one scenario for a group (raises ScenarioGenerationError if the model request fails)"""
+        course, dimension, difficulty = key
+        instructions = (f"Course: {course}\n"
+                        f"This is a practice problem for students whose weakest critical thinking dimension is "
+                        f"{dimension}. Design the questions so that they specifically exercise {dimension}.")
+        return self.generator.generate_scenario(topic, difficulty, self.scenario_type, industry,
+                                                additional_instructions=instructions)
+
+    def _jobs(self, groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]],
+              topics: Optional[Dict[str, List[str]]] = None) -> List[Tuple[Tuple[str, str, str], str]]:
+        """(group key, topic) generations in round-robin order: slot 0 of every group, then slot 1, ..."""
+        jobs = []
+        for slot in range(self.pool_size):
+            for key, members in groups.items():
+                if slot < len(members):
+                    course_topics = (topics or {}).get(key[0]) or [key[1]]
+                    jobs.append((key, course_topics[slot % len(course_topics)]))
+        return jobs
+
+    @staticmethod
+    def _assign(groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]],
+                pools: Dict[Tuple[str, str, str], List[Dict[str, Any]]]) -> Tuple[Dict[str, Any], List[str]]:
+        """Spread each group's pool over its students; students of an empty pool are unassigned"""
+        assignments, unassigned = {}, []
+        for key, members in groups.items():
+            pool = pools[key]
+            for i, student in enumerate(members):
+                if pool:
+                    assignments[student["student_id"]] = pool[i % len(pool)]
+                else:
+                    unassigned.append(student["student_id"])
+        return assignments, unassigned
+
+    def run(self, students: List[Dict[str, Any]], course: Optional[str] = None,
+            topics: Optional[Dict[str, List[str]]] = None, industry: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate group pools and assign one practice scenario per student
+
+        Args:
+            students (list): Assessment records with student_id and weakest_dimension
+            course (str, optional): Course for records that do not name one
+            topics (dict, optional): Course -> topics to rotate through within a pool
+            industry (str, optional): Industry context for every scenario
+
+        Returns:
+            dict: assignments (student_id -> scenario), unassigned student ids, group and
+                  generated scenario counts, and elapsed seconds
+        """
+        start = time.monotonic()
+        deadline = start + self.time_budget
+        groups = self.group_students(students, course)
+        pools = {key: [] for key in groups}
+
+        jobs = self._jobs(groups, topics)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {executor.submit(self._generate, key, topic, industry): key for key, topic in jobs}
+        pending = set(futures)
+        while pending and time.monotonic() < deadline:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    pools[futures[future]].append(future.result())
+                except Exception as e:
+                    # Students of a group whose generations all failed end up unassigned
+                    logger.error(f"Error generating practice scenario for {futures[future]}: {str(e)}")
+        # Unstarted generations are dropped; ones already running finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+        if pending:
+            logger.warning(f"Practice time budget of {self.time_budget}s reached with {len(pending)} "
+                           f"generations outstanding")
+
+        assignments, unassigned = self._assign(groups, pools)
+
+        return {
+            "assignments": assignments,
+            "unassigned": unassigned,
+            "students": len(students),
+            "groups": len(groups),
+            "scenarios_generated": sum(len(pool) for pool in pools.values()),
+            "elapsed_seconds": round(time.monotonic() - start, 2)
+        }
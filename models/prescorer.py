@@ -0,0 +1,253 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger("EngE-AI.prescorer")
+
+
+class EmbeddingPreScorer:
+    """
+    Nearest-centroid pre-scorer for written assessment responses.
+
+    Exemplar answers for each rubric level are embedded and averaged into one
+    centroid per (question, level). A new answer is assigned the level of its
+    most similar centroid; the margin between the best and second-best cosine
+    similarity is its confidence. Answers whose margin clears the calibrated
+    threshold are scored without an LLM call. Embeddings are cached by text,
+    so recalibrating after each graded batch only embeds the new answers.
+    """
+
+    def __init__(self, ollama_manager, embed_model=None, threshold=0.05, max_cached_embeddings=4096):
+        """
+        Initialize the pre-scorer
+
+        Args:
+            ollama_manager: Instance of OllamaManager
+            embed_model (str, optional): Embedding model (defaults to OLLAMA_EMBED_MODEL)
+            threshold (float): Minimum top-1 vs top-2 similarity margin for an instant score
+            max_cached_embeddings (int): Answer embeddings kept before the least recently used is evicted
+        """
+        self.ollama = ollama_manager
+        self.embed_model = embed_model
+        self.threshold = threshold
+        self.max_cached_embeddings = max_cached_embeddings
+        # question -> (levels, centroid matrix, mean score per level)
+        self.centroids = {}
+        self.stats = {"prescored": 0, "deferred": 0, "embedded": 0, "embedding_hits": 0}
+        self._embeddings = OrderedDict()  # text hash -> normalized embedding
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _text_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as L2-normalized rows, only sending uncached texts to the model"""
+        keys = [self._text_key(text) for text in texts]
+        with self._lock:
+            cached = {key: self._embeddings[key] for key in keys if key in self._embeddings}
+            for key in cached:
+                self._embeddings.move_to_end(key)
+        missing = list(dict.fromkeys(key for key in keys if key not in cached))
+
+        if missing:
+            texts_by_key = dict(zip(keys, texts))
+            vectors = np.asarray(self.ollama.embed([texts_by_key[key] for key in missing], model=self.embed_model),
+                                 dtype=np.float32)
+            if len(vectors) != len(missing):
+                return np.empty((0,), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            cached.update(zip(missing, vectors))
+            with self._lock:
+                self._embeddings.update(zip(missing, vectors))
+                while len(self._embeddings) > self.max_cached_embeddings:
+                    self._embeddings.popitem(last=False)
+
+        self.stats["embedded"] += len(missing)
+        self.stats["embedding_hits"] += len(keys) - len(missing)
+        if not keys:
+            return np.empty((0,), dtype=np.float32)
+        return np.stack([cached[key] for key in keys])
+
+    @staticmethod
+    def _build_centroids(embeddings: np.ndarray, levels: List[str], scores: List[float]):
+        """Average normalized exemplar embeddings per level"""
+        names = sorted(set(levels))
+        labels = np.array(levels)
+        score_array = np.asarray(scores, dtype=np.float32)
+        matrix = np.stack([embeddings[labels == name].mean(axis=0) for name in names])
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        mean_scores = np.array([score_array[labels == name].mean() for name in names], dtype=np.float32)
+        return names, matrix, mean_scores
+
+    def fit(self, question: str, answers: List[str], levels: List[str], scores: List[float],
+            embeddings: Optional[np.ndarray] = None):
+        """
+        Build the centroids for one question from graded exemplar answers
+
+        Args:
+            question (str): Assessment question text
+            answers (list): Exemplar answers
+            levels (list): Rubric level of each exemplar
+            scores (list): Score out of 100 of each exemplar
+            embeddings (np.ndarray, optional): Precomputed normalized embeddings of the answers
+        """
+        if embeddings is None:
+            embeddings = self._embed(answers)
+        if len(embeddings) != len(answers) or len(set(levels)) < 2:
+            logger.warning(f"Not enough exemplar levels to pre-score question: {question[:60]}")
+            return
+        with self._lock:
+            self.centroids[question] = self._build_centroids(embeddings, levels, scores)
+
+    def fit_from_results(self, results: List[Dict[str, Any]]):
+        """
+        Build centroids from LLM-graded grade_cohort results
+
+        Args:
+            results (list): "results" from GradingEngine.grade_cohort
+        """
+        by_question = {}
+        for r in results:
+            grade = r.get("grade")
+            if grade and not grade.get("prescored"):
+                by_question.setdefault(r["question"]["question"], []).append((r["answer"], grade))
+        for question, graded in by_question.items():
+            self.fit(question, [a for a, _ in graded], [g["level"] for _, g in graded],
+                     [g["score"] for _, g in graded])
+
+    def _similarities(self, question: str, embeddings: np.ndarray) -> Optional[Tuple[List[str], np.ndarray, np.ndarray]]:
+        """Cosine similarity of each answer to each level centroid"""
+        with self._lock:
+            entry = self.centroids.get(question)
+        if entry is None or embeddings.size == 0:
+            return None
+        names, matrix, mean_scores = entry
+        return names, embeddings @ matrix.T, mean_scores
+
+    @staticmethod
+    def _top_two(similarities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Best centroid index and top-1 minus top-2 margin per row"""
+        best = similarities.argmax(axis=1)
+        top_two = -np.partition(-similarities, 1, axis=1)[:, :2]
+        return best, top_two[:, 0] - top_two[:, 1]
+
+    def prescore(self, question: str, answers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Pre-score answers to one question
+
+        Args:
+            question (str): Assessment question text
+            answers (list): Student answers
+
+        Returns:
+            list: A grade dict for each confidently scored answer, None where the LLM should grade
+        """
+        scored = self._similarities(question, self._embed(answers)) if answers else None
+        if scored is None:
+            self.stats["deferred"] += len(answers)
+            return [None] * len(answers)
+
+        names, similarities, mean_scores = scored
+        best, margins = self._top_two(similarities)
+        grades = []
+        for index, margin in zip(best, margins):
+            if margin < self.threshold:
+                grades.append(None)
+                continue
+            grades.append({
+                "score": round(float(mean_scores[index]), 1),
+                "level": names[index],
+                "dimension_scores": {},
+                "feedback": f"Scored by similarity to {names[index]} exemplar answers.",
+                "confidence": round(float(margin), 4),
+                "prescored": True
+            })
+        prescored = sum(1 for g in grades if g)
+        self.stats["prescored"] += prescored
+        self.stats["deferred"] += len(grades) - prescored
+        return grades
+
+    def calibrate(self, results: List[Dict[str, Any]], target_accuracy=0.9, holdout=0.3, seed=0) -> Dict[str, Any]:
+        """
+        Choose the smallest margin threshold whose pre-scores agree with the LLM often enough
+
+        LLM-graded results are split per question into exemplars and a held-out
+        set. Held-out answers are ranked by margin, and the threshold is the
+        lowest margin at which the level agreement of everything above it still
+        meets target_accuracy. The centroids are refit on all results afterwards.
+
+        Args:
+            results (list): LLM-graded "results" from GradingEngine.grade_cohort
+            target_accuracy (float): Required agreement with the LLM level for pre-scored answers
+            holdout (float): Fraction of each question's answers held out for calibration
+            seed (int): Shuffle seed
+
+        Returns:
+            dict: threshold, held-out sample count, coverage (share pre-scored) and accuracy
+        """
+        rng = np.random.RandomState(seed)
+        by_question = {}
+        for r in results:
+            grade = r.get("grade")
+            if grade and not grade.get("prescored"):
+                by_question.setdefault(r["question"]["question"], []).append((r["answer"], grade))
+
+        margins, correct = [], []
+        for question, graded in by_question.items():
+            embeddings = self._embed([a for a, _ in graded])
+            if len(embeddings) != len(graded):
+                continue
+            order = rng.permutation(len(graded))
+            split = max(1, int(len(graded) * holdout))
+            test, train = order[:split], order[split:]
+            train_levels = [graded[i][1]["level"] for i in train]
+            if len(set(train_levels)) < 2:
+                continue
+            names, matrix, _ = self._build_centroids(embeddings[train], train_levels,
+                                                     [graded[i][1]["score"] for i in train])
+            best, margin = self._top_two(embeddings[test] @ matrix.T)
+            margins.extend(margin.tolist())
+            correct.extend(names[b] == graded[i][1]["level"] for b, i in zip(best, test))
+
+            self.fit(question, [a for a, _ in graded], [g["level"] for _, g in graded],
+                     [g["score"] for _, g in graded], embeddings=embeddings)
+
+        if not margins:
+            return {"threshold": self.threshold, "samples": 0, "coverage": 0.0, "accuracy": None}
+
+        order = np.argsort(margins)[::-1]
+        sorted_margins = np.asarray(margins)[order]
+        running_accuracy = np.cumsum(np.asarray(correct, dtype=np.float32)[order]) / np.arange(1, len(order) + 1)
+        meets = np.nonzero(running_accuracy >= target_accuracy)[0]
+        if meets.size:
+            cutoff = meets[-1]
+            self.threshold = float(sorted_margins[cutoff])
+            coverage, accuracy = (cutoff + 1) / len(order), float(running_accuracy[cutoff])
+        else:
+            # Nothing is reliable enough; send every answer to the LLM
+            self.threshold = float("inf")
+            coverage, accuracy = 0.0, None
+
+        logger.info(f"Calibrated pre-score threshold {self.threshold:.4f} "
+                    f"(coverage {coverage:.0%} on {len(order)} held-out answers)")
+        return {"threshold": self.threshold, "samples": len(order), "coverage": round(coverage, 3),
+                "accuracy": round(accuracy, 3) if accuracy is not None else None}
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        LLM calls avoided by pre-scoring
+
+        Returns:
+            dict: prescored and deferred counts, threshold and LLM-call reduction
+        """
+        total = self.stats["prescored"] + self.stats["deferred"]
+        return {
+            **self.stats,
+            "threshold": self.threshold,
+            "questions": len(self.centroids),
+            "llm_call_reduction": round(self.stats["prescored"] / total, 3) if total else 0.0
+        }
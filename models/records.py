@@ -0,0 +1,101 @@
+import sys
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+# Process-wide message ids; unique per process, which is all the chat HTML cache needs
+_message_ids = itertools.count(1)
+
+# Scenario metadata keys stored as record fields rather than in extra
+_SCENARIO_FACETS = ("topic", "difficulty", "type", "industry", "generated_timestamp")
+
+
+@dataclass
+class Message:
+    """
+    One conversation turn.
+
+    The tutor's history list holds these records and the UI renders the same
+    list, so each turn is stored once. Roles are interned so every message
+    shares the same few role strings. Convert with to_dict() only at the
+    Ollama API boundary.
+    """
+    __slots__ = ("id", "role", "content")
+    id: int
+    role: str
+    content: str
+
+    @classmethod
+    def create(cls, role: str, content: str) -> "Message":
+        """Create a message with a new id and an interned role"""
+        return cls(next(_message_ids), sys.intern(role), content)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Ollama chat message"""
+        return {"role": self.role, "content": self.content}
+
+
+@dataclass
+class ScenarioRecord:
+    """
+    Compact in-memory form of a generated scenario.
+
+    Metadata facets are fields rather than keys of a nested dict, and facet
+    values are interned because they repeat across many scenarios.
+    """
+    __slots__ = ("id", "scenario_text", "sections", "topic", "difficulty", "type", "industry",
+                 "generated_timestamp", "duplicate_of", "extra")
+    id: Optional[str]
+    scenario_text: str
+    sections: Optional[Dict[str, Any]]
+    topic: Optional[str]
+    difficulty: Optional[str]
+    type: Optional[str]
+    industry: Optional[str]
+    generated_timestamp: Optional[str]
+    duplicate_of: Optional[str]
+    extra: Optional[Dict[str, Any]]
+
+    @staticmethod
+    def _intern(value):
+        return sys.intern(value) if isinstance(value, str) else value
+
+    @classmethod
+    def from_dict(cls, scenario: Dict[str, Any]) -> "ScenarioRecord":
+        """
+        Build a record from the scenario dictionary format
+
+        Args:
+            scenario (dict): Scenario as returned by ScenarioGenerator.generate_scenario
+
+        Returns:
+            ScenarioRecord: Compact record
+        """
+        metadata = scenario.get("metadata", {})
+        extra = {k: v for k, v in metadata.items() if k not in _SCENARIO_FACETS}
+        return cls(
+            id=scenario.get("id"),
+            scenario_text=scenario["scenario_text"],
+            sections=scenario.get("sections"),
+            topic=cls._intern(metadata.get("topic")),
+            difficulty=cls._intern(metadata.get("difficulty")),
+            type=cls._intern(metadata.get("type")),
+            industry=cls._intern(metadata.get("industry")),
+            generated_timestamp=metadata.get("generated_timestamp"),
+            duplicate_of=scenario.get("duplicate_of"),
+            extra=extra or None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Scenario dictionary format"""
+        metadata = {"topic": self.topic, "difficulty": self.difficulty, "type": self.type,
+                    "industry": self.industry, "generated_timestamp": self.generated_timestamp}
+        if self.extra:
+            metadata.update(self.extra)
+        return {
+            "id": self.id,
+            "scenario_text": self.scenario_text,
+            "sections": self.sections,
+            "metadata": metadata,
+            "duplicate_of": self.duplicate_of
+        }
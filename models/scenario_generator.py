@@ -1,31 +1,74 @@
 import os
 import json
+import hashlib
 import logging
 import random
+import threading
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
-import pandas as pd
+from pydantic import ValidationError
+from models.scenario_schema import StructuredScenario
+from models.records import ScenarioRecord
 
 logger = logging.getLogger("EngE-AI.scenario")
 
 
+class ScenarioGenerationError(RuntimeError):
+    """Raised when the model fails to produce a scenario"""
+
+
+def instructions_variant(additional_instructions: Optional[str]) -> str:
+    """
+    Bank facet for the extra prompt instructions a scenario was generated with
+
+    Scenarios are only served for requests with the same instructions (course,
+    learning objectives, included outputs), compared after collapsing whitespace.
+
+    Args:
+        additional_instructions (str, optional): Extra requirements appended to the prompt
+
+    Returns:
+        str: "default" without instructions, else a short hash of them
+    """
+    text = " ".join((additional_instructions or "").split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16] if text else "default"
+
+
 class ScenarioGenerator:
     """
     Real-world scenario generator for engineering education
     that creates context-rich problem statements
     """
 
-    def __init__(self, ollama_manager, templates_path="database/scenario_templates"):
+    def __init__(self, ollama_manager, templates_path="database/scenario_templates", max_structured_retries=2,
+                 scenario_bank=None, max_history=200, low_watermark=3, refill_batch=5):
         """
         Initialize the scenario generator
 
         Args:
             ollama_manager: Instance of OllamaManager for LLM interaction
             templates_path (str): Path to scenario templates
+            max_structured_retries (int): Extra attempts when structured output fails validation
+            scenario_bank (ScenarioBank, optional): Persistent bank that stores and deduplicates scenarios
+            max_history (int): Number of recent scenarios kept in memory
+            low_watermark (int): Unseen scenarios per facet below which the bank is topped up
+            refill_batch (int): Number of scenarios generated per background top-up
         """
         self.ollama = ollama_manager
         self.templates_path = templates_path
+        self.max_structured_retries = max_structured_retries
+        self.scenario_bank = scenario_bank
         self.scenario_templates = self._load_templates()
-        self.generated_scenarios = []
+        self.generated_scenarios = deque(maxlen=max_history)
+        self.low_watermark = low_watermark
+        self.refill_batch = refill_batch
+        self.serve_stats = {"bank": 0, "live": 0, "refills": 0}
+        self._stats_lock = threading.Lock()
+        self._refill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenario-refill")
+        self._refilling = set()
+        self._refill_lock = threading.Lock()
 
     def _load_templates(self) -> Dict[str, Any]:
         """Load scenario templates from files"""
@@ -50,7 +93,7 @@ class ScenarioGenerator:
                 with open(chem_path, "r") as f:
                     templates["chemical"] = json.load(f)
 
-            logger.info(f"Loaded scenario templates successfully")
+            logger.info("Loaded scenario templates successfully")
             return templates
 
         except Exception as e:
@@ -61,7 +104,10 @@ class ScenarioGenerator:
                           topic: str,
                           difficulty: str = "moderate",
                           scenario_type: str = "open_ended",
-                          industry_context: Optional[str] = None) -> Dict[str, Any]:
+                          industry_context: Optional[str] = None,
+                          structured: bool = False,
+                          additional_instructions: Optional[str] = None,
+                          model: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a context-rich engineering scenario
 
@@ -70,16 +116,22 @@ class ScenarioGenerator:
             difficulty (str): Difficulty level ("basic", "moderate", "advanced")
             scenario_type (str): Type of scenario ("calculation", "design", "analysis", "open_ended")
             industry_context (str, optional): Specific industry context
+            structured (bool): Generate schema-validated JSON sections instead of free-form text
+            additional_instructions (str, optional): Extra requirements appended to the prompt
+            model (str, optional): Model selected for this session
 
         Returns:
-            dict: Generated scenario with metadata
+            dict: Generated scenario with metadata (and "sections" when structured)
+
+        Raises:
+            ScenarioGenerationError: If the model request fails; nothing is stored in that case
         """
         # Select industry context if not specified
         if not industry_context and self.scenario_templates.get("industry"):
             industry_context = random.choice(self.scenario_templates["industry"])
 
         # Build the scenario generation prompt
-        system_prompt = f"""You are an expert Chemical and Biological Engineering educator. 
+        system_prompt = f"""You are an expert Chemical and Biological Engineering educator.
 Create a realistic, context-rich engineering scenario for undergraduate students that:
 1. Focuses on the topic: {topic}
 2. Has {difficulty} difficulty level
@@ -100,31 +152,212 @@ Industry: {industry_context}
 Include appropriate technical details, realistic values, and industry-specific terminology.
 The scenario should challenge students to apply critical thinking skills while being appropriate for second-year undergraduates.
 """
+        if additional_instructions:
+            user_prompt += f"\nAdditional Instructions:\n{additional_instructions}\n"
 
         # Generate the scenario
-        scenario_text = self.ollama.generate_response(
-            prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.8
-        )
+        sections = None
+        if structured:
+            structured_scenario = self._generate_structured(system_prompt, user_prompt, model=model)
+            if structured_scenario:
+                sections = structured_scenario.model_dump()
+                scenario_text = structured_scenario.to_markdown()
+
+        if sections is None:
+            scenario_text = self._generate_text(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                temperature=0.8,
+                model=model,
+                budget_key=("generate_scenario", scenario_type, difficulty)
+            )
 
         # Create scenario object with metadata
         scenario = {
             "scenario_text": scenario_text,
+            "sections": sections,
             "metadata": {
                 "topic": topic,
                 "difficulty": difficulty,
                 "type": scenario_type,
                 "industry": industry_context,
-                "generated_timestamp": pd.Timestamp.now().isoformat(),
+                "variant": instructions_variant(additional_instructions),
+                "generated_timestamp": datetime.now().isoformat(),
             }
         }
 
-        # Add to history
-        self.generated_scenarios.append(scenario)
+        # Store in the bank, which flags or rejects near-duplicates
+        if self.scenario_bank is not None:
+            result = self.scenario_bank.add(scenario)
+            scenario["id"] = result["id"]
+            scenario["duplicate_of"] = result["duplicate_of"]
+
+        # Add to history as a compact record
+        self.generated_scenarios.append(ScenarioRecord.from_dict(scenario))
 
         return scenario
 
+    def get_scenario(self,
+                     topic: str,
+                     difficulty: str = "moderate",
+                     scenario_type: str = "open_ended",
+                     industry_context: Optional[str] = None,
+                     instructor_id: str = "default",
+                     structured: bool = False,
+                     additional_instructions: Optional[str] = None,
+                     model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Serve an unseen scenario from the bank, generating one live only when the bank is exhausted
+
+        Bank lookups match the facets and the additional_instructions (through
+        instructions_variant), so a banked scenario was generated for the same
+        course, objectives and outputs. When the instructor's unseen inventory
+        for them drops below low_watermark, the bank is topped up in the
+        background with the same instructions.
+
+        Args:
+            topic (str): Engineering topic to focus on
+            difficulty (str): Difficulty level
+            scenario_type (str): Type of scenario
+            industry_context (str, optional): Specific industry context
+            instructor_id (str): Instructor the scenario is served to
+            structured (bool): Generate structured scenarios when falling back to the LLM
+            additional_instructions (str, optional): Extra requirements, matched against banked scenarios
+            model (str, optional): Model selected for this session, used for live generation
+
+        Returns:
+            dict: Scenario with metadata and a "served_from_bank" flag
+        """
+        if self.scenario_bank is None:
+            scenario = self.generate_scenario(topic, difficulty, scenario_type, industry_context,
+                                              structured=structured, additional_instructions=additional_instructions,
+                                              model=model)
+            scenario["served_from_bank"] = False
+            return scenario
+
+        facets = {"topic": topic, "difficulty": difficulty, "scenario_type": scenario_type,
+                  "industry": industry_context, "variant": instructions_variant(additional_instructions)}
+        unseen = self.scenario_bank.find_unseen(instructor_id, limit=1, **facets)
+
+        if unseen:
+            scenario = unseen[0]
+            scenario["served_from_bank"] = True
+            self._count("bank")
+        else:
+            logger.info(f"Scenario bank exhausted for {facets}; generating live")
+            scenario = self.generate_scenario(topic, difficulty, scenario_type, industry_context,
+                                              structured=structured, additional_instructions=additional_instructions,
+                                              model=model)
+            scenario["served_from_bank"] = False
+            self._count("live")
+
+        if scenario.get("id"):
+            self.scenario_bank.mark_seen(instructor_id, scenario["id"])
+
+        if self.scenario_bank.count_unseen(instructor_id, **facets) < self.low_watermark:
+            self._schedule_refill(facets, structured, additional_instructions)
+
+        return scenario
+
+    def _count(self, stat: str):
+        """Increment a serve statistic; refills update them from the background thread"""
+        with self._stats_lock:
+            self.serve_stats[stat] += 1
+
+    def _schedule_refill(self, facets: Dict[str, Any], structured: bool,
+                         additional_instructions: Optional[str] = None):
+        """Queue a background top-up for a facet combination unless one is already running"""
+        key = tuple(sorted(facets.items()))
+        with self._refill_lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+        self._refill_executor.submit(self._refill, key, facets, structured, additional_instructions)
+
+    def _refill(self, key, facets: Dict[str, Any], structured: bool, additional_instructions: Optional[str] = None):
+        """Generate refill_batch scenarios for a facet combination, with the same instructions, into the bank"""
+        try:
+            for _ in range(self.refill_batch):
+                self.generate_scenario(facets["topic"], facets["difficulty"], facets["scenario_type"],
+                                       facets["industry"], structured=structured,
+                                       additional_instructions=additional_instructions)
+            self._count("refills")
+            logger.info(f"Topped up scenario bank for {facets}")
+        except Exception as e:
+            logger.error(f"Error topping up scenario bank: {str(e)}")
+        finally:
+            with self._refill_lock:
+                self._refilling.discard(key)
+
+    def _generate_text(self, **kwargs) -> str:
+        """Generate text with the model, raising ScenarioGenerationError instead of returning error text"""
+        result = self.ollama.generate_with_context(**kwargs)
+        if result.get("error"):
+            raise ScenarioGenerationError(result["error"])
+        return result["response"]
+
+    def _generate_structured(self, system_prompt: str, user_prompt: str,
+                             model: Optional[str] = None) -> Optional[StructuredScenario]:
+        """
+        Generate a scenario as JSON and validate it against StructuredScenario
+
+        Failed attempts are retried up to max_structured_retries times, feeding the
+        validation error back to the model.
+
+        Args:
+            system_prompt (str): Scenario system prompt
+            user_prompt (str): Scenario user prompt
+            model (str, optional): Model selected for this session
+
+        Returns:
+            StructuredScenario or None if every attempt failed validation
+        """
+        schema = json.dumps(StructuredScenario.model_json_schema())
+        prompt = (f"{user_prompt}\nRespond only with a JSON object that matches this JSON schema:\n{schema}\n"
+                  f"List every given value in available_data and every expected output in deliverables.")
+
+        for attempt in range(self.max_structured_retries + 1):
+            raw = self._generate_text(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=0.8,
+                format="json",
+                model=model
+            )
+            try:
+                return StructuredScenario.model_validate_json(raw)
+            except ValidationError as e:
+                logger.warning(f"Structured scenario failed validation (attempt {attempt + 1}): {e.error_count()} errors")
+                prompt = (f"{user_prompt}\nRespond only with a JSON object that matches this JSON schema:\n{schema}\n"
+                          f"Your previous answer was invalid:\n{str(e)}\nFix these errors.")
+
+        logger.error("Structured scenario generation failed; falling back to free-form text")
+        return None
+
+    def search_scenarios(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Search generated scenarios by keyword
+
+        Structured scenarios are matched against their fields; free-form ones
+        against the raw scenario text.
+
+        Args:
+            query (str): Case-insensitive search text
+
+        Returns:
+            list: Matching scenarios
+        """
+        query = query.lower()
+        matches = []
+        for record in self.generated_scenarios:
+            if record.sections:
+                text = StructuredScenario(**record.sections).searchable_text()
+            else:
+                text = record.scenario_text.lower()
+            if query in text:
+                matches.append(record.to_dict())
+        return matches
+
     def generate_variations(self, base_scenario: Dict[str, Any], num_variations: int = 3) -> List[Dict[str, Any]]:
         """
         Generate variations of a base scenario with different parameters
@@ -165,7 +398,8 @@ The scenario should challenge students to apply critical thinking skills while b
                 topic=base_topic,
                 difficulty=new_difficulty,
                 scenario_type=new_type,
-                industry_context=metadata.get("industry")
+                industry_context=metadata.get("industry"),
+                structured=base_scenario.get("sections") is not None
             )
 
             # Add variation metadata
@@ -178,16 +412,23 @@ The scenario should challenge students to apply critical thinking skills while b
 
     def export_scenarios(self, output_file: str = "generated_scenarios.json"):
         """
-        Export all generated scenarios to a file
+        Export generated scenarios to a file
+
+        With a scenario bank, the whole bank is streamed as JSON Lines;
+        otherwise the in-memory history is written as compact JSON.
 
         Args:
             output_file (str): Path to output file
         """
         try:
-            with open(output_file, "w") as f:
-                json.dump(self.generated_scenarios, f, indent=2)
-            logger.info(f"Exported {len(self.generated_scenarios)} scenarios to {output_file}")
+            if self.scenario_bank is not None:
+                exported = self.scenario_bank.export(output_file)
+            else:
+                with open(output_file, "w") as f:
+                    json.dump([record.to_dict() for record in self.generated_scenarios], f, separators=(",", ":"))
+                exported = len(self.generated_scenarios)
+            logger.info(f"Exported {exported} scenarios to {output_file}")
             return True
         except Exception as e:
             logger.error(f"Error exporting scenarios: {str(e)}")
-            return False
\ No newline at end of file
+            return False
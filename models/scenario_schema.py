@@ -0,0 +1,34 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class StructuredScenario(BaseModel):
+    """
+    Typed engineering scenario produced by constrained JSON generation
+    """
+
+    title: str = Field(min_length=1, description="Short descriptive title for the scenario")
+    context: str = Field(min_length=1, description="Industrial or research background for the scenario")
+    problem_statement: str = Field(min_length=1, description="What the students are asked to solve")
+    available_data: List[str] = Field(min_length=1, description="Given values, constraints and assumptions")
+    deliverables: List[str] = Field(min_length=1, description="What the students are expected to submit")
+
+    def to_markdown(self) -> str:
+        """
+        Render the scenario as markdown
+
+        Returns:
+            str: Markdown text with one section per field
+        """
+        data = "\n".join(f"- {item}" for item in self.available_data)
+        deliverables = "\n".join(f"{i}. {item}" for i, item in enumerate(self.deliverables, 1))
+        return (f"## {self.title}\n\n"
+                f"### Context\n{self.context}\n\n"
+                f"### Problem Statement\n{self.problem_statement}\n\n"
+                f"### Available Data\n{data}\n\n"
+                f"### Expected Deliverables\n{deliverables}\n")
+
+    def searchable_text(self) -> str:
+        """Concatenate all fields into a single lower-case string for searching"""
+        return " ".join([self.title, self.context, self.problem_statement,
+                         *self.available_data, *self.deliverables]).lower()
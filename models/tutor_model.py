@@ -1,10 +1,16 @@
-import os
+import time
 import logging
-import json
-from typing import List, Dict, Any, Optional
-import pandas as pd
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from utils.prompt_templates import TutorPromptTemplates
 from utils.critical_thinking import CriticalThinkingFramework
+from utils.prompt_assembly import PromptAssembler
+from utils.intent_classifier import IntentClassifier
+from database.guidance_cache import content_hash
+from models.records import Message
+from utils.data_processing import CourseDataLoader
+from utils.session_store import SessionStore
 
 logger = logging.getLogger("EngE-AI.tutor")
 
@@ -15,50 +21,95 @@ class EngineeringTutor:
     focused on Chemical and Biological Engineering concepts
     """
 
-    def __init__(self, ollama_manager, course_data_path="database/course_data"):
+    # Ollama contexts kept per session, one per (model, system prompt) the session has used
+    MAX_SESSION_CONTEXTS = 4
+
+    def __init__(self, ollama_manager, course_data_path="database/course_data", use_context=True,
+                 router=None, max_tokens=1024, intent_classifier=None, guidance_cache=None,
+                 scaffold_cache=None, max_cached_courses=4, max_sessions=500, session_idle_timeout=3600):
         """
         Initialize the engineering tutor with course-specific knowledge
 
         Args:
             ollama_manager: Instance of OllamaManager for LLM interaction
             course_data_path (str): Path to course data files
+            use_context (bool): Continue conversations from Ollama context tokens instead of resending history
+            router (ModelRouter, optional): Picks a model tier when no model is given
+            max_tokens (int): Upper bound on generation length for tutor answers
+            intent_classifier (IntentClassifier, optional): Picks the mode when answer_question gets mode="auto"
+            guidance_cache (GuidanceCache, optional): Precomputed stage guidance checked before calling the LLM
+            scaffold_cache (ScaffoldCache, optional): Persistent cache of topic scaffolds; course topics
+                                                     are warmed into it in the background
+            max_cached_courses (int): Courses whose data is kept in memory before the least
+                                      recently used is evicted
+            max_sessions (int): Sessions whose history and contexts are kept before the least
+                                recently used is evicted
+            session_idle_timeout (int): Seconds without a question after which a session's
+                                        history and contexts are dropped
         """
         self.ollama = ollama_manager
         self.course_data_path = course_data_path
         self.templates = TutorPromptTemplates()
-        self.ct_framework = CriticalThinkingFramework()
-        self.course_data = self._load_course_data()
-        self.conversation_history = []
-
-    def _load_course_data(self) -> Dict[str, Any]:
-        """Load course-specific data from files"""
-        course_data = {}
-
-        try:
-            # Load course topics and concepts
-            topics_path = os.path.join(self.course_data_path, "topics.json")
-            if os.path.exists(topics_path):
-                with open(topics_path, "r") as f:
-                    course_data["topics"] = json.load(f)
-
-            # Load problem sets
-            problems_path = os.path.join(self.course_data_path, "problems.json")
-            if os.path.exists(problems_path):
-                with open(problems_path, "r") as f:
-                    course_data["problems"] = json.load(f)
-
-            # Load learning objectives
-            objectives_path = os.path.join(self.course_data_path, "learning_objectives.json")
-            if os.path.exists(objectives_path):
-                with open(objectives_path, "r") as f:
-                    course_data["objectives"] = json.load(f)
-
-            logger.info(f"Loaded course data with {len(course_data.get('topics', []))} topics")
-            return course_data
-
-        except Exception as e:
-            logger.error(f"Error loading course data: {str(e)}")
-            return {"topics": [], "problems": [], "objectives": []}
+        self.ct_framework = CriticalThinkingFramework(ollama_manager, scaffold_cache=scaffold_cache)
+        self.prompts = PromptAssembler(self.templates, self.ct_framework)
+        self.max_cached_courses = max_cached_courses
+        self.course_loader = self._load_course_data()
+        self.use_context = use_context
+        self.router = router
+        self.max_tokens = max_tokens
+        self.intent_classifier = intent_classifier or IntentClassifier()
+        self.guidance_cache = guidance_cache
+
+        if scaffold_cache is not None:
+            self.ct_framework.warm_scaffolds(self._course_topics())
+        # The tutor is shared by every browser session, so per-session state is bounded and idle-expired
+        self.sessions = SessionStore(lambda: {"history": [], "contexts": OrderedDict()},
+                                     max_sessions=max_sessions, idle_timeout=session_idle_timeout)
+        self.prefill_turns = deque(maxlen=1000)
+
+    @property
+    def conversation_history(self) -> List[Message]:
+        """Conversation history of the default (unnamed) session"""
+        return self.get_history()
+
+    def get_history(self, session_id: Optional[str] = None) -> List[Message]:
+        """Conversation history for a session (the UI renders this same list)"""
+        return self.sessions.get(session_id)["history"]
+
+    def session_contexts(self, session_id: Optional[str] = None) -> "OrderedDict[tuple, Dict[str, Any]]":
+        """Stored Ollama contexts of a session, keyed by (model, system prompt)"""
+        return self.sessions.get(session_id)["contexts"]
+
+    def _load_course_data(self) -> CourseDataLoader:
+        """Open the course data files lazily; each course is read on first use"""
+        return CourseDataLoader(self.course_data_path, max_courses=self.max_cached_courses)
+
+    def get_course_data(self, course: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Topics, problems and learning objectives of a course
+
+        Args:
+            course (str, optional): Course name; None for data shared by every course
+
+        Returns:
+            dict: {"topics": ..., "problems": ..., "objectives": ...}
+        """
+        return self.course_loader.get(course)
+
+    def _course_topics(self) -> List[Any]:
+        """Topic names from topics.json, as (topic, course) pairs when topics are grouped by course"""
+        topics = []
+        for course, items in self.course_loader.iter_section("topics"):
+            if not isinstance(items, list):
+                continue
+            names = [self._topic_name(t) for t in items]
+            topics += names if course is None else [(name, course) for name in names]
+        return topics
+
+    @staticmethod
+    def _topic_name(topic) -> str:
+        """Topic entries may be plain names or dicts with a name"""
+        return topic.get("name") or topic.get("topic") if isinstance(topic, dict) else topic
 
     def get_system_prompt(self, mode="general") -> str:
         """
@@ -71,51 +122,201 @@ class EngineeringTutor:
         Returns:
             str: System prompt for the LLM
         """
-        if mode == "concept_explanation":
-            return self.templates.concept_explanation_prompt
-        elif mode == "problem_solving":
-            return self.templates.problem_solving_prompt
-        elif mode == "critical_thinking":
-            return self.templates.critical_thinking_prompt
-        else:  # general mode
-            return self.templates.general_tutor_prompt
+        return self.prompts.get_system_prompt(mode)
 
     def answer_question(self, question: str, mode="general",
-                        include_critical_thinking=True) -> str:
+                        include_critical_thinking=True, session_id: Optional[str] = None,
+                        model: Optional[str] = None, course: Optional[str] = None) -> str:
         """
         Answer a student's question using the appropriate mode
 
         Args:
             question (str): The student's question
-            mode (str): Interaction mode
+            mode (str): Interaction mode, or "auto" to detect it from the question
             include_critical_thinking (bool): Whether to incorporate critical thinking prompts
+            session_id (str, optional): Conversation id used to keep the session on one Ollama node
+            model (str, optional): Model selected for this session; when omitted and a router is
+                                   configured, the router picks a model tier for the question
+            course (str, optional): Course the question belongs to, used to learn answer lengths
 
         Returns:
             str: Tutor's response
         """
         # Update conversation history
-        self.conversation_history.append({"role": "user", "content": question})
+        history = self.get_history(session_id)
+        history.append(Message.create("user", question))
 
-        # Get appropriate system prompt
-        system_prompt = self.get_system_prompt(mode)
+        if mode == "auto":
+            mode = self.intent_classifier.predict(question)
 
-        # If critical thinking is enabled, enhance the system prompt
-        if include_critical_thinking and mode != "critical_thinking":
-            ct_enhancement = self.ct_framework.get_enhancement_prompt()
-            system_prompt = f"{system_prompt}\n\n{ct_enhancement}"
+        # Get the precompiled system prompt (with critical thinking enhancement if enabled)
+        system_prompt = self.prompts.get_system_prompt(mode, include_critical_thinking)
 
-        # Prepare full conversation history for context
-        messages = [{"role": "system", "content": system_prompt}] + self.conversation_history
+        # Learned generation budget (the mode profile until enough answers are seen) and stop sequences
+        options = self.prompts.get_generation_options(mode)
+        budget_key = ("answer_question", mode, course)
+        max_tokens = min(self.ollama.budget.get_budget(*budget_key, default=options["num_predict"]),
+                         self.max_tokens)
+        stop = options["stop"]
+
+        tier = None
+        if model is None and self.router is not None:
+            tier, model = self.router.route(question)
+            # Routed models count against the memory budget like manual switches; a small model that
+            # would evict models other sessions are using falls back to the large tier
+            if not self._admit(session_id, model) and tier == "small":
+                tier, model = "large", self.router.model_for("large")
+                self._admit(session_id, model)
 
-        # Generate response
-        response = self.ollama.chat(messages)
+        start = time.monotonic()
+        result = self._generate_turn(question, history, system_prompt, session_id, model, max_tokens, stop,
+                                     budget_key)
+
+        # Escalate truncated small-model answers to the large model
+        escalated = False
+        if tier == "small" and self._is_truncated(result):
+            logger.info("Small-model answer was truncated; escalating to the large model")
+            # The small model's context ends with the discarded answer
+            self.session_contexts(session_id).pop((model, system_prompt), None)
+            tier, model, escalated = "large", self.router.model_for("large"), True
+            self._admit(session_id, model)
+            result = self._generate_turn(question, history, system_prompt, session_id, model, max_tokens, stop,
+                                         budget_key)
+
+        if tier is not None:
+            self.router.record(tier, time.monotonic() - start, escalated=escalated)
+
+        response = result["response"]
 
         # Add to conversation history
-        self.conversation_history.append({"role": "assistant", "content": response})
+        history.append(Message.create("assistant", response))
 
         return response
 
-    def guide_critical_thinking(self, problem: str, thinking_stage: str) -> str:
+    def _admit(self, session_id: Optional[str], model: str) -> bool:
+        """Register a routed model with the residency manager; False if it does not fit right now"""
+        return self.ollama.residency.request_switch(session_id, model, queue=False)["status"] == "granted"
+
+    def _generate_turn(self, question: str, history: List[Message], system_prompt: str,
+                       session_id: Optional[str], model: Optional[str], max_tokens: int,
+                       stop: Optional[List[str]] = None, budget_key: Optional[tuple] = None) -> Dict[str, Any]:
+        """Generate one answer, returning the response text and any generation metadata"""
+        if self.use_context:
+            return self._continue_conversation(question, history, system_prompt, session_id, model,
+                                               max_tokens, stop, budget_key)
+
+        # Prepare full conversation history for context
+        messages = [{"role": "system", "content": system_prompt}] + [m.to_dict() for m in history]
+        return self.ollama.chat_with_metadata(messages, max_tokens=max_tokens, session_id=session_id, model=model,
+                                              stop=stop, budget_key=budget_key)
+
+    @staticmethod
+    def _is_truncated(result: Dict[str, Any]) -> bool:
+        """Whether a generation still ended at the length limit after its continuations"""
+        return result.get("done_reason") == "length"
+
+    def _continue_conversation(self, question: str, history: List[Message], system_prompt: str,
+                               session_id: Optional[str], model: Optional[str], max_tokens: int,
+                               stop: Optional[List[str]] = None,
+                               budget_key: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Answer using the session's stored Ollama context, falling back to the full history
+
+        A context is only valid for the model and system prompt it was produced
+        with, so each session keeps one context per (model, system prompt).
+        Switching between routed tiers or modes continues the matching context,
+        replaying only the turns it has not seen; a session without one (or
+        after an invalidation) replays the whole history and starts a fresh one.
+        """
+        model = model or self.ollama.model_name
+        contexts = self.session_contexts(session_id)
+        key = (model, system_prompt)
+        state = contexts.get(key)
+        # history ends with the new question; the context covers the messages before it
+        seen = state["messages"] if state is not None and state["messages"] < len(history) else 0
+
+        if seen:
+            prompt = self._render_transcript(history[seen:], header="Conversation since your last answer:")
+            context = state["context"]
+        else:
+            prompt, context = self._render_transcript(history), None
+
+        result = self.ollama.generate_with_context(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            context=context,
+            max_tokens=max_tokens,
+            session_id=session_id,
+            model=model,
+            stop=stop,
+            budget_key=budget_key
+        )
+
+        if result.get("context"):
+            # The new context also covers the answer, which the caller appends to history
+            contexts[key] = {"context": result["context"], "messages": len(history) + 1}
+            contexts.move_to_end(key)
+            while len(contexts) > self.MAX_SESSION_CONTEXTS:
+                contexts.popitem(last=False)
+        else:
+            contexts.pop(key, None)
+
+        self._record_prefill(result, tokens_reused=len(context) if context else 0)
+        return result
+
+    @staticmethod
+    def _render_transcript(history: List[Message], header="Conversation so far:") -> str:
+        """Render a conversation as a single prompt (the last message is the new question)"""
+        if len(history) == 1:
+            return history[0].content
+        speakers = {"user": "Student", "assistant": "Tutor"}
+        lines = [f"{speakers.get(m.role, m.role)}: {m.content}" for m in history[:-1]]
+        return (f"{header}\n" + "\n\n".join(lines) +
+                f"\n\nContinue the conversation by answering the student's new question:\n{history[-1].content}")
+
+    def _record_prefill(self, result: Dict[str, Any], tokens_reused: int):
+        """Record prompt-evaluation stats for one turn"""
+        prompt_tokens = result.get("prompt_eval_count", 0)
+        prompt_seconds = result.get("prompt_eval_duration", 0) / 1e9
+        seconds_per_token = prompt_seconds / prompt_tokens if prompt_tokens else 0.0
+        self.prefill_turns.append({
+            "prompt_tokens": prompt_tokens,
+            "prefill_seconds": prompt_seconds,
+            "tokens_reused": tokens_reused,
+            "seconds_saved": tokens_reused * seconds_per_token
+        })
+
+    def invalidate_context(self, session_id: Optional[str] = None):
+        """
+        Drop a session's stored Ollama contexts
+
+        Call this whenever the history is rewritten (e.g. summarized) so the next
+        turn replays the history instead of continuing from stale tokens.
+        """
+        state = self.sessions.peek(session_id)
+        if state is not None:
+            state["contexts"].clear()
+
+    def get_prefill_report(self) -> Dict[str, Any]:
+        """
+        Summarize prefill work per turn and the time saved by context reuse
+
+        Returns:
+            dict: Turn counts, average prefill tokens/seconds and estimated seconds saved per reused turn
+        """
+        turns = list(self.prefill_turns)
+        reused = [t for t in turns if t["tokens_reused"]]
+        return {
+            "turns": len(turns),
+            "context_turns": len(reused),
+            "avg_prefill_tokens": sum(t["prompt_tokens"] for t in turns) / len(turns) if turns else 0.0,
+            "avg_prefill_seconds": sum(t["prefill_seconds"] for t in turns) / len(turns) if turns else 0.0,
+            "avg_tokens_reused": sum(t["tokens_reused"] for t in reused) / len(reused) if reused else 0.0,
+            "avg_seconds_saved": sum(t["seconds_saved"] for t in reused) / len(reused) if reused else 0.0
+        }
+
+    def guide_critical_thinking(self, problem: str, thinking_stage: str, model: Optional[str] = None,
+                                course: Optional[str] = None) -> str:
         """
         Guide students through critical thinking stages
 
@@ -123,28 +324,132 @@ class EngineeringTutor:
             problem (str): The problem or scenario to analyze
             thinking_stage (str): Current stage of critical thinking
                                  ('identify', 'analyze', 'evaluate', 'create')
+            model (str, optional): Model selected for this session
+            course (str, optional): Course the problem belongs to, used to learn guidance lengths
 
         Returns:
             str: Guidance appropriate for the current thinking stage
         """
-        # Get critical thinking prompt for specific stage
-        ct_prompt = self.ct_framework.get_stage_prompt(thinking_stage)
+        return self._stage_guidance(problem, thinking_stage, model, course)["response"]
 
-        # Prepare the problem context with stage-specific prompt
-        context = f"Problem: {problem}\n\nStage: {thinking_stage}\n\n{ct_prompt}"
+    def _stage_guidance(self, problem: str, thinking_stage: str, model: Optional[str] = None,
+                        course: Optional[str] = None) -> Dict[str, Any]:
+        """Stage guidance as a generate_with_context result; failures carry an "error" key and are not cached"""
+        model = model or self.ollama.model_name
+        key = self._guidance_key(problem, thinking_stage)
+        if self.guidance_cache is not None:
+            cached = self.guidance_cache.get(*key, model)
+            if cached is not None:
+                return {"response": cached, "cached": True}
+
+        # Prepare the problem context with the precompiled stage-specific prompt
+        context = self.prompts.build_stage_context(problem, thinking_stage)
 
         # Get general critical thinking system prompt
-        system_prompt = self.get_system_prompt(mode="critical_thinking")
+        system_prompt = self.prompts.get_system_prompt(mode="critical_thinking")
 
         # Generate guidance
-        response = self.ollama.generate_response(
+        result = self.ollama.generate_with_context(
             prompt=context,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            model=model,
+            budget_key=("guide_critical_thinking", thinking_stage.lower(), course)
         )
 
-        return response
+        if self.guidance_cache is not None and not result.get("error"):
+            self.guidance_cache.put(*key, model, result["response"])
+
+        return result
+
+    def walkthrough(self, problem: str, stages: Optional[List[str]] = None, model: Optional[str] = None,
+                    course: Optional[str] = None, max_workers: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Generate guidance for every critical thinking stage of a problem concurrently
+
+        Every stage prompt starts with the same problem text (see
+        PromptAssembler.build_stage_context), so the stages share one stable
+        prefix. Stages are requested in parallel and yielded as soon as each
+        finishes, which brings the full walkthrough close to a single call's
+        latency when the Ollama server runs requests in parallel
+        (OLLAMA_NUM_PARALLEL) or the pool has several nodes.
+
+        Args:
+            problem (str): The problem or scenario to analyze
+            stages (list, optional): Stage keys (defaults to every framework stage, in order)
+            model (str, optional): Model selected for this session
+            course (str, optional): Course the problem belongs to
+            max_workers (int, optional): Concurrent requests (defaults to one per stage)
+
+        Yields:
+            tuple: (stage key, guidance) in completion order
+        """
+        stages = stages or list(self.ct_framework.stages)
+        with ThreadPoolExecutor(max_workers=max_workers or len(stages)) as executor:
+            futures = {executor.submit(self.guide_critical_thinking, problem, stage, model, course): stage
+                       for stage in stages}
+            for future in as_completed(futures):
+                stage = futures[future]
+                try:
+                    yield stage, future.result()
+                except Exception as e:
+                    logger.error(f"Error generating {stage} guidance: {str(e)}")
+                    yield stage, f"Error generating response: {str(e)}"
+
+    def _guidance_key(self, problem: str, thinking_stage: str):
+        """(problem hash, stage, prompt hash) identifying a piece of stage guidance"""
+        stage = thinking_stage.lower()
+        system_prompt = self.prompts.get_system_prompt(mode="critical_thinking")
+        return content_hash(problem), stage, content_hash(f"{self.prompts.get_stage_prompt(stage)}\x00{system_prompt}")
+
+    def precompute_guidance(self, problems: List[str], stages: Optional[List[str]] = None,
+                            model: Optional[str] = None, max_workers=4, prune=False) -> Dict[str, Any]:
+        """
+        Generate stage guidance for every problem x stage that is not cached yet
+
+        Args:
+            problems (list): Problem texts (assessment questions, saved scenarios)
+            stages (list, optional): Stage keys (defaults to every framework stage)
+            model (str, optional): Model to generate with (defaults to the manager's model)
+            max_workers (int): Concurrent generation requests
+            prune (bool): Delete cached guidance for problems and prompts not in this run
+
+        Returns:
+            dict: generated, cached and failed counts and elapsed seconds
+        """
+        if self.guidance_cache is None:
+            raise ValueError("precompute_guidance requires a guidance_cache")
+
+        start = time.monotonic()
+        model = model or self.ollama.model_name
+        stages = stages or list(self.ct_framework.stages)
+        grid = [(problem, stage) for problem in dict.fromkeys(problems) for stage in stages]
+        missing = [(p, s) for p, s in grid if self.guidance_cache.get(*self._guidance_key(p, s), model) is None]
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._stage_guidance, p, s, model) for p, s in missing]
+            for future in as_completed(futures):
+                try:
+                    if future.result().get("error"):
+                        failed += 1
+                except Exception as e:
+                    logger.error(f"Error precomputing stage guidance: {str(e)}")
+                    failed += 1
+
+        if prune:
+            keys = [self._guidance_key(p, s) for p, s in grid]
+            self.guidance_cache.prune({k[0] for k in keys}, {k[2] for k in keys})
+
+        report = {
+            "generated": len(missing) - failed,
+            "cached": len(grid) - len(missing),
+            "failed": failed,
+            "elapsed_seconds": round(time.monotonic() - start, 2)
+        }
+        logger.info(f"Precomputed stage guidance: {report}")
+        return report
 
-    def reset_conversation(self):
-        """Reset the conversation history"""
-        self.conversation_history = []
-        logger.info("Conversation history reset")
\ No newline at end of file
+    def reset_conversation(self, session_id: Optional[str] = None):
+        """Reset the conversation history (and stored contexts) for a session, freeing its state"""
+        self.sessions.pop(session_id)
+        logger.info("Conversation history reset")
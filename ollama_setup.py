@@ -1,8 +1,16 @@
 import os
+import re
+import httpx
 import ollama
-import json
+import time
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from dotenv import load_dotenv
+from utils.generation_budget import GenerationBudget
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +26,617 @@ logger = logging.getLogger("EngE-AI")
 # Load environment variables
 load_dotenv()
 
+# Follow-up prompt used when an answer stops at its token budget
+CONTINUATION_PROMPT = "Continue exactly where you left off, without repeating anything."
+
+
+def _parse_course_hours(value):
+    """
+    Parse a course-hours window such as "08:00-18:00"
+
+    Args:
+        value (str): Start and end time separated by a dash
+
+    Returns:
+        tuple: (start, end) as datetime.time objects
+    """
+    start, end = value.split("-")
+    return (datetime.strptime(start.strip(), "%H:%M").time(),
+            datetime.strptime(end.strip(), "%H:%M").time())
+
+
+def _parse_duration(value):
+    """
+    Parse an Ollama keep_alive duration such as "30m", "1h30m", "300" or -1
+
+    Args:
+        value (str | int | float): Duration string or number of seconds
+
+    Returns:
+        float: Seconds, or None when a negative duration keeps models loaded indefinitely
+    """
+    text = str(value).strip()
+    if re.fullmatch(r"-?\d+(\.\d+)?", text):
+        seconds = float(text)
+    else:
+        units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+        seconds = sum(float(number) * units[unit] for number, unit in re.findall(r"(-?[\d.]+)(ms|h|m|s)", text))
+    return None if seconds < 0 else seconds
+
+
+def _model_key(model_name):
+    """Canonical model name, with the ":latest" tag Ollama lists untagged models under"""
+    return model_name if ":" in model_name.rsplit("/", 1)[-1] else f"{model_name}:latest"
+
+
+def _is_node_failure(error):
+    """
+    Whether an error means the node itself is unreachable or failing
+
+    Connection errors, timeouts and 5xx responses count against a node; client
+    errors such as an unknown model (4xx) are the request's fault.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, ollama.ResponseError) and error.status_code >= 500
+
+
+class OllamaNode:
+    """A single Ollama endpoint tracked by the backend pool"""
+
+    def __init__(self, host):
+        """
+        Args:
+            host (str): Base URL of the Ollama server
+        """
+        self.host = host
+        self.client = ollama.Client(host=host)
+        self.healthy = True
+        self.outstanding = 0
+        self.failures = 0
+        self.latency = None  # Exponentially weighted average request latency in seconds
+
+    def to_dict(self):
+        """Snapshot of the node state for reporting"""
+        return {
+            "host": self.host,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "failures": self.failures,
+            "latency": round(self.latency, 3) if self.latency is not None else None
+        }
+
+
+class OllamaBackendPool:
+    """
+    Pool of Ollama endpoints with health-checked load balancing.
+
+    Requests go to the healthy node with the fewest outstanding requests
+    ("least_outstanding") or the lowest outstanding x latency score
+    ("latency_weighted"). Conversations are pinned to one node so follow-up
+    turns hit the same prompt cache.
+    """
+
+    STRATEGIES = ("least_outstanding", "latency_weighted")
+
+    def __init__(self, hosts, strategy="least_outstanding", health_interval=30,
+                 max_failures=3, max_pins=10000, latency_alpha=0.3):
+        """
+        Initialize the backend pool
+
+        Args:
+            hosts (list): Ollama base URLs
+            strategy (str): Node selection strategy, one of STRATEGIES
+            health_interval (int): Seconds between health checks (0 disables the checker thread)
+            max_failures (int): Consecutive failures after which a node is ejected
+            max_pins (int): Maximum number of conversation-to-node pins remembered
+            latency_alpha (float): Smoothing factor for the latency average
+        """
+        if not hosts:
+            raise ValueError("At least one Ollama host is required")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy}. Available: {', '.join(self.STRATEGIES)}")
+
+        self.nodes = [OllamaNode(host) for host in hosts]
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.max_pins = max_pins
+        self.latency_alpha = latency_alpha
+        self._pins = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def healthy_nodes(self):
+        """List the nodes currently accepting requests"""
+        return [node for node in self.nodes if node.healthy]
+
+    def _score(self, node):
+        """Lower is better"""
+        if self.strategy == "latency_weighted":
+            return (node.outstanding + 1) * (node.latency or 1.0)
+        return (node.outstanding, node.latency or 0.0)
+
+    def select(self, session_id=None):
+        """
+        Pick a node for a request
+
+        Args:
+            session_id (str, optional): Conversation to keep on the same node
+
+        Returns:
+            OllamaNode: Selected node (an unhealthy one only if every node is down)
+        """
+        with self._lock:
+            if session_id is not None and session_id in self._pins:
+                node = self._pins[session_id]
+                if node.healthy:
+                    self._pins.move_to_end(session_id)
+                    return node
+
+            candidates = self.healthy_nodes() or sorted(self.nodes, key=lambda n: n.failures)[:1]
+            node = min(candidates, key=self._score)
+
+            if session_id is not None:
+                self._pins[session_id] = node
+                self._pins.move_to_end(session_id)
+                while len(self._pins) > self.max_pins:
+                    self._pins.popitem(last=False)
+            return node
+
+    @contextmanager
+    def acquire(self, session_id=None):
+        """
+        Context manager yielding an ollama.Client while tracking load and latency
+
+        Args:
+            session_id (str, optional): Conversation to keep on the same node
+        """
+        node = self.select(session_id)
+        with self._lock:
+            node.outstanding += 1
+        start = time.monotonic()
+        try:
+            yield node.client
+        except Exception as e:
+            if _is_node_failure(e):
+                self._record_failure(node)
+            raise
+        else:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                node.failures = 0
+                if node.latency is None:
+                    node.latency = elapsed
+                else:
+                    node.latency = self.latency_alpha * elapsed + (1 - self.latency_alpha) * node.latency
+        finally:
+            with self._lock:
+                node.outstanding -= 1
+
+    def _record_failure(self, node):
+        """Count a connection, timeout or server failure and eject the node once it reaches max_failures"""
+        with self._lock:
+            node.failures += 1
+            if node.healthy and node.failures >= self.max_failures:
+                node.healthy = False
+                logger.warning(f"Ejected unhealthy Ollama node {node.host}")
+
+    def check_health(self):
+        """Probe every node and eject or re-admit it accordingly"""
+        for node in self.nodes:
+            try:
+                node.client.list()
+            except Exception as e:
+                logger.debug(f"Health check failed for {node.host}: {str(e)}")
+                self._record_failure(node)
+                continue
+            with self._lock:
+                node.failures = 0
+                if not node.healthy:
+                    node.healthy = True
+                    logger.info(f"Re-admitted Ollama node {node.host}")
+
+    def start(self):
+        """Start the background health checker (no-op if disabled)"""
+        if self.health_interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ollama-health-check", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background health checker"""
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.health_interval):
+            self.check_health()
+
+    def get_status(self):
+        """
+        Report the state of every node
+
+        Returns:
+            list: One dictionary per node
+        """
+        with self._lock:
+            return [node.to_dict() for node in self.nodes]
+
+
+class KeepAliveManager:
+    """
+    Keeps the active and fallback models resident in Ollama memory.
+
+    Which models to ping is decided by the residency manager, so models it
+    evicted to make room for a session's switch are not reloaded behind its back.
+    """
+
+    def __init__(self, ollama_manager, keep_alive=None, ping_interval=None,
+                 course_hours=None, fallback_model=None, cold_load_threshold=1.0):
+        """
+        Initialize the keep-alive manager
+
+        Args:
+            ollama_manager: OllamaManager whose model should stay loaded
+            keep_alive (str, optional): How long Ollama keeps a model loaded after a request
+            ping_interval (int, optional): Seconds between keep-alive pings (0 disables pinging)
+            course_hours (str, optional): Daily window for pings, e.g. "08:00-18:00"
+            fallback_model (str, optional): Backup model to pre-warm alongside the active one
+            cold_load_threshold (float): Load time in seconds above which a load counts as cold
+        """
+        self.manager = ollama_manager
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        self.ping_interval = ping_interval if ping_interval is not None else int(
+            os.getenv("OLLAMA_KEEP_ALIVE_INTERVAL", "240"))
+        self.course_hours = _parse_course_hours(course_hours or os.getenv("ENGE_AI_COURSE_HOURS", "08:00-18:00"))
+        self.fallback_model = fallback_model or os.getenv("OLLAMA_FALLBACK_MODEL", "mistral")
+        self.cold_load_threshold = cold_load_threshold
+        self.load_stats = {"cold": 0, "warm": 0}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def record_load(self, response):
+        """
+        Classify a response as a cold or warm model load from its load_duration
+
+        Args:
+            response (dict): Raw response returned by ollama.generate or ollama.chat
+        """
+        load_seconds = response.get("load_duration", 0) / 1e9
+        key = "cold" if load_seconds > self.cold_load_threshold else "warm"
+        with self._lock:
+            self.load_stats[key] += 1
+        if key == "cold":
+            logger.info(f"Cold model load ({load_seconds:.2f}s) for {response.get('model')}")
+
+    def warm(self, model_name):
+        """
+        Load a model into memory on every healthy node with an empty generate request
+
+        Args:
+            model_name (str): Name of the Ollama model to warm
+
+        Returns:
+            bool: True if the model was loaded on at least one node
+        """
+        warmed = False
+        for node in self.manager.pool.healthy_nodes():
+            try:
+                response = node.client.generate(model=model_name, prompt="", keep_alive=self.keep_alive)
+                self.record_load(response)
+                self.manager.residency.touch(None, model_name)
+                warmed = True
+            except Exception as e:
+                logger.warning(f"Error warming model {model_name} on {node.host}: {str(e)}")
+        return warmed
+
+    def warm_all(self):
+        """Warm the active and fallback models, and models sessions are using, as far as residency allows"""
+        for model_name in self.manager.residency.warm_targets([self.manager.model_name, self.fallback_model]):
+            self.warm(model_name)
+
+    def in_course_hours(self, now=None):
+        """Check whether the given time (default: now) falls inside course hours"""
+        now = now or datetime.now()
+        start, end = self.course_hours
+        return start <= now.time() <= end
+
+    def start(self):
+        """Start the background keep-alive thread (no-op if pinging is disabled)"""
+        if self.ping_interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ollama-keep-alive", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background keep-alive thread"""
+        self._stop_event.set()
+
+    def _run(self):
+        """Pre-warm the fallback model, then ping the models residency keeps loaded during course hours"""
+        self.warm_all()
+        while not self._stop_event.wait(self.ping_interval):
+            if self.in_course_hours():
+                self.warm_all()
+
+    def get_load_report(self):
+        """
+        Report cold versus warm model loads
+
+        Returns:
+            dict: Cold and warm load counts and the cold-load ratio
+        """
+        with self._lock:
+            cold, warm = self.load_stats["cold"], self.load_stats["warm"]
+        total = cold + warm
+        return {
+            "cold": cold,
+            "warm": warm,
+            "cold_ratio": round(cold / total, 3) if total else 0.0
+        }
+
+
+class ModelResidencyManager:
+    """
+    Tracks which models are loaded, what they cost in memory and which sessions use them.
+
+    Per-session model switches are granted only if the model fits in the memory
+    budget after evicting models no other session is actively using; otherwise
+    they are queued (or rejected) instead of thrashing models that other
+    students depend on.
+    """
+
+    def __init__(self, ollama_manager, memory_budget_gb=None, active_window=900, allow_queue=True,
+                 refresh_interval=60):
+        """
+        Initialize the residency manager
+
+        Args:
+            ollama_manager: OllamaManager used to look up model sizes and unload models
+            memory_budget_gb (float, optional): Memory available for loaded models per node
+            active_window (int): Seconds since last request during which a session counts as active
+            allow_queue (bool): Queue switches that do not fit instead of rejecting them
+            refresh_interval (int): Minimum seconds between model size lookups for unknown models
+        """
+        self.manager = ollama_manager
+        budget_gb = memory_budget_gb or float(os.getenv("OLLAMA_MEMORY_BUDGET_GB", "16"))
+        self.memory_budget = int(budget_gb * 1024 ** 3)
+        self.active_window = active_window
+        self.allow_queue = allow_queue
+        self.refresh_interval = refresh_interval
+        self.model_sizes = {}
+        self.loaded = {}    # model -> last used timestamp
+        self.sessions = {}  # session_id -> (model, last active timestamp)
+        self.pending = OrderedDict()  # session_id -> requested model
+        self.evicted = set()  # models unloaded to make room, not re-warmed until a session uses them again
+        self._refreshed_at = None
+        self._lock = threading.RLock()
+
+    def refresh_sizes(self):
+        """Look up the on-disk size of every available model as its memory cost"""
+        try:
+            with self.manager.pool.acquire() as client:
+                models = client.list()
+            with self._lock:
+                for model in models.get('models', []):
+                    self.model_sizes[_model_key(model.get('name'))] = model.get('size', 0)
+                self._refreshed_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error refreshing model sizes: {str(e)}")
+
+    def _ensure_sizes(self, model_names=()):
+        """Refresh sizes, outside the lock, if a requested or loaded model has no known size"""
+        with self._lock:
+            names = [_model_key(m) for m in model_names] + list(self.loaded)
+            missing = any(m not in self.model_sizes for m in names)
+            due = self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_interval
+        if missing and due:
+            self.refresh_sizes()
+
+    def model_cost(self, model_name):
+        """Memory cost of a model in bytes (0 if unknown); sizes are looked up by _ensure_sizes"""
+        return self.model_sizes.get(_model_key(model_name), 0)
+
+    def _expire(self):
+        """Forget models that Ollama has unloaded after keep_alive without requests"""
+        keep_alive = _parse_duration(self.manager.keep_alive_manager.keep_alive)
+        if keep_alive is None:
+            return
+        cutoff = time.time() - keep_alive
+        with self._lock:
+            for model in [m for m, last in self.loaded.items() if last < cutoff]:
+                del self.loaded[model]
+
+    def touch(self, session_id, model_name):
+        """Record that a session just used a model"""
+        model_name = _model_key(model_name)
+        now = time.time()
+        with self._lock:
+            self.loaded[model_name] = now
+            self.evicted.discard(model_name)
+            if session_id is not None:
+                self.sessions[session_id] = (model_name, now)
+
+    def active_sessions(self, model_name, exclude=None):
+        """Sessions that used a model within the active window"""
+        model_name = _model_key(model_name)
+        cutoff = time.time() - self.active_window
+        with self._lock:
+            return [sid for sid, (model, last) in self.sessions.items()
+                    if model == model_name and last >= cutoff and sid != exclude]
+
+    def _used_memory(self):
+        return sum(self.model_cost(model) for model in self.loaded)
+
+    def warm_targets(self, preferred=()):
+        """
+        Models the keep-alive thread should keep loaded
+
+        Models used by a session within the active window are kept warm. The
+        preferred models (the default and fallback) are kept too unless they were
+        evicted for a switch or, when not loaded, would not fit in the budget.
+
+        Args:
+            preferred (list): Model names to keep loaded when possible
+
+        Returns:
+            list: Model names to warm
+        """
+        self._expire()
+        self._ensure_sizes([m for m in preferred if m])
+        cutoff = time.time() - self.active_window
+        with self._lock:
+            targets = list(dict.fromkeys(model for model, last in self.sessions.values() if last >= cutoff))
+            free = self.memory_budget - self._used_memory()
+            for model in dict.fromkeys(_model_key(m) for m in preferred if m):
+                if model in targets or model in self.evicted:
+                    continue
+                if model not in self.loaded:
+                    if self.model_cost(model) > free:
+                        continue
+                    free -= self.model_cost(model)
+                targets.append(model)
+            return targets
+
+    def request_switch(self, session_id, model_name, queue=None):
+        """
+        Ask to move a session to a different model
+
+        Args:
+            session_id (str): Session requesting the switch
+            model_name (str): Model the session wants to use
+            queue (bool, optional): Queue the switch if it does not fit (defaults to allow_queue)
+
+        Returns:
+            dict: {"status": "granted" | "queued" | "rejected", "evicted": [...], "blocking": [...]}
+        """
+        self._expire()
+        self._ensure_sizes([model_name])
+        model_name = _model_key(model_name)
+        with self._lock:
+            was_loaded = model_name in self.loaded
+            result = self._switch(session_id, model_name, self.allow_queue if queue is None else queue)
+        if result["status"] == "granted" and not was_loaded:
+            self._load(model_name, result["evicted"])
+        return result
+
+    def cancel(self, session_id):
+        """
+        Withdraw a session's queued switch
+
+        Returns:
+            str: The model the session was waiting for, or None
+        """
+        with self._lock:
+            return self.pending.pop(session_id, None)
+
+    def _switch(self, session_id, model_name, queue=True):
+        """
+        Grant, queue or reject a switch; called with the lock held and sizes already known
+
+        Evicted models are only dropped from the bookkeeping here; the caller
+        unloads them with _load after releasing the lock.
+        """
+        if model_name in self.loaded:
+            self.pending.pop(session_id, None)
+            self.touch(session_id, model_name)
+            return {"status": "granted", "evicted": [], "blocking": []}
+
+        needed = self.model_cost(model_name)
+        free = self.memory_budget - self._used_memory()
+        idle = [m for m in self.loaded if not self.active_sessions(m, exclude=session_id)]
+        # Evict the least recently used idle models first
+        idle.sort(key=lambda m: self.loaded[m])
+
+        evict = []
+        for model in idle:
+            if free >= needed:
+                break
+            evict.append(model)
+            free += self.model_cost(model)
+
+        if free >= needed:
+            for model in evict:
+                self.loaded.pop(model, None)
+                self.evicted.add(model)
+            self.pending.pop(session_id, None)
+            self.touch(session_id, model_name)
+            return {"status": "granted", "evicted": evict, "blocking": []}
+
+        blocking = [m for m in self.loaded if m not in idle]
+        if queue:
+            self.pending[session_id] = model_name
+            logger.info(f"Queued switch to {model_name} for session {session_id}; blocked by {blocking}")
+            return {"status": "queued", "evicted": [], "blocking": blocking}
+        return {"status": "rejected", "evicted": [], "blocking": blocking}
+
+    def process_queue(self):
+        """
+        Retry queued switches in request order
+
+        Returns:
+            dict: session_id -> model for switches granted by this call
+        """
+        granted, loads = {}, []
+        self._expire()
+        with self._lock:
+            requested = list(self.pending.values())
+        self._ensure_sizes(requested)
+        with self._lock:
+            for session_id, model_name in list(self.pending.items()):
+                was_loaded = model_name in self.loaded
+                result = self._switch(session_id, model_name)
+                if result["status"] == "granted":
+                    granted[session_id] = model_name
+                    if not was_loaded:
+                        loads.append((model_name, result["evicted"]))
+        for model_name, evicted in loads:
+            self._load(model_name, evicted)
+        return granted
+
+    def pending_model(self, session_id):
+        """Model a session is waiting for, if any"""
+        with self._lock:
+            return self.pending.get(session_id)
+
+    def _load(self, model_name, evicted):
+        """Unload the evicted models, then warm the granted one; called without the lock held"""
+        for model in evicted:
+            self._unload(model)
+        self.manager.keep_alive_manager.warm(model_name)
+
+    def _unload(self, model_name):
+        """Ask every healthy node to unload a model immediately; called without the lock held"""
+        for node in self.manager.pool.healthy_nodes():
+            try:
+                node.client.generate(model=model_name, prompt="", keep_alive=0)
+            except Exception as e:
+                logger.warning(f"Error unloading model {model_name} on {node.host}: {str(e)}")
+        logger.info(f"Unloaded idle model {model_name}")
+
+    def get_status(self):
+        """
+        Report loaded models, their memory cost and active sessions
+
+        Returns:
+            dict: Residency summary
+        """
+        self._expire()
+        self._ensure_sizes()
+        with self._lock:
+            return {
+                "memory_budget": self.memory_budget,
+                "memory_used": self._used_memory(),
+                "models": {m: {"size": self.model_cost(m), "active_sessions": len(self.active_sessions(m))}
+                           for m in self.loaded},
+                "pending": dict(self.pending)
+            }
+
+
 class OllamaManager:
     """Manager for Ollama LLM interactions"""
 
@@ -30,37 +649,84 @@ class OllamaManager:
         """
         self.model_name = model_name
         self.api_url = os.getenv("OLLAMA_API_URL", "http://localhost:11434")
+        hosts = [h.strip() for h in os.getenv("OLLAMA_API_URLS", "").split(",") if h.strip()] or [self.api_url]
+        self.pool = OllamaBackendPool(
+            hosts,
+            strategy=os.getenv("OLLAMA_POOL_STRATEGY", "least_outstanding"),
+            health_interval=int(os.getenv("OLLAMA_HEALTH_INTERVAL", "30"))
+        )
+        self.pool.start()
+        self.keep_alive_manager = KeepAliveManager(self)
+        self.residency = ModelResidencyManager(self)
+        self.budget = GenerationBudget()
         self.is_available = self._check_model_availability()
 
         if not self.is_available:
             logger.info(f"Model {model_name} not found. Pulling from Ollama library...")
-            self._pull_model()
+            self.is_available = self._pull_model()
+
+        if self.is_available:
+            self.residency.refresh_sizes()
+            self.keep_alive_manager.warm(self.model_name)
+            self.keep_alive_manager.start()
+            self.residency.touch(None, self.model_name)
 
-    def _check_model_availability(self):
-        """Check if the specified model is available locally"""
+    def _check_model_availability(self, model_name=None):
+        """Check if a model (default: model_name) is available on every healthy node"""
+        model_name = model_name or self.model_name
         try:
-            models = ollama.list()
-            for model in models.get('models', []):
-                if model.get('name') == self.model_name:
-                    logger.info(f"Model {self.model_name} is available locally")
-                    return True
-            return False
+            for node in self.pool.healthy_nodes():
+                models = node.client.list()
+                if not any(_model_key(model.get('name')) == _model_key(model_name)
+                           for model in models.get('models', [])):
+                    return False
+            logger.info(f"Model {model_name} is available locally")
+            return bool(self.pool.healthy_nodes())
         except Exception as e:
             logger.error(f"Error checking model availability: {str(e)}")
             return False
 
-    def _pull_model(self):
-        """Pull the model from Ollama repository"""
+    def _pull_model(self, model_name=None):
+        """Pull a model (default: model_name) from Ollama repository onto every healthy node"""
+        model_name = model_name or self.model_name
         try:
-            logger.info(f"Pulling model {self.model_name}...")
-            ollama.pull(self.model_name)
-            self.is_available = True
-            logger.info(f"Model {self.model_name} successfully pulled")
+            logger.info(f"Pulling model {model_name}...")
+            for node in self.pool.healthy_nodes():
+                node.client.pull(model_name)
+            logger.info(f"Model {model_name} successfully pulled")
+            return True
         except Exception as e:
             logger.error(f"Error pulling model: {str(e)}")
-            self.is_available = False
+            return False
+
+    def ensure_model(self, model_name):
+        """
+        Make sure a model is available on every healthy node, pulling it if needed
+
+        Args:
+            model_name (str): Name of the Ollama model
+
+        Returns:
+            bool: True if the model can be used
+        """
+        return self._check_model_availability(model_name) or self._pull_model(model_name)
+
+    def _resolve_budget(self, max_tokens, budget_key):
+        """Use the caller's max_tokens, else the learned budget for budget_key, else 1024"""
+        if max_tokens is not None:
+            return max_tokens
+        if budget_key:
+            return self.budget.get_budget(*budget_key)
+        return 1024
+
+    def _record_budget(self, budget_key, result):
+        """Record the total output length of a finished generation"""
+        if budget_key:
+            self.budget.record(*budget_key, output_tokens=result.get("eval_count", 0),
+                               truncated=result.get("done_reason") == "length")
 
-    def generate_response(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1024):
+    def generate_response(self, prompt, system_prompt=None, temperature=0.7, max_tokens=None, format=None,
+                          session_id=None, model=None, stop=None, budget_key=None, max_continuations=1):
         """
         Generate a response using the Ollama model
 
@@ -68,81 +734,241 @@ class OllamaManager:
             prompt (str): The user prompt
             system_prompt (str, optional): System instructions for the model
             temperature (float): Controls randomness (0.0-1.0)
-            max_tokens (int): Maximum number of tokens to generate
+            max_tokens (int, optional): Maximum number of tokens to generate (defaults to the learned budget)
+            format (str, optional): Output format constraint, e.g. "json"
+            session_id (str, optional): Conversation to pin to one backend node
+            model (str, optional): Model for this request (defaults to model_name)
+            stop (list, optional): Stop sequences that end generation early
+            budget_key (tuple, optional): (call_site, mode, course) to learn and look up the budget under
+            max_continuations (int): Follow-up calls allowed when the answer hits max_tokens
 
         Returns:
             str: Generated response text
         """
+        result = self.generate_with_context(
+            prompt, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+            format=format, session_id=session_id, model=model, stop=stop, budget_key=budget_key,
+            max_continuations=max_continuations
+        )
+        return result["response"]
+
+    def generate_with_context(self, prompt, system_prompt=None, context=None, temperature=0.7,
+                              max_tokens=None, session_id=None, model=None, stop=None, format=None,
+                              budget_key=None, max_continuations=1):
+        """
+        Generate a response that continues from (and returns) Ollama's context tokens
+
+        Passing back the context returned by the previous turn lets Ollama skip
+        re-tokenizing and re-prefilling the earlier conversation. If the answer
+        stops at max_tokens it is continued from the returned context, so the
+        budget can stay close to typical answer lengths.
+
+        Args:
+            prompt (str): The new user prompt
+            system_prompt (str, optional): System instructions for the model
+            context (list, optional): Context tokens returned by the previous turn
+            temperature (float): Controls randomness (0.0-1.0)
+            max_tokens (int, optional): Maximum number of tokens per call (defaults to the learned budget)
+            session_id (str, optional): Conversation to pin to one backend node
+            model (str, optional): Model for this request (defaults to model_name)
+            stop (list, optional): Stop sequences that end generation early
+            format (str, optional): Output format constraint, e.g. "json" (disables continuation)
+            budget_key (tuple, optional): (call_site, mode, course) to learn and look up the budget under
+            max_continuations (int): Follow-up calls allowed when the answer hits max_tokens
+
+        Returns:
+            dict: "response" text, new "context" (None on error) and Ollama timing fields;
+                  failed requests carry an "error" message instead of timing fields
+        """
         if not self.is_available:
-            return "Model is not available. Please check logs for details."
+            return {"response": "Model is not available. Please check logs for details.", "context": None,
+                    "error": "Model is not available"}
 
         try:
+            model = model or self.model_name
             params = {
-                "model": self.model_name,
+                "model": model,
                 "prompt": prompt,
                 "options": {
                     "temperature": temperature,
-                    "num_predict": max_tokens
-                }
+                    "num_predict": self._resolve_budget(max_tokens, budget_key)
+                },
+                "keep_alive": self.keep_alive_manager.keep_alive
             }
+            if stop:
+                params["options"]["stop"] = stop
 
             if system_prompt:
                 params["system"] = system_prompt
+            if context:
+                params["context"] = context
+            if format:
+                params["format"] = format
+                # A second JSON object cannot continue a truncated one
+                max_continuations = 0
 
-            response = ollama.generate(**params)
-            return response.get('response', "No response generated")
+            with self.pool.acquire(session_id) as client:
+                response = client.generate(**params)
+                result = {
+                    "response": response.get('response', "No response generated"),
+                    "context": response.get('context'),
+                    "prompt_eval_count": response.get('prompt_eval_count', 0),
+                    "prompt_eval_duration": response.get('prompt_eval_duration', 0),
+                    "eval_count": response.get('eval_count', 0),
+                    "done_reason": response.get('done_reason'),
+                    "continuations": 0
+                }
+                while result["done_reason"] == "length" and result["context"] and \
+                        result["continuations"] < max_continuations:
+                    params["prompt"] = CONTINUATION_PROMPT
+                    params["context"] = result["context"]
+                    response = client.generate(**params)
+                    result["response"] += response.get('response', "")
+                    result["context"] = response.get('context')
+                    result["prompt_eval_count"] += response.get('prompt_eval_count', 0)
+                    result["prompt_eval_duration"] += response.get('prompt_eval_duration', 0)
+                    result["eval_count"] += response.get('eval_count', 0)
+                    result["done_reason"] = response.get('done_reason')
+                    result["continuations"] += 1
+            self.keep_alive_manager.record_load(response)
+            self.residency.touch(session_id, model)
+            self._record_budget(budget_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
-            return f"Error generating response: {str(e)}"
+            return {"response": f"Error generating response: {str(e)}", "context": None, "error": str(e)}
 
-    def chat(self, messages, temperature=0.7, max_tokens=1024):
+    def chat(self, messages, temperature=0.7, max_tokens=None, session_id=None, model=None, stop=None,
+             budget_key=None, max_continuations=1):
         """
         Multi-turn conversation with the model
 
         Args:
             messages (list): List of message dictionaries with 'role' and 'content'
             temperature (float): Controls randomness (0.0-1.0)
-            max_tokens (int): Maximum number of tokens to generate
+            max_tokens (int, optional): Maximum number of tokens per call (defaults to the learned budget)
+            session_id (str, optional): Conversation to pin to one backend node
+            model (str, optional): Model for this request (defaults to model_name)
+            stop (list, optional): Stop sequences that end generation early
+            budget_key (tuple, optional): (call_site, mode, course) to learn and look up the budget under
+            max_continuations (int): Follow-up calls allowed when the answer hits max_tokens
 
         Returns:
             str: Generated response text
         """
+        result = self.chat_with_metadata(
+            messages, temperature=temperature, max_tokens=max_tokens, session_id=session_id, model=model,
+            stop=stop, budget_key=budget_key, max_continuations=max_continuations
+        )
+        return result["response"]
+
+    def chat_with_metadata(self, messages, temperature=0.7, max_tokens=None, session_id=None, model=None,
+                           stop=None, budget_key=None, max_continuations=1):
+        """
+        Multi-turn conversation returning the answer with its generation metadata
+
+        Takes the same arguments as chat().
+
+        Returns:
+            dict: "response" text, "done_reason", "eval_count" and "continuations";
+                  failed requests carry an "error" message instead
+        """
         if not self.is_available:
-            return "Model is not available. Please check logs for details."
+            return {"response": "Model is not available. Please check logs for details.",
+                    "error": "Model is not available"}
 
         try:
+            model = model or self.model_name
             params = {
-                "model": self.model_name,
-                "messages": messages,
+                "model": model,
+                "messages": list(messages),
                 "options": {
                     "temperature": temperature,
-                    "num_predict": max_tokens
-                }
+                    "num_predict": self._resolve_budget(max_tokens, budget_key)
+                },
+                "keep_alive": self.keep_alive_manager.keep_alive
             }
+            if stop:
+                params["options"]["stop"] = stop
 
-            response = ollama.chat(**params)
-            return response.get('message', {}).get('content', "No response generated")
+            content = ""
+            eval_count = 0
+            with self.pool.acquire(session_id) as client:
+                for attempt in range(max_continuations + 1):
+                    response = client.chat(**params)
+                    content += response.get('message', {}).get('content', "")
+                    eval_count += response.get('eval_count', 0)
+                    if response.get('done_reason') != "length" or attempt == max_continuations:
+                        break
+                    params["messages"] = list(messages) + [
+                        {"role": "assistant", "content": content},
+                        {"role": "user", "content": CONTINUATION_PROMPT}
+                    ]
+            self.keep_alive_manager.record_load(response)
+            self.residency.touch(session_id, model)
+            result = {
+                "response": content or "No response generated",
+                "done_reason": response.get('done_reason'),
+                "eval_count": eval_count,
+                "continuations": attempt
+            }
+            self._record_budget(budget_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error in chat: {str(e)}")
-            return f"Error in chat: {str(e)}"
+            return {"response": f"Error in chat: {str(e)}", "error": str(e)}
+
+    def embed(self, texts, model=None, session_id=None, max_workers=4):
+        """
+        Embed texts with an Ollama embedding model
+
+        The embeddings endpoint takes one text per request, so requests are
+        issued concurrently and spread over the backend pool.
+
+        Args:
+            texts (list): Texts to embed
+            model (str, optional): Embedding model (defaults to OLLAMA_EMBED_MODEL)
+            session_id (str, optional): Batch to pin to one backend node
+            max_workers (int): Concurrent embedding requests
+
+        Returns:
+            list: One embedding vector per text (empty on error)
+        """
+        model = model or os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+        texts = list(texts)
+
+        def embed_one(text):
+            with self.pool.acquire(session_id) as client:
+                return client.embeddings(model=model, prompt=text)["embedding"]
+
+        try:
+            if len(texts) <= 1:
+                return [embed_one(text) for text in texts]
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+                return list(executor.map(embed_one, texts))
+        except Exception as e:
+            logger.error(f"Error computing embeddings: {str(e)}")
+            return []
 
     def list_available_models(self):
         """List all available models"""
         try:
-            models = ollama.list()
+            with self.pool.acquire() as client:
+                models = client.list()
             return [model.get('name') for model in models.get('models', [])]
         except Exception as e:
             logger.error(f"Error listing available models: {str(e)}")
             return []
 
     def set_model(self, model_name):
-        """Set the model to the specified model_name"""
+        """Set the process-wide default model used when a request does not name one"""
         self.model_name = model_name
-        self.is_available = self._check_model_availability()
-        if not self.is_available:
-            self._pull_model()
+        self.is_available = self._check_model_availability() or self._pull_model()
+        if self.is_available:
+            self.keep_alive_manager.warm(model_name)
+
 
 if __name__ == "__main__":
     # Simple test of the OllamaManager
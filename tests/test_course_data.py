@@ -0,0 +1,116 @@
+import os
+import json
+
+import pytest
+
+from utils import data_processing
+from utils.data_processing import CourseDataLoader, INDEX_VERSION
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+@pytest.fixture
+def course_dir(tmp_path):
+    write(tmp_path / "topics.json", {
+        "CHBE 220": [
+            {"name": "Heat Transfer", "notes": "Conduction", "details": {"name": "nested"}},
+            {"title": "Mass \"Balance\"", "notes": "Steady state"},
+        ],
+        "CHBE 241": [
+            {"name": "Heat Transfer", "notes": "Convection"},
+            {"id": 7, "notes": "Unnamed"},
+        ],
+    })
+    write(tmp_path / "problems.json", [
+        {"name": "Reactor sizing", "difficulty": "Hard"},
+        {"topic": None, "title": "Pump curves"},
+        "not an entry",
+    ])
+    return tmp_path
+
+
+def test_entries_are_told_apart_by_course(course_dir):
+    loader = CourseDataLoader(str(course_dir))
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 220")["notes"] == "Conduction"
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 241 - Separations")["notes"] == "Convection"
+    # Without a course the first course in file order wins
+    assert loader.get_entry("topics", "Heat Transfer")["notes"] == "Conduction"
+    assert loader.get_entry("topics", "Mass \"Balance\"", course="CHBE 220")["notes"] == "Steady state"
+    assert loader.get_entry("topics", "7", course="CHBE 241")["notes"] == "Unnamed"
+    assert loader.get_entry("topics", "Mass \"Balance\"", course="CHBE 241") is None
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 999") is None
+    # Only top-level keys name an entry
+    assert loader.get_entry("topics", "nested") is None
+
+
+def test_top_level_list_is_shared_by_every_course(course_dir):
+    loader = CourseDataLoader(str(course_dir))
+    assert loader.get_entry("problems", "Reactor sizing")["difficulty"] == "Hard"
+    assert loader.get_entry("problems", "Pump curves", course="CHBE 220") == {"topic": None, "title": "Pump curves"}
+    assert loader.get("CHBE 220")["problems"][2] == "not an entry"
+
+
+def test_entries_are_read_without_decoding_them(course_dir, monkeypatch):
+    decoded = []
+    loads = json.loads
+
+    def counting_loads(data, *args, **kwargs):
+        decoded.append(bytes(data))
+        return loads(data, *args, **kwargs)
+
+    monkeypatch.setattr(data_processing.json, "loads", counting_loads)
+    CourseDataLoader(str(course_dir))._build_index("topics")
+    assert all(b"notes" not in data or data == b'"notes"' for data in decoded)
+    assert b'"Conduction"' not in decoded
+
+
+def test_offsets_are_rebuilt_when_the_file_changes(course_dir):
+    loader = CourseDataLoader(str(course_dir))
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 241")["notes"] == "Convection"
+    loader.get("CHBE 241")
+    assert "CHBE 241" in loader._courses
+
+    write(course_dir / "topics.json", {
+        "CHBE 241": [
+            {"name": "Distillation", "notes": "McCabe-Thiele"},
+            {"name": "Heat Transfer", "notes": "Radiation and convection"},
+        ],
+    })
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 241")["notes"] == "Radiation and convection"
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 220") is None
+    # Courses decoded from the old file are dropped
+    assert "CHBE 241" not in loader._courses
+    assert loader.get("CHBE 241")["topics"][0]["name"] == "Distillation"
+
+
+def test_same_size_rewrite_is_detected_by_mtime(course_dir):
+    path = course_dir / "problems.json"
+    loader = CourseDataLoader(str(course_dir))
+    assert loader.get_entry("problems", "Reactor sizing")["difficulty"] == "Hard"
+
+    write(path, [{"name": "Reactor sizing", "difficulty": "Easy"},
+                 {"topic": None, "title": "Pump curves"}, "not an entry"])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert loader.get_entry("problems", "Reactor sizing")["difficulty"] == "Easy"
+
+
+def test_saved_index_is_reused_and_old_versions_rebuilt(course_dir):
+    CourseDataLoader(str(course_dir)).get_entry("topics", "Heat Transfer")
+    index_path = course_dir / "topics.json.idx"
+    with open(index_path) as f:
+        saved = json.load(f)
+    assert saved["version"] == INDEX_VERSION
+    assert set(saved["entries"]) == {"CHBE 220", "CHBE 241"}
+
+    # An index in the old layout (flat name -> [start, stop, course]) is rebuilt
+    old = {"courses": saved["courses"], "root": saved["root"], "signature": saved["signature"],
+           "entries": {"Heat Transfer": saved["entries"]["CHBE 241"]["Heat Transfer"] + ["CHBE 241"]}}
+    write(index_path, old)
+    loader = CourseDataLoader(str(course_dir))
+    assert loader.get_entry("topics", "Heat Transfer", course="CHBE 220")["notes"] == "Conduction"
+    with open(index_path) as f:
+        assert json.load(f)["version"] == INDEX_VERSION
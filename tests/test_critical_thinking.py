@@ -0,0 +1,55 @@
+import json
+from utils.critical_thinking import CriticalThinkingFramework, SCAFFOLD_MAX_TOKENS, SCAFFOLD_STOP_SEQUENCES
+from utils.generation_budget import GenerationBudget
+
+
+class FakeOllama:
+    """Returns canned generate_with_context results and records the options of each call"""
+
+    def __init__(self, results):
+        self.budget = GenerationBudget(store_path=None)
+        self.results = list(results)
+        self.calls = []
+
+    def generate_with_context(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.results.pop(0)
+
+
+def scaffold_json(framework):
+    return json.dumps({"stages": {key: {"topic_context": f"{key} for heat exchangers", "prompts": ["Why?"]}
+                                  for key in framework.stages}})
+
+
+def test_scaffold_uses_budget_and_stop_sequences():
+    framework = CriticalThinkingFramework()
+    framework.ollama = FakeOllama([{"response": scaffold_json(framework), "done_reason": "stop"}])
+
+    approach = framework.get_scaffolded_approach("Heat Exchangers", course="CHBE 344")
+
+    call = framework.ollama.calls[0]
+    assert call["max_tokens"] == SCAFFOLD_MAX_TOKENS
+    assert call["stop"] == SCAFFOLD_STOP_SEQUENCES
+    assert call["budget_key"] == ("generate_scaffold", None, "CHBE 344")
+    assert approach["stages"][0]["prompts"] == ["Why?"]
+
+
+def test_truncated_scaffold_is_retried_with_a_larger_budget():
+    framework = CriticalThinkingFramework()
+    framework.ollama = FakeOllama([{"response": scaffold_json(framework)[:50], "done_reason": "length"},
+                                   {"response": scaffold_json(framework), "done_reason": "stop"}])
+
+    framework.get_scaffolded_approach("Heat Exchangers")
+
+    assert [call["max_tokens"] for call in framework.ollama.calls] == [SCAFFOLD_MAX_TOKENS, 2 * SCAFFOLD_MAX_TOKENS]
+
+
+def test_failed_request_falls_back_without_retrying():
+    framework = CriticalThinkingFramework()
+    framework.ollama = FakeOllama([{"response": "Error generating response: timed out", "context": None,
+                                    "error": "timed out"}])
+
+    approach = framework.get_scaffolded_approach("Heat Exchangers")
+
+    assert len(framework.ollama.calls) == 1
+    assert approach["stages"][0]["topic_context"] == "For Heat Exchangers, this means..."
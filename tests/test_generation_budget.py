@@ -0,0 +1,67 @@
+import math
+import random
+from utils.generation_budget import GenerationBudget
+
+
+def simulate(budget, lengths, call_site="answer_question", mode="general", course="CHBE 220"):
+    """Answer with the current budget, continuing truncated answers, and record the total length"""
+    for length in lengths:
+        num_predict = budget.get_budget(call_site, mode, course, default=1024)
+        calls = math.ceil(length / num_predict)
+        budget.record(call_site, mode, course, output_tokens=length, truncated=calls > 2)
+
+
+def test_budget_converges_to_percentile_with_headroom():
+    rng = random.Random(7)
+    lengths = [int(rng.gauss(300, 40)) for _ in range(500)]
+    budget = GenerationBudget(store_path=None)
+
+    simulate(budget, lengths)
+
+    expected = sorted(lengths)[math.ceil(0.95 * len(lengths)) - 1] * 1.1
+    assert abs(budget.get_budget("answer_question", "general", "CHBE 220") - expected) <= 0.02 * expected
+
+
+def test_default_until_min_samples():
+    budget = GenerationBudget(store_path=None, min_samples=20)
+    simulate(budget, [200] * 19)
+    assert budget.get_budget("answer_question", "general", "CHBE 220", default=777) == 777
+
+    simulate(budget, [200])
+    assert budget.get_budget("answer_question", "general", "CHBE 220", default=777) == 220
+
+
+def test_budget_tracks_shift_within_window():
+    budget = GenerationBudget(store_path=None, window=100)
+    simulate(budget, [800] * 100)
+    assert budget.get_budget("answer_question", "general", "CHBE 220") == 880
+
+    simulate(budget, [150] * 100)
+    assert budget.get_budget("answer_question", "general", "CHBE 220") == 165
+
+
+def test_unseen_course_falls_back_to_mode_then_call_site():
+    budget = GenerationBudget(store_path=None)
+    simulate(budget, [400] * 20, mode="general", course="CHBE 220")
+
+    assert budget.get_budget("answer_question", "general", "CHBE 351") == 440
+    assert budget.get_budget("answer_question", "socratic", "CHBE 351") == 440
+    assert budget.get_budget("grade_answer", default=512) == 512
+
+
+def test_budget_is_clamped():
+    budget = GenerationBudget(store_path=None, min_tokens=64, max_tokens=2048)
+    simulate(budget, [10] * 20, course="short")
+    simulate(budget, [5000] * 20, course="long")
+
+    assert budget.get_budget("answer_question", "general", "short") == 64
+    assert budget.get_budget("answer_question", "general", "long") == 2048
+
+
+def test_samples_persist_across_restarts(tmp_path):
+    path = str(tmp_path / "budgets.json")
+    budget = GenerationBudget(store_path=path, save_every=10)
+    simulate(budget, [300] * 20)
+
+    restored = GenerationBudget(store_path=path)
+    assert restored.get_budget("answer_question", "general", "CHBE 220") == 330
@@ -0,0 +1,127 @@
+import json
+import pytest
+from pydantic import ValidationError
+from database.grade_cache import GradeCache
+from models.grading_engine import GradingEngine
+from models.grading_schema import GradeResult
+from utils.critical_thinking import CriticalThinkingFramework, rubric_version
+
+DIMENSIONS = ["technical", "practical", "analytical", "creative", "ethical", "metacognitive"]
+QUESTION = {"question": "How would you verify the catalyst claim?", "dimension": "Inference and Reasoning",
+            "points": 10}
+
+
+def grade_json(dimension_scores, score=72):
+    return json.dumps({"score": score, "level": "Proficient", "dimension_scores": dimension_scores,
+                       "feedback": "Consider the measurement uncertainty."})
+
+
+def test_rubric_dimensions_are_required():
+    valid = grade_json(dict.fromkeys(DIMENSIONS, 70))
+    assert GradeResult.model_validate_json(valid, context={"dimensions": DIMENSIONS}).score == 72
+
+    with pytest.raises(ValidationError, match="unknown: creativity"):
+        GradeResult.model_validate_json(grade_json({**dict.fromkeys(DIMENSIONS[:-1], 70), "creativity": 70}),
+                                        context={"dimensions": DIMENSIONS})
+    with pytest.raises(ValidationError, match="missing: metacognitive"):
+        GradeResult.model_validate_json(grade_json(dict.fromkeys(DIMENSIONS[:-1], 70)),
+                                        context={"dimensions": DIMENSIONS})
+
+
+def test_dimension_scores_are_out_of_100():
+    with pytest.raises(ValidationError, match="between 0 and 100"):
+        GradeResult.model_validate_json(grade_json({"technical": 140}))
+
+
+def test_grader_reprompts_until_dimensions_match():
+    class FakeOllama:
+        model_name = "llama3.2"
+
+        def __init__(self):
+            self.prompts = []
+            self.responses = [grade_json({"reasoning": 80}), grade_json(dict.fromkeys(DIMENSIONS, 75))]
+
+        def generate_response(self, prompt, **kwargs):
+            self.prompts.append(prompt)
+            return self.responses.pop(0)
+
+    ollama = FakeOllama()
+    grader = GradingEngine(ollama, grade_cache=GradeCache(db_path=":memory:"))
+
+    grade = grader._grade_with_llm(QUESTION, "I would repeat the experiment with a control.")
+
+    assert set(grade["dimension_scores"]) == set(DIMENSIONS)
+    assert "unknown: reasoning" in ollama.prompts[1]
+
+
+def test_summarize_students_ignores_unknown_phases():
+    def result(student_id, phase, score, dimension):
+        return {"student_id": student_id, "phase": phase, "grade": {"score": score},
+                "question": {"dimension": dimension}}
+
+    records = GradingEngine.summarize_students([
+        result("S001", "pre", 60, "Problem Analysis"),
+        result("S001", "post", 80, "Problem Analysis"),
+        result("S001", "practice", 50, "Future Implications"),
+        result("S002", "practice", 70, "Experimental Design"),
+    ])
+
+    by_id = {r["student_id"]: r for r in records}
+    assert by_id["S001"]["pre_score"] == 60
+    assert by_id["S001"]["post_score"] == 80
+    assert by_id["S001"]["improvement"] == 20
+    assert by_id["S001"]["weakest_dimension"] == "Future Implications"
+    assert by_id["S002"]["pre_score"] is None and by_id["S002"]["post_score"] is None
+
+
+def test_rubric_edits_invalidate_cached_grades():
+    class FakeOllama:
+        model_name = "llama3.2"
+
+        def generate_response(self, prompt, **kwargs):
+            return grade_json(dict.fromkeys(DIMENSIONS, 75))
+
+    cache = GradeCache(db_path=":memory:")
+    answer = "I would repeat the experiment with a control."
+    # An empty cache is still the one used, not the default database
+    assert GradingEngine(FakeOllama(), grade_cache=cache).cache is cache
+    assert GradingEngine(FakeOllama(), grade_cache=cache).grade(QUESTION, answer)["cached"] is False
+    # An unchanged rubric hashes to the same version, so a new process reuses the grade
+    assert GradingEngine(FakeOllama(), grade_cache=cache).grade(QUESTION, answer)["cached"] is True
+
+    framework = CriticalThinkingFramework()
+    framework.rubric_levels[1]["score_range"] = "75-84"
+    framework.rubric_version = rubric_version(framework.rubric_levels, framework.dimensions)
+    assert framework.rubric_version != CriticalThinkingFramework().rubric_version
+    grader = GradingEngine(FakeOllama(), ct_framework=framework, grade_cache=cache)
+    assert grader.grade(QUESTION, answer)["cached"] is False
+
+
+def test_cohort_grades_identical_answers_once():
+    class FakeOllama:
+        model_name = "llama3.2"
+
+        def __init__(self):
+            self.calls = 0
+
+        def generate_response(self, prompt, **kwargs):
+            self.calls += 1
+            if "cannot be graded" in prompt:
+                return "not json"
+            return grade_json(dict.fromkeys(DIMENSIONS, 75))
+
+    ollama = FakeOllama()
+    grader = GradingEngine(ollama, grade_cache=GradeCache(db_path=":memory:"), max_retries=0)
+    answers = ["Repeat it with a control.", "repeat it   with a CONTROL.", "Check the mass balance.",
+               "This answer cannot be graded."]
+    progress = []
+
+    batch = grader.grade_cohort([{"student_id": f"S00{i}", "question": QUESTION, "answer": answer}
+                                 for i, answer in enumerate(answers)],
+                                progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert ollama.calls == 3
+    assert (batch["graded"], batch["cached"], batch["failed"]) == (2, 1, 1)
+    assert batch["results"][1]["grade"]["cached"] is True
+    assert batch["results"][3]["grade"] is None
+    assert progress[-1] == (4, 4)
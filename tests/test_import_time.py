@@ -0,0 +1,42 @@
+import ast
+import sys
+import subprocess
+from importlib import import_module
+from benchmarks.bench_import_time import measure, violations
+
+
+def app_pages():
+    """The PAGES map of app.py, read without running the app"""
+    with open("app.py") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "PAGES":
+            return ast.literal_eval(node.value)
+    raise AssertionError("app.py has no PAGES map")
+
+
+def test_every_page_resolves_to_a_render_function():
+    for module_name, function_name in app_pages().values():
+        assert callable(getattr(import_module(module_name), function_name))
+
+
+def test_app_does_not_import_pages_or_models_until_shown():
+    code = ("import sys, app; print(sorted({m.split('.')[0] for m in sys.modules "
+            "if m.startswith(('views', 'models', 'plotly.express', 'sklearn'))}))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_forbidden_submodules_are_violations():
+    assert violations("views.tutor", {"streamlit", "plotly", "plotly.graph_objects"}) == []
+    assert violations("views.tutor", {"plotly.express._core"}) == ["views.tutor imports plotly.express"]
+    assert violations("models.tutor_model", {"pandas.core"}) == ["models.tutor_model imports pandas"]
+    assert violations("ollama_setup", set(), ms=900.0, max_ms=500) == ["ollama_setup took 900.0 ms (limit 500 ms)"]
+
+
+def test_import_errors_are_reported_not_raised():
+    ms, imported, error = measure("views.no_such_page")
+
+    assert ms is None
+    assert "ModuleNotFoundError" in error
+    assert "views" in imported
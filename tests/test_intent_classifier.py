@@ -0,0 +1,47 @@
+import pytest
+
+from models.tutor_model import EngineeringTutor
+from tests.test_tutor import FakeOllama
+from utils.intent_classifier import IntentClassifier
+
+
+class RecordingOllama(FakeOllama):
+    """Also records the system prompt of each generate_with_context call"""
+
+    def generate_with_context(self, prompt, context=None, model=None, system_prompt=None, **kwargs):
+        result = super().generate_with_context(prompt, context=context, model=model, **kwargs)
+        self.calls[-1]["system_prompt"] = system_prompt
+        return result
+
+
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    classifier = IntentClassifier(artifact_path=str(tmp_path_factory.mktemp("models") / "intent.pkl"),
+                                  min_confidence=0.0)
+    classifier.load(train_if_missing=True)
+    return classifier
+
+
+def test_predict_does_not_train_on_the_request_path(tmp_path):
+    path = tmp_path / "intent.pkl"
+    classifier = IntentClassifier(artifact_path=str(path))
+    assert classifier.predict("How do I set up the mass balance for a reactor with recycle?") == "general"
+    assert not path.exists()
+
+
+def test_trained_artifact_is_loaded_by_other_instances(trained):
+    classifier = IntentClassifier(artifact_path=trained.artifact_path, min_confidence=0.0)
+    assert classifier.load() is not None
+    assert classifier.predict("Calculate the work done by an isothermal expansion of ideal gas") == "problem_solving"
+
+
+@pytest.mark.parametrize("question,mode", [
+    ("Can you explain entropy in simple terms?", "concept_explanation"),
+    ("Solve for the outlet temperature of the heat exchanger", "problem_solving"),
+    ("What are the ethical implications of siting a refinery near a town?", "critical_thinking"),
+])
+def test_auto_mode_uses_the_predicted_mode_prompt(tmp_path, trained, question, mode):
+    assert trained.predict(question) == mode
+    tutor = EngineeringTutor(RecordingOllama(), course_data_path=str(tmp_path), intent_classifier=trained)
+    tutor.answer_question(question, mode="auto", session_id="s1")
+    assert tutor.ollama.calls[0]["system_prompt"] == tutor.prompts.get_system_prompt(mode, True)
@@ -0,0 +1,214 @@
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from ollama_setup import ModelResidencyManager, KeepAliveManager, _parse_duration
+
+GB = 1024 ** 3
+
+
+def lock_held(lock):
+    """Whether any thread holds a (reentrant) lock, checked from another thread"""
+    free = []
+    checker = threading.Thread(target=lambda: free.append(lock.acquire(blocking=False) and not lock.release()))
+    checker.start()
+    checker.join()
+    return not free[0]
+
+
+class FakeClient:
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.list_calls = 0
+        self.generated = []
+        self.residency = None
+
+    def list(self):
+        self.list_calls += 1
+        return {"models": [{"name": name, "size": size} for name, size in self.sizes.items()]}
+
+    def generate(self, model, prompt, keep_alive):
+        # Node requests must not be made while the residency lock is held
+        assert not lock_held(self.residency._lock)
+        self.generated.append((model, keep_alive))
+        return {"model": model, "load_duration": 0}
+
+
+def make_residency(sizes, keep_alive="30m", budget_gb=10):
+    client = FakeClient(sizes)
+
+    @contextmanager
+    def acquire(session_id=None):
+        yield client
+
+    node = SimpleNamespace(client=client, host="http://node")
+    manager = SimpleNamespace(pool=SimpleNamespace(acquire=acquire, healthy_nodes=lambda: [node]),
+                              model_name="llama3.2", warmed=[])
+    manager.keep_alive_manager = SimpleNamespace(keep_alive=keep_alive, warm=manager.warmed.append)
+    residency = ModelResidencyManager(manager, memory_budget_gb=budget_gb)
+    manager.residency = client.residency = residency
+    return residency, client
+
+
+def test_parse_duration():
+    assert _parse_duration("30m") == 1800
+    assert _parse_duration("1h30m") == 5400
+    assert _parse_duration("300") == 300
+    assert _parse_duration(-1) is None
+    assert _parse_duration("-1m") is None
+
+
+def test_untagged_names_match_latest_tag():
+    residency, _ = make_residency({"llama3.2:latest": 2 * GB, "llama3.2:1b": GB})
+
+    residency.touch("s1", "llama3.2")
+    residency.request_switch("s2", "llama3.2:1b")
+
+    assert residency.model_cost("llama3.2") == 2 * GB
+    assert set(residency.loaded) == {"llama3.2:latest", "llama3.2:1b"}
+    assert residency.active_sessions("llama3.2:latest") == ["s1"]
+    assert residency.get_status()["memory_used"] == 3 * GB
+
+
+def test_unknown_model_sizes_are_looked_up_at_most_once_per_interval():
+    residency, client = make_residency({"llama3.2:latest": 2 * GB})
+
+    for _ in range(3):
+        residency.request_switch("s1", "missing-model")
+
+    assert client.list_calls == 1
+    assert residency.model_cost("missing-model") == 0
+
+
+def test_models_idle_longer_than_keep_alive_are_forgotten():
+    residency, _ = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB}, keep_alive="5m")
+    residency.touch("s1", "llama3.2")
+    residency.loaded["llama3.2:latest"] = time.time() - 600
+
+    result = residency.request_switch("s2", "mistral")
+
+    assert result == {"status": "granted", "evicted": [], "blocking": []}
+    assert list(residency.loaded) == ["mistral:latest"]
+
+
+def test_switch_blocked_by_active_session_is_queued():
+    residency, _ = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB})
+    residency.request_switch("s1", "llama3.2")
+
+    assert residency.request_switch("s2", "mistral")["status"] == "queued"
+    assert residency.pending_model("s2") == "mistral:latest"
+
+    residency.sessions["s1"] = ("llama3.2:latest", time.time() - residency.active_window - 1)
+    assert residency.process_queue() == {"s2": "mistral:latest"}
+    assert residency.pending_model("s2") is None
+
+
+def test_cancelled_switch_is_not_granted_later():
+    residency, client = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB})
+    residency.request_switch("s1", "llama3.2")
+    residency.request_switch("s2", "mistral")
+
+    assert residency.cancel("s2") == "mistral:latest"
+    residency.sessions["s1"] = ("llama3.2:latest", time.time() - residency.active_window - 1)
+
+    assert residency.process_queue() == {}
+    assert list(residency.loaded) == ["llama3.2:latest"]
+    assert client.generated == []
+
+
+def test_evicted_models_are_unloaded_outside_the_lock_and_granted_model_warmed():
+    residency, client = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB})
+    residency.touch(None, "llama3.2")
+
+    result = residency.request_switch("s1", "mistral")
+
+    assert result == {"status": "granted", "evicted": ["llama3.2:latest"], "blocking": []}
+    assert client.generated == [("llama3.2:latest", 0)]
+    assert residency.manager.warmed == ["mistral:latest"]
+    # Switching to an already loaded model needs no warm-up
+    residency.request_switch("s2", "mistral")
+    assert residency.manager.warmed == ["mistral:latest"]
+
+
+def test_queued_switch_is_warmed_when_granted():
+    residency, client = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB})
+    residency.request_switch("s1", "llama3.2")
+    residency.request_switch("s2", "mistral")
+    residency.sessions["s1"] = ("llama3.2:latest", time.time() - residency.active_window - 1)
+
+    residency.process_queue()
+
+    assert client.generated == [("llama3.2:latest", 0)]
+    assert residency.manager.warmed == ["llama3.2:latest", "mistral:latest"]
+
+
+def test_keep_alive_skips_evicted_models_and_warms_session_models():
+    residency, client = make_residency({"llama3.2:latest": 4 * GB, "mistral:latest": 4 * GB,
+                                        "qwen2:latest": 4 * GB}, budget_gb=8)
+    keep_alive = KeepAliveManager(residency.manager, keep_alive="30m", ping_interval=0,
+                                  course_hours="00:00-23:59", fallback_model="mistral")
+    residency.manager.keep_alive_manager = keep_alive
+    residency.touch(None, "llama3.2")
+
+    assert residency.warm_targets(["llama3.2", "mistral"]) == ["llama3.2:latest", "mistral:latest"]
+
+    residency.touch(None, "mistral")
+    residency.request_switch("s1", "qwen2")
+    assert residency.evicted == {"llama3.2:latest"}
+    client.generated.clear()
+
+    keep_alive.warm_all()
+
+    warmed = [model for model, ka in client.generated if ka == "30m"]
+    assert warmed == ["qwen2:latest", "mistral:latest"]
+    assert "llama3.2:latest" not in residency.loaded
+
+
+def test_preferred_models_that_do_not_fit_are_not_warmed():
+    residency, _ = make_residency({"llama3.2:latest": 6 * GB, "mistral:latest": 6 * GB}, budget_gb=10)
+    residency.touch(None, "llama3.2")
+
+    assert residency.warm_targets(["llama3.2", "mistral"]) == ["llama3.2:latest"]
+
+
+class Ticks:
+    """Stop event that lets the keep-alive loop run a fixed number of pings"""
+
+    def __init__(self, pings):
+        self.pings = pings
+
+    def wait(self, timeout):
+        self.pings -= 1
+        return self.pings < 0
+
+
+def test_keep_alive_pings_only_during_course_hours():
+    residency, client = make_residency({"llama3.2:latest": 2 * GB, "mistral:latest": 2 * GB})
+    keep_alive = KeepAliveManager(residency.manager, keep_alive="30m", ping_interval=240,
+                                  course_hours="08:00-18:00", fallback_model="mistral")
+    residency.manager.keep_alive_manager = keep_alive
+
+    assert keep_alive.in_course_hours(datetime(2025, 3, 3, 8, 0))
+    assert keep_alive.in_course_hours(datetime(2025, 3, 3, 18, 0))
+    assert not keep_alive.in_course_hours(datetime(2025, 3, 3, 7, 59))
+    assert not keep_alive.in_course_hours(datetime(2025, 3, 3, 22, 30))
+
+    # Pre-warm at start, then one ping for each of the two in-hours ticks out of four
+    hours = iter([True, False, True, False])
+    keep_alive.in_course_hours = lambda now=None: next(hours)
+    keep_alive._stop_event = Ticks(4)
+    keep_alive._run()
+
+    assert client.generated == [("llama3.2:latest", "30m"), ("mistral:latest", "30m")] * 3
+
+
+def test_load_report_counts_cold_and_warm_loads():
+    residency, _ = make_residency({"llama3.2:latest": 2 * GB})
+    keep_alive = KeepAliveManager(residency.manager, ping_interval=0, cold_load_threshold=1.0)
+
+    keep_alive.record_load({"model": "llama3.2", "load_duration": 4_500_000_000})
+    keep_alive.record_load({"model": "llama3.2", "load_duration": 20_000_000})
+    keep_alive.record_load({"model": "llama3.2"})
+
+    assert keep_alive.get_load_report() == {"cold": 1, "warm": 2, "cold_ratio": 0.333}
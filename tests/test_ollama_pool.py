@@ -0,0 +1,70 @@
+import httpx
+import ollama
+import pytest
+from ollama_setup import OllamaBackendPool
+
+
+def fail_with(pool, error):
+    with pytest.raises(type(error)):
+        with pool.acquire():
+            raise error
+
+
+@pytest.fixture
+def pool():
+    return OllamaBackendPool(["http://node-a:11434", "http://node-b:11434"], health_interval=0, max_failures=2)
+
+
+@pytest.mark.parametrize("error", [
+    httpx.ConnectError("connection refused"),
+    httpx.ReadTimeout("timed out"),
+    ollama.ResponseError("internal error", 500),
+])
+def test_node_failures_eject_node(pool, error):
+    node = pool.select()
+    for _ in range(pool.max_failures):
+        fail_with(pool, error)
+
+    assert not node.healthy
+    assert node not in pool.healthy_nodes()
+
+
+@pytest.mark.parametrize("error", [
+    ollama.ResponseError("model 'missing' not found", 404),
+    ollama.ResponseError("invalid options", 400),
+    ValueError("bad prompt"),
+])
+def test_client_errors_do_not_count(pool, error):
+    node = pool.select()
+    for _ in range(pool.max_failures + 1):
+        fail_with(pool, error)
+
+    assert node.healthy
+    assert node.failures == 0
+    assert node.outstanding == 0
+
+
+def test_embed_keeps_order_across_concurrent_requests():
+    from ollama_setup import OllamaManager
+
+    manager = OllamaManager.__new__(OllamaManager)
+    manager.pool = OllamaBackendPool(["http://node-a:11434", "http://node-b:11434"], health_interval=0)
+    for node in manager.pool.nodes:
+        node.client.embeddings = lambda model, prompt: {"embedding": [float(len(prompt))]}
+
+    texts = ["a" * n for n in range(1, 33)]
+    assert manager.embed(texts, model="nomic-embed-text") == [[float(n)] for n in range(1, 33)]
+    assert all(node.outstanding == 0 for node in manager.pool.nodes)
+
+
+def test_embed_returns_empty_on_error():
+    from ollama_setup import OllamaManager
+
+    manager = OllamaManager.__new__(OllamaManager)
+    manager.pool = OllamaBackendPool(["http://node-a:11434"], health_interval=0)
+
+    def embeddings(model, prompt):
+        raise httpx.ConnectError("connection refused")
+    manager.pool.nodes[0].client.embeddings = embeddings
+
+    assert manager.embed(["one", "two"], model="nomic-embed-text") == []
@@ -0,0 +1,101 @@
+import threading
+from database.scenario_bank import ScenarioBank
+from models.practice_pipeline import PersonalizedPracticePipeline
+from models.scenario_generator import ScenarioGenerator, ScenarioGenerationError
+
+
+class FakeGenerator:
+    """Generates a scenario per call, failing for the dimensions in fail_dimensions"""
+
+    def __init__(self, fail_dimensions=()):
+        self.fail_dimensions = set(fail_dimensions)
+        self.calls = 0
+
+    def generate_scenario(self, topic, difficulty, scenario_type, industry, additional_instructions=None):
+        self.calls += 1
+        if any(dimension in additional_instructions for dimension in self.fail_dimensions):
+            raise ScenarioGenerationError("connection refused")
+        return {"scenario_text": f"{topic} practice {self.calls}", "metadata": {"difficulty": difficulty}}
+
+
+STUDENTS = [
+    {"student_id": "S001", "post_score": 78, "weakest_dimension": "Problem Analysis"},
+    {"student_id": "S002", "post_score": 72, "weakest_dimension": "Problem Analysis"},
+    {"student_id": "S003", "post_score": 75, "weakest_dimension": "Experimental Design"},
+    {"student_id": "S004", "post_score": 71, "weakest_dimension": "Experimental Design"},
+]
+
+
+def test_group_with_failed_generations_is_unassigned():
+    generator = FakeGenerator(fail_dimensions=["Experimental Design"])
+    pipeline = PersonalizedPracticePipeline(generator, pool_size=2, max_workers=2, time_budget=10)
+
+    result = pipeline.run(STUDENTS, course="CHBE 220")
+
+    assert set(result["assignments"]) == {"S001", "S002"}
+    assert sorted(result["unassigned"]) == ["S003", "S004"]
+    assert result["scenarios_generated"] == 2
+    assert generator.calls == 4
+
+
+def test_time_budget_returns_without_waiting_for_slow_groups():
+    class SlowGenerator(FakeGenerator):
+        """Blocks generations for Experimental Design until released"""
+
+        def __init__(self):
+            super().__init__()
+            self.release = threading.Event()
+
+        def generate_scenario(self, topic, difficulty, scenario_type, industry, additional_instructions=None):
+            if "Experimental Design" in additional_instructions:
+                self.release.wait(5)
+            return super().generate_scenario(topic, difficulty, scenario_type, industry, additional_instructions)
+
+    generator = SlowGenerator()
+    pipeline = PersonalizedPracticePipeline(generator, pool_size=2, max_workers=4, time_budget=0.2)
+    try:
+        result = pipeline.run(STUDENTS, course="CHBE 220")
+    finally:
+        generator.release.set()
+
+    assert result["elapsed_seconds"] < 1
+    assert set(result["assignments"]) == {"S001", "S002"}
+    assert sorted(result["unassigned"]) == ["S003", "S004"]
+
+
+def test_students_share_a_pool_smaller_than_their_group():
+    generator = FakeGenerator()
+    pipeline = PersonalizedPracticePipeline(generator, pool_size=1, max_workers=2, time_budget=10)
+
+    result = pipeline.run(STUDENTS, course="CHBE 220", topics={"CHBE 220": ["Heat Transfer"]})
+
+    assert generator.calls == 2
+    assert result["assignments"]["S001"] is result["assignments"]["S002"]
+    assert result["assignments"]["S003"] is result["assignments"]["S004"]
+
+
+def test_all_generations_failing_leaves_everyone_unassigned():
+    generator = FakeGenerator(fail_dimensions=["Problem Analysis", "Experimental Design"])
+    pipeline = PersonalizedPracticePipeline(generator, pool_size=2, max_workers=2, time_budget=10)
+
+    result = pipeline.run(STUDENTS, course="CHBE 220")
+
+    assert result["assignments"] == {}
+    assert sorted(result["unassigned"]) == ["S001", "S002", "S003", "S004"]
+    assert result["scenarios_generated"] == 0
+
+
+def test_refill_stops_on_failed_generation():
+    class FailingOllama:
+        def generate_with_context(self, **kwargs):
+            return {"response": "Error generating response: timed out", "context": None, "error": "timed out"}
+
+    bank = ScenarioBank(db_path=":memory:")
+    generator = ScenarioGenerator(FailingOllama(), templates_path="missing", scenario_bank=bank)
+    facets = {"topic": "Heat Transfer", "difficulty": "moderate", "scenario_type": "design", "industry": "Energy"}
+
+    generator._refill("key", facets, structured=False)
+
+    assert bank.count_unseen("default") == 0
+    assert generator.serve_stats["refills"] == 0
+    assert not generator._refilling
@@ -0,0 +1,92 @@
+import zlib
+import numpy as np
+import pytest
+from models.prescorer import EmbeddingPreScorer
+
+LEVELS = {"Exemplary": (0, 92), "Proficient": (1, 78), "Developing": (2, 62)}
+QUESTION = {"question": "How would you verify the catalyst claim?", "dimension": "Inference and Reasoning"}
+
+
+class FakeOllama:
+    """Embeds "<level> answer <n>" near the level's axis, recording every embedded text"""
+
+    def __init__(self, dims=8):
+        self.dims = dims
+        self.embedded = []
+
+    def embed(self, texts, model=None):
+        vectors = []
+        for text in texts:
+            self.embedded.append(text)
+            level, _, n = text.split(" ", 2)
+            rng = np.random.RandomState(zlib.crc32(text.encode()))
+            vector = rng.normal(0, 0.15, self.dims)
+            vector[LEVELS[level][0]] += 1.0
+            vectors.append(vector.tolist())
+        return vectors
+
+
+def graded_results(count, start=0):
+    results = []
+    for i in range(start, start + count):
+        level = list(LEVELS)[i % len(LEVELS)]
+        results.append({"question": QUESTION, "answer": f"{level} answer {i}",
+                        "grade": {"level": level, "score": LEVELS[level][1]}})
+    return results
+
+
+@pytest.fixture
+def prescorer():
+    return EmbeddingPreScorer(FakeOllama())
+
+
+def test_calibrate_finds_threshold_and_fits_centroids(prescorer):
+    report = prescorer.calibrate(graded_results(60), target_accuracy=0.9)
+
+    assert report["samples"] == 18
+    assert report["accuracy"] >= 0.9
+    assert report["coverage"] > 0
+    assert prescorer.threshold == report["threshold"]
+    assert QUESTION["question"] in prescorer.centroids
+
+    answers = [f"{level} answer {900 + i}" for i, level in enumerate(LEVELS)]
+    for answer, grade in zip(answers, prescorer.prescore(QUESTION["question"], answers)):
+        assert grade is None or grade["level"] == answer.split()[0]
+
+
+def test_recalibration_only_embeds_new_answers(prescorer):
+    first = graded_results(30)
+    prescorer.calibrate(first)
+    assert len(prescorer.ollama.embedded) == 30
+
+    prescorer.calibrate(first + graded_results(10, start=30))
+
+    assert len(prescorer.ollama.embedded) == 40
+    assert prescorer.stats["embedding_hits"] == 30
+
+
+def test_unreliable_levels_send_everything_to_the_llm(prescorer):
+    results = graded_results(30)
+    # Shuffle the labels so no centroid matches its answers
+    for r in results:
+        r["grade"] = {"level": "Exemplary" if zlib.crc32(r["answer"].encode()) % 2 else "Developing", "score": 70}
+
+    report = prescorer.calibrate(results, target_accuracy=1.01)
+
+    assert report["coverage"] == 0.0
+    assert prescorer.threshold == float("inf")
+
+
+def test_embedding_cache_is_bounded():
+    prescorer = EmbeddingPreScorer(FakeOllama(), max_cached_embeddings=5)
+    prescorer._embed([f"Proficient answer {i}" for i in range(8)])
+
+    assert len(prescorer._embeddings) == 5
+    prescorer._embed(["Proficient answer 0"])
+    assert len(prescorer.ollama.embedded) == 9
+
+
+def test_failed_embedding_returns_empty(prescorer):
+    prescorer.ollama.embed = lambda texts, model=None: []
+    assert prescorer._embed(["Proficient answer 1"]).size == 0
+    assert prescorer.prescore(QUESTION["question"], ["Proficient answer 1"]) == [None]
@@ -0,0 +1,36 @@
+import os
+from utils.prompt_assembly import PromptAssembler, GENERATION_PROFILES
+
+
+def test_system_prompts_are_reused_not_rebuilt():
+    prompts = PromptAssembler()
+    for mode in prompts.modes:
+        for include_critical_thinking in (False, True):
+            first = prompts.get_system_prompt(mode, include_critical_thinking)
+            assert prompts.get_system_prompt(mode, include_critical_thinking) is first
+
+    # Unknown modes share the general prompt
+    assert prompts.get_system_prompt("unknown", True) is prompts.get_system_prompt("general", True)
+    assert prompts.get_generation_options("unknown") is GENERATION_PROFILES["general"]
+
+
+def test_prompts_are_byte_identical_across_instances():
+    first, second = PromptAssembler(), PromptAssembler()
+    assert first.system_prompts == second.system_prompts
+    assert first.stage_prompts == second.stage_prompts
+
+
+def test_enhanced_prompt_extends_the_plain_mode_prompt():
+    prompts = PromptAssembler()
+    for mode in ("general", "concept_explanation", "problem_solving"):
+        assert prompts.get_system_prompt(mode, True).startswith(prompts.get_system_prompt(mode, False))
+    assert prompts.get_system_prompt("critical_thinking", True) == prompts.get_system_prompt("critical_thinking")
+
+
+def test_stage_contexts_of_one_problem_share_the_problem_prefix():
+    prompts = PromptAssembler()
+    problem = "A heat exchanger loses 15% of its duty after six months of operation."
+    contexts = [prompts.build_stage_context(problem, stage) for stage in prompts.ct_framework.stages]
+
+    assert os.path.commonprefix(contexts) == f"Problem: {problem}\n\nStage: "
+    assert prompts.build_stage_context(problem, "Analyze") == prompts.build_stage_context(problem, "analyze")
@@ -0,0 +1,39 @@
+import sys
+from models.records import Message, ScenarioRecord
+from models.tutor_model import EngineeringTutor
+from tests.test_tutor import FakeOllama
+
+
+def test_messages_share_interned_roles_and_unique_ids():
+    first, second = Message.create("user", "Q1"), Message.create("".join(["us", "er"]), "Q2")
+
+    assert first.role is second.role is sys.intern("user")
+    assert first.id != second.id
+    assert not hasattr(first, "__dict__")
+
+
+def test_history_becomes_dicts_only_at_the_chat_api_boundary(tmp_path):
+    ollama = FakeOllama()
+    tutor = EngineeringTutor(ollama, course_data_path=str(tmp_path), use_context=False)
+
+    tutor.answer_question("What is enthalpy?", session_id="s1")
+    tutor.answer_question("And entropy?", session_id="s1")
+
+    messages = ollama.calls[1]["messages"]
+    assert all(type(m) is dict for m in messages)
+    assert messages[1:] == [{"role": "user", "content": "What is enthalpy?"},
+                            {"role": "assistant", "content": "answer 1"},
+                            {"role": "user", "content": "And entropy?"}]
+    assert all(isinstance(m, Message) for m in tutor.get_history("s1"))
+
+
+def test_scenario_record_round_trips_the_dict_format():
+    scenario = {"id": "abc", "scenario_text": "text", "sections": None, "duplicate_of": None,
+                "metadata": {"topic": "Heat Transfer", "difficulty": "moderate", "type": "design",
+                             "industry": "Energy", "generated_timestamp": "2025-01-01T00:00:00",
+                             "variant": "default"}}
+
+    record = ScenarioRecord.from_dict(scenario)
+
+    assert record.extra == {"variant": "default"}
+    assert record.to_dict() == scenario
@@ -0,0 +1,77 @@
+import threading
+import pytest
+from utils import rerun_profiler
+from utils.rerun_profiler import RerunProfiler
+
+
+class FakeClock:
+    """perf_counter stand-in that advances only when told to"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rerun_profiler.time, "perf_counter", clock)
+    return clock
+
+
+def test_disabled_profiler_records_nothing(clock):
+    profiler = RerunProfiler(enabled=False)
+    with profiler.rerun(lambda: "Dashboard"), profiler.section("load_css"):
+        clock.now += 1
+
+    assert profiler.get_report() == {"sections": {}, "pages": {}}
+
+
+def test_sections_are_timed_only_inside_a_rerun(clock):
+    profiler = RerunProfiler(enabled=True)
+    with profiler.section("outside"):
+        clock.now += 1
+
+    with profiler.rerun(lambda: "Dashboard"):
+        with profiler.section("load_css"):
+            clock.now += 0.002
+        with profiler.section("page.Dashboard"):
+            clock.now += 0.040
+
+    report = profiler.get_report()
+    assert list(report["sections"]) == ["page.Dashboard", "load_css"]
+    assert report["sections"]["load_css"] == {"count": 1, "p50_ms": 2.0, "p95_ms": 2.0, "max_ms": 2.0}
+    assert report["pages"]["Dashboard"]["max_ms"] == 42.0
+
+
+def test_reruns_in_other_threads_do_not_time_this_thread(clock):
+    profiler = RerunProfiler(enabled=True)
+    in_rerun, done = threading.Event(), threading.Event()
+
+    def other_session():
+        with profiler.rerun(lambda: "Settings"):
+            in_rerun.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    in_rerun.wait(5)
+    with profiler.section("not_a_rerun"):
+        clock.now += 1
+    done.set()
+    thread.join()
+
+    assert "not_a_rerun" not in profiler.get_report()["sections"]
+
+
+def test_window_keeps_recent_samples_and_reset_clears(clock):
+    profiler = RerunProfiler(enabled=True, window=3)
+    for ms in (100, 1, 2, 3):
+        with profiler.rerun(lambda: None):
+            clock.now += ms / 1000
+
+    assert profiler.get_report()["pages"]["unknown"] == {"count": 3, "p50_ms": 2.0, "p95_ms": 3.0, "max_ms": 3.0}
+    profiler.reset()
+    assert profiler.get_report() == {"sections": {}, "pages": {}}
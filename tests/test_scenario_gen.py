@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import pytest
+from database.scenario_bank import ScenarioBank
+from models.scenario_generator import ScenarioGenerator, ScenarioGenerationError, instructions_variant
+
+BASE_TEXT = " ".join(f"word{i}" for i in range(120))
+
+
+class FakeOllama:
+    """Stands in for OllamaManager, returning canned generate_with_context results"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+        self.requests = []
+
+    def generate_with_context(self, **kwargs):
+        self.calls += 1
+        self.requests.append(kwargs)
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+def make_scenario(text, topic="Heat Transfer"):
+    return {"scenario_text": text, "sections": None,
+            "metadata": {"topic": topic, "difficulty": "moderate", "type": "design", "industry": "Energy"}}
+
+
+def make_generator(ollama, bank=None):
+    return ScenarioGenerator(ollama, templates_path="missing", scenario_bank=bank)
+
+
+@pytest.fixture
+def near_duplicate():
+    """Two texts differing in one word, and their estimated similarity"""
+    other = BASE_TEXT.replace("word60", "changed")
+    hasher = ScenarioBank(db_path=":memory:").hasher
+    return other, hasher.similarity(hasher.signature(BASE_TEXT), hasher.signature(other))
+
+
+def test_duplicate_detected_at_threshold(near_duplicate):
+    other, similarity = near_duplicate
+    bank = ScenarioBank(db_path=":memory:", similarity_threshold=similarity)
+    first = bank.add(make_scenario(BASE_TEXT))
+
+    result = bank.add(make_scenario(other))
+
+    assert result["id"] is None
+    assert result["duplicate_of"] == first["id"]
+    assert result["similarity"] == similarity
+    assert bank.stats["rejected"] == 1
+
+
+def test_below_threshold_is_not_duplicate(near_duplicate):
+    other, similarity = near_duplicate
+    bank = ScenarioBank(db_path=":memory:", similarity_threshold=similarity + 0.01)
+    bank.add(make_scenario(BASE_TEXT))
+
+    result = bank.add(make_scenario(other))
+
+    assert result["id"] is not None
+    assert result["duplicate_of"] is None
+    assert bank.stats["inserted"] == 2
+
+
+def test_flag_policy_stores_duplicate(near_duplicate):
+    other, similarity = near_duplicate
+    bank = ScenarioBank(db_path=":memory:", similarity_threshold=similarity, duplicate_policy="flag")
+    first = bank.add(make_scenario(BASE_TEXT))
+
+    result = bank.add(make_scenario(other))
+
+    assert result["id"] is not None
+    assert result["duplicate_of"] == first["id"]
+    assert bank.get(result["id"])["duplicate_of"] == first["id"]
+
+
+def test_generate_scenario_stores_result():
+    bank = ScenarioBank(db_path=":memory:")
+    generator = make_generator(FakeOllama([{"response": BASE_TEXT, "context": [1]}]), bank)
+
+    scenario = generator.generate_scenario("Heat Transfer", industry_context="Energy")
+
+    assert scenario["scenario_text"] == BASE_TEXT
+    assert bank.get(scenario["id"])["scenario_text"] == BASE_TEXT
+    assert len(generator.generated_scenarios) == 1
+
+
+@pytest.mark.parametrize("structured", [False, True])
+def test_failed_generation_is_not_stored(structured):
+    bank = ScenarioBank(db_path=":memory:")
+    failure = {"response": "Error generating response: connection refused", "context": None,
+               "error": "connection refused"}
+    generator = make_generator(FakeOllama([failure]), bank)
+
+    with pytest.raises(ScenarioGenerationError):
+        generator.generate_scenario("Heat Transfer", industry_context="Energy", structured=structured)
+
+    assert bank.count_unseen("default") == 0
+    assert len(generator.generated_scenarios) == 0
+
+
+def test_bank_serves_only_scenarios_generated_with_the_same_instructions():
+    bank = ScenarioBank(db_path=":memory:")
+    texts = iter(f"{BASE_TEXT} variant{i} " + " ".join(f"extra{i}x{j}" for j in range(120)) for i in range(50))
+    ollama = FakeOllama([])
+    ollama.generate_with_context = lambda **kwargs: {"response": next(texts), "context": [1]}
+    generator = make_generator(ollama, bank)
+    generator.low_watermark = 0
+    with_rubric = "Course: CHBE 220\nInclude: Detailed Solution, Grading Rubric"
+    without_rubric = "Course: CHBE 220\n   Include: Detailed Solution"
+
+    banked = generator.generate_scenario("Heat Transfer", industry_context="Energy", additional_instructions=with_rubric)
+
+    served = generator.get_scenario("Heat Transfer", industry_context="Energy", instructor_id="ada",
+                                    additional_instructions=without_rubric)
+    assert not served["served_from_bank"]
+    served = generator.get_scenario("Heat Transfer", industry_context="Energy", instructor_id="ada",
+                                    additional_instructions="  Course: CHBE 220 Include: Detailed Solution,\nGrading Rubric")
+    assert served["served_from_bank"]
+    assert served["id"] == banked["id"]
+    assert generator.serve_stats == {"bank": 1, "live": 1, "refills": 0}
+
+
+def test_refill_generates_with_the_request_instructions():
+    bank = ScenarioBank(db_path=":memory:")
+    prompts = []
+    texts = iter(f"scenario {i} " + " ".join(f"word{i}x{j}" for j in range(120)) for i in range(50))
+
+    def generate_with_context(**kwargs):
+        prompts.append(kwargs["prompt"])
+        return {"response": next(texts), "context": [1]}
+
+    ollama = FakeOllama([])
+    ollama.generate_with_context = generate_with_context
+    generator = make_generator(ollama, bank)
+    generator.refill_batch = 2
+
+    generator.get_scenario("Heat Transfer", industry_context="Energy", instructor_id="ada",
+                           additional_instructions="Include: Grading Rubric")
+    generator._refill_executor.shutdown(wait=True)
+
+    assert len(prompts) == 3
+    assert all("Include: Grading Rubric" in prompt for prompt in prompts)
+    assert bank.count_unseen("ada", topic="Heat Transfer", variant=instructions_variant("Include: Grading Rubric")) == 2
+    assert bank.count_unseen("ada", topic="Heat Transfer", variant="default") == 0
+    assert generator.serve_stats["refills"] == 1
+
+
+def test_scenarios_served_to_an_instructor_are_not_served_again():
+    bank = ScenarioBank(db_path=":memory:")
+    first = bank.add(make_scenario(BASE_TEXT))["id"]
+    generator = make_generator(FakeOllama([{"response": "unused", "context": [1]}]), bank)
+    generator.low_watermark = 0
+    facets = {"topic": "Heat Transfer", "difficulty": "moderate", "scenario_type": "design", "industry_context": "Energy"}
+    with bank._conn:
+        bank._conn.execute("UPDATE scenarios SET variant = 'default'")
+
+    assert generator.get_scenario(instructor_id="ada", **facets)["id"] == first
+    assert generator.get_scenario(instructor_id="grace", **facets)["id"] == first
+    assert not generator.get_scenario(instructor_id="ada", **facets)["served_from_bank"]
+
+
+def test_init_db_adds_columns_missing_from_older_databases(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE scenarios (id TEXT PRIMARY KEY, topic TEXT, difficulty TEXT, type TEXT, industry TEXT, "
+                 "scenario_text TEXT NOT NULL, sections TEXT, metadata TEXT NOT NULL, signature BLOB NOT NULL, "
+                 "duplicate_of TEXT, created_at TEXT NOT NULL)")
+    conn.close()
+
+    bank = ScenarioBank(db_path=db_path)
+    bank.add({**make_scenario(BASE_TEXT), "metadata": {**make_scenario(BASE_TEXT)["metadata"], "variant": "default"}})
+
+    assert bank.count(variant="default") == 1
+
+
+SECTIONS = {"title": "Fouling in a Crude Preheat Train", "context": "A refinery preheat train loses duty.",
+            "problem_statement": "Estimate the fouling resistance after six months.",
+            "available_data": ["U clean = 450 W/m2K", "Duty drop = 15%"],
+            "deliverables": ["Fouling resistance", "Cleaning schedule"]}
+
+
+def test_structured_scenario_is_validated_into_sections():
+    ollama = FakeOllama([{"response": json.dumps(SECTIONS), "context": [1]}])
+    scenario = make_generator(ollama).generate_scenario("Heat Transfer", structured=True)
+
+    assert scenario["sections"] == SECTIONS
+    assert scenario["scenario_text"].startswith("## Fouling in a Crude Preheat Train")
+    assert "2. Cleaning schedule" in scenario["scenario_text"]
+    assert ollama.requests[0]["format"] == "json"
+
+
+def test_invalid_structured_output_is_retried_with_the_validation_error():
+    invalid = json.dumps({**SECTIONS, "deliverables": []})
+    ollama = FakeOllama([{"response": invalid, "context": [1]}, {"response": json.dumps(SECTIONS), "context": [1]}])
+    scenario = make_generator(ollama).generate_scenario("Heat Transfer", structured=True)
+
+    assert scenario["sections"] == SECTIONS
+    assert "Your previous answer was invalid" in ollama.requests[1]["prompt"]
+    assert "deliverables" in ollama.requests[1]["prompt"].split("Your previous answer was invalid")[1]
+
+
+def test_structured_generation_falls_back_to_text():
+    ollama = FakeOllama([{"response": "not json", "context": [1]}] * 3 + [{"response": BASE_TEXT, "context": [1]}])
+    generator = make_generator(ollama)
+    scenario = generator.generate_scenario("Heat Transfer", structured=True)
+
+    assert ollama.calls == generator.max_structured_retries + 2
+    assert scenario["sections"] is None
+    assert scenario["scenario_text"] == BASE_TEXT
+    assert "format" not in ollama.requests[-1]
@@ -0,0 +1,37 @@
+import pytest
+from utils.seed_data import SEED_DATA, editable, is_frozen, seed_session
+
+
+def test_sessions_share_read_only_seed():
+    first, second = {}, {}
+    seed_session(first)
+    seed_session(second)
+
+    assert first["assessment_questions"] is second["assessment_questions"] is SEED_DATA["assessment_questions"]
+    with pytest.raises(TypeError):
+        first["system_settings"]["api_key"] = "changed"
+
+
+def test_editable_copies_on_first_write_only():
+    state, other = {}, {}
+    seed_session(state)
+    seed_session(other)
+
+    questions = editable(state, "assessment_questions")
+    questions.append({"id": 6, "question": "New?", "dimension": "Problem Analysis", "points": 10})
+
+    assert editable(state, "assessment_questions") is questions
+    assert not is_frozen(state["assessment_questions"])
+    assert len(other["assessment_questions"]) == len(SEED_DATA["assessment_questions"]) == 5
+    assert is_frozen(other["assessment_questions"])
+
+
+def test_seed_session_keeps_existing_edits():
+    state = {}
+    seed_session(state)
+    editable(state, "system_settings")["backup_frequency"] = "Weekly"
+
+    seed_session(state)
+
+    assert state["system_settings"]["backup_frequency"] == "Weekly"
+    assert SEED_DATA["system_settings"]["backup_frequency"] == "Daily"
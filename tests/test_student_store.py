@@ -0,0 +1,121 @@
+import random
+import pytest
+from database.student_store import StudentStore, SORT_FIELDS
+
+DIMENSIONS = ["Problem Analysis", "Evaluation of Evidence", "Experimental Design"]
+NAMES = ["Alex Johnson", "Taylor Smith", "Jordan Williams", "Sam Smithers", "Mary-Jane Watson", "Lee"]
+
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        pre = rng.choice([None, rng.randint(40, 90)])
+        post = rng.choice([None, rng.randint(50, 100)])
+        records.append({
+            "student_id": f"S{i:03d}",
+            "name": NAMES[i % len(NAMES)],
+            "pre_score": pre,
+            "post_score": post,
+            "improvement": post - pre if pre is not None and post is not None else None,
+            "weakest_dimension": rng.choice(DIMENSIONS),
+        })
+    return records
+
+
+def reference_page(records, offset=0, limit=25, sort_by=None, descending=False, min_value=None, max_value=None,
+                   dimension=None):
+    """What page() should return, computed by filtering and sorting everything"""
+    if sort_by is None:
+        ordered = list(records)
+    else:
+        valued = [r for r in records if r[sort_by] is not None
+                  and (min_value is None or r[sort_by] >= min_value)
+                  and (max_value is None or r[sort_by] <= max_value)]
+        ordered = sorted(valued, key=lambda r: (r[sort_by], r["student_id"]), reverse=descending)
+        if min_value is None and max_value is None:
+            ordered += [r for r in records if r[sort_by] is None]
+    if dimension is not None:
+        ordered = [r for r in ordered if r["weakest_dimension"] == dimension]
+    return len(ordered), ordered[offset:offset + limit]
+
+
+@pytest.fixture
+def records():
+    return make_records(60)
+
+
+@pytest.mark.parametrize("sort_by", [None, *SORT_FIELDS])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("value_range", [(None, None), (60, None), (None, 75), (55, 80), (80, 55), (200, 300)])
+@pytest.mark.parametrize("dimension", [None, "Experimental Design"])
+def test_page_matches_reference(records, sort_by, descending, value_range, dimension):
+    store = StudentStore(records)
+    min_value, max_value = value_range if sort_by else (None, None)
+    for offset in (0, 7, 25, 58, 100):
+        kwargs = dict(offset=offset, limit=10, sort_by=sort_by, descending=descending,
+                      min_value=min_value, max_value=max_value, dimension=dimension)
+        assert store.page(**kwargs) == reference_page(records, **kwargs)
+
+
+def test_inverted_range_is_empty(records):
+    total, page = StudentStore(records).page(sort_by="post_score", min_value=90, max_value=60)
+    assert (total, page) == (0, [])
+
+
+def test_unknown_sort_field(records):
+    with pytest.raises(ValueError):
+        StudentStore(records).page(sort_by="name")
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("smi", {"Taylor Smith", "Sam Smithers"}),
+    ("SMITHE", {"Sam Smithers"}),
+    ("taylor s", {"Taylor Smith"}),
+    ("jane", {"Mary-Jane Watson"}),
+    ("lee", {"Lee"}),
+    ("zzz", set()),
+    ("  ", set()),
+])
+def test_search_matches_any_word_of_the_name(records, prefix, expected):
+    assert {r["name"] for r in StudentStore(records).search(prefix, limit=100)} == expected
+
+
+def test_search_by_id_returns_each_student_once(records):
+    matches = StudentStore(records).search("s00", limit=100)
+    assert [r["student_id"] for r in matches] == [f"S00{i}" for i in range(10)]
+    assert len(StudentStore(records).search("s0", limit=4)) == 4
+
+
+def test_indexes_stay_consistent_after_upsert(records):
+    store = StudentStore(records)
+    rng = random.Random(1)
+    for _ in range(200):
+        record = dict(rng.choice(records))
+        record["post_score"] = rng.choice([None, rng.randint(50, 100)])
+        record["name"] = rng.choice(NAMES + ["Robin Smith"])
+        store.upsert(record)
+        records[int(record["student_id"][1:])] = record
+    new = {"student_id": "S999", "name": "New Student", "pre_score": None, "post_score": 77,
+           "improvement": None, "weakest_dimension": "Problem Analysis"}
+    store.upsert(new)
+    records.append(new)
+
+    assert len(store) == len(records)
+    for field in SORT_FIELDS:
+        assert store._sorted[field] == sorted((r[field], r["student_id"]) for r in records if r.get(field) is not None)
+    assert store._names == sorted(key for r in records for key in StudentStore._name_keys(r))
+    assert store.page(sort_by="post_score", limit=100) == reference_page(records, sort_by="post_score", limit=100)
+    assert {r["student_id"] for r in store.search("robin", limit=100)} == \
+        {r["student_id"] for r in records if r["name"] == "Robin Smith"}
+
+
+def test_read_only_store_is_edited_through_copy(records):
+    shared = StudentStore(records, read_only=True)
+    with pytest.raises(RuntimeError):
+        shared.upsert(dict(records[0], post_score=99))
+
+    copy = shared.copy()
+    copy.upsert(dict(records[0], post_score=99))
+    assert copy.get("S000")["post_score"] == 99
+    assert shared.get("S000")["post_score"] == records[0]["post_score"]
@@ -0,0 +1,233 @@
+import threading
+import pytest
+from database.guidance_cache import GuidanceCache
+from models.model_router import ModelRouter
+from models.tutor_model import EngineeringTutor
+from utils.generation_budget import GenerationBudget
+
+
+class FakeResidency:
+    """Grants every switch except to the models in full"""
+
+    def __init__(self, full=()):
+        self.full = set(full)
+        self.requests = []
+
+    def request_switch(self, session_id, model_name, queue=None):
+        self.requests.append(model_name)
+        return {"status": "rejected" if model_name in self.full else "granted"}
+
+
+class FakeOllama:
+    """Records generate_with_context calls and returns a growing context"""
+
+    model_name = "llama3.2"
+
+    def __init__(self, done_reasons=("stop",), available=("llama3.2", "llama3.2:1b")):
+        self.budget = GenerationBudget(store_path=None)
+        self.residency = FakeResidency()
+        self.done_reasons = list(done_reasons)
+        self.available = set(available)
+        self.calls = []
+
+    def _done_reason(self):
+        return self.done_reasons.pop(0) if len(self.done_reasons) > 1 else self.done_reasons[0]
+
+    def ensure_model(self, model_name):
+        return model_name in self.available
+
+    def chat_with_metadata(self, messages, model=None, **kwargs):
+        self.calls.append({"messages": messages, "model": model})
+        return {"response": f"answer {len(self.calls)}", "done_reason": self._done_reason()}
+
+    def generate_with_context(self, prompt, context=None, model=None, **kwargs):
+        self.calls.append({"prompt": prompt, "context": context, "model": model})
+        return {"response": f"answer {len(self.calls)}", "context": (context or []) + [len(self.calls)],
+                "done_reason": self._done_reason(), "prompt_eval_count": 10, "prompt_eval_duration": 0}
+
+
+@pytest.fixture
+def tutor(tmp_path):
+    return EngineeringTutor(FakeOllama(), course_data_path=str(tmp_path))
+
+
+def test_follow_up_continues_context(tutor):
+    tutor.answer_question("What is a heat exchanger?", session_id="s1")
+    tutor.answer_question("And its efficiency?", session_id="s1")
+
+    second = tutor.ollama.calls[1]
+    assert second["context"] == [1]
+    assert second["prompt"] == "And its efficiency?"
+
+
+def test_each_model_keeps_its_own_context(tutor):
+    tutor.answer_question("Q1", session_id="s1", model="small")
+    tutor.answer_question("Q2", session_id="s1", model="large")
+    tutor.answer_question("Q3", session_id="s1", model="small")
+
+    third = tutor.ollama.calls[2]
+    # The small model's context is continued, replaying only the turn it did not see
+    assert third["context"] == [1]
+    assert "Student: Q2" in third["prompt"] and "Tutor: answer 2" in third["prompt"]
+    assert "Q1" not in third["prompt"]
+    assert third["prompt"].endswith("Q3")
+
+
+def test_modes_keep_separate_contexts(tutor):
+    tutor.answer_question("Q1", session_id="s1", mode="general")
+    tutor.answer_question("Q2", session_id="s1", mode="concept_explanation")
+    tutor.answer_question("Q3", session_id="s1", mode="general")
+
+    assert tutor.ollama.calls[1]["context"] is None
+    assert tutor.ollama.calls[2]["context"] == [1]
+    assert len(tutor.session_contexts("s1")) == 2
+
+
+def test_reset_replays_nothing(tutor):
+    tutor.answer_question("Q1", session_id="s1")
+    tutor.reset_conversation("s1")
+    tutor.answer_question("Q2", session_id="s1")
+
+    assert tutor.ollama.calls[1] == {"prompt": "Q2", "context": None, "model": "llama3.2"}
+
+
+class FixedRouter(ModelRouter):
+    """Routes every question to one tier"""
+
+    def __init__(self, tier):
+        super().__init__(small_model="llama3.2:1b", large_model="llama3.2")
+        self.tier = tier
+
+    def route(self, question):
+        return self.tier, self.model_for(self.tier)
+
+
+@pytest.mark.parametrize("use_context", [True, False])
+def test_truncated_small_answer_escalates(tmp_path, use_context):
+    ollama = FakeOllama(done_reasons=["length", "stop"])
+    tutor = EngineeringTutor(ollama, course_data_path=str(tmp_path), router=FixedRouter("small"),
+                             use_context=use_context)
+
+    assert tutor.answer_question("What is enthalpy?", session_id="s1") == "answer 2"
+    assert [call["model"] for call in ollama.calls] == ["llama3.2:1b", "llama3.2"]
+    assert ollama.residency.requests == ["llama3.2:1b", "llama3.2"]
+    assert tutor.router.stats["small"]["escalated"] == 1
+
+
+def test_small_tier_that_does_not_fit_uses_large_tier(tmp_path):
+    ollama = FakeOllama()
+    ollama.residency.full.add("llama3.2:1b")
+    tutor = EngineeringTutor(ollama, course_data_path=str(tmp_path), router=FixedRouter("small"))
+
+    tutor.answer_question("What is enthalpy?", session_id="s1")
+
+    assert [call["model"] for call in ollama.calls] == ["llama3.2"]
+
+
+def test_missing_small_model_falls_back_to_large():
+    router = ModelRouter(small_model="llama3.2:1b", large_model="llama3.2")
+
+    tiers = router.ensure_models(FakeOllama(available=["llama3.2"]))
+
+    assert tiers == {"small": "llama3.2", "large": "llama3.2"}
+
+
+def test_idle_sessions_are_dropped(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("utils.session_store.time.monotonic", lambda: clock[0])
+    tutor = EngineeringTutor(FakeOllama(), course_data_path=str(tmp_path), session_idle_timeout=60)
+    tutor.answer_question("Q1", session_id="s1")
+    clock[0] += 30
+    tutor.answer_question("Q1", session_id="s2")
+
+    clock[0] += 45
+    tutor.answer_question("Q2", session_id="s2")
+
+    assert "s1" not in tutor.sessions
+    assert [m.content for m in tutor.get_history("s2")] == ["Q1", "answer 2", "Q2", "answer 3"]
+
+
+def test_least_recently_used_sessions_are_evicted(tmp_path):
+    tutor = EngineeringTutor(FakeOllama(), course_data_path=str(tmp_path), max_sessions=2)
+    for session_id in ("s1", "s2", "s1", "s3"):
+        tutor.answer_question("Q", session_id=session_id)
+
+    assert len(tutor.sessions) == 2
+    assert "s2" not in tutor.sessions
+    assert len(tutor.get_history("s1")) == 4
+
+
+def test_reset_frees_the_session(tutor):
+    tutor.answer_question("Q1", session_id="s1")
+    tutor.reset_conversation("s1")
+
+    assert "s1" not in tutor.sessions
+
+
+class GuidanceOllama(FakeOllama):
+    """Returns fixed guidance, failing the requests for the stages in fail"""
+
+    def __init__(self, guidance, fail=()):
+        super().__init__()
+        self.guidance = guidance
+        self.fail = set(fail)
+
+    def generate_with_context(self, prompt, context=None, model=None, **kwargs):
+        self.calls.append({"prompt": prompt, "model": model})
+        stage = kwargs["budget_key"][1]
+        if stage in self.fail:
+            return {"response": "Error generating response: timed out", "context": None, "error": "timed out"}
+        return {"response": self.guidance, "context": [1], "done_reason": "stop"}
+
+
+def test_guidance_that_reads_like_an_error_is_cached(tmp_path):
+    ollama = GuidanceOllama("Error analysis: start from the measurement uncertainty.")
+    tutor = EngineeringTutor(ollama, course_data_path=str(tmp_path), guidance_cache=GuidanceCache(":memory:"))
+
+    report = tutor.precompute_guidance(["Size the heat exchanger"], stages=["identify"])
+    assert report["generated"] == 1 and report["failed"] == 0
+    assert tutor.guide_critical_thinking("Size the heat exchanger", "identify").startswith("Error analysis:")
+    assert len(ollama.calls) == 1
+
+
+def test_failed_guidance_is_counted_and_not_cached(tmp_path):
+    ollama = GuidanceOllama("Start from the energy balance.", fail=["analyze"])
+    tutor = EngineeringTutor(ollama, course_data_path=str(tmp_path), guidance_cache=GuidanceCache(":memory:"))
+
+    report = tutor.precompute_guidance(["Size the heat exchanger"], stages=["identify", "analyze"])
+    assert (report["generated"], report["failed"]) == (1, 1)
+    assert tutor.precompute_guidance(["Size the heat exchanger"], stages=["identify", "analyze"])["cached"] == 1
+
+
+class OrderedOllama(GuidanceOllama):
+    """Finishes stage requests in a given order, and fails the stages in fail with an exception"""
+
+    def __init__(self, order, fail=()):
+        super().__init__("guidance")
+        self.order = order
+        self.raise_for = set(fail)
+        self.finished = {stage: threading.Event() for stage in order}
+
+    def generate_with_context(self, prompt, context=None, model=None, **kwargs):
+        stage = kwargs["budget_key"][1]
+        position = self.order.index(stage)
+        if position:
+            assert self.finished[self.order[position - 1]].wait(5)
+        try:
+            if stage in self.raise_for:
+                raise ConnectionError("node went away")
+            return {"response": f"{stage} guidance", "context": [1], "done_reason": "stop"}
+        finally:
+            self.finished[stage].set()
+
+
+def test_walkthrough_yields_every_stage_as_it_completes(tmp_path):
+    tutor = EngineeringTutor(FakeOllama(), course_data_path=str(tmp_path))
+    order = list(tutor.ct_framework.stages)[::-1]
+    tutor.ollama = OrderedOllama(order, fail=[order[1]])
+
+    results = list(tutor.walkthrough("Size the heat exchanger"))
+
+    assert [stage for stage, _ in results] == order
+    assert results[0] == (order[0], f"{order[0]} guidance")
+    assert results[1][1] == "Error generating response: node went away"
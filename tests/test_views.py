@@ -0,0 +1,142 @@
+import re
+from streamlit.testing.v1 import AppTest
+from database.scenario_bank import ScenarioBank
+from models.records import Message
+
+
+class FakeTutor:
+    """Holds one session's history the way EngineeringTutor.get_history returns it"""
+
+    def __init__(self, turns):
+        self.history = [Message.create("user" if i % 2 == 0 else "assistant", f"message {i}") for i in range(turns)]
+
+    def get_history(self, session_id=None):
+        return self.history
+
+
+def chat_script():
+    import streamlit as st
+    from views.tutor import display_chat_history
+    display_chat_history(st.session_state.tutor)
+
+
+def run_chat(turns):
+    at = AppTest.from_function(chat_script)
+    at.session_state["tutor"] = FakeTutor(turns)
+    at.session_state["session_id"] = "s1"
+    return at.run()
+
+
+def test_chat_html_cache_holds_only_the_rendered_window():
+    at = run_chat(30)
+    tutor = at.session_state["tutor"]
+    assert set(at.session_state["chat_html"]) == {m.id for m in tutor.history[-20:]}
+
+    tutor.history += [Message.create("user", "new question"), Message.create("assistant", "new answer")]
+    at.run()
+
+    assert set(at.session_state["chat_html"]) == {m.id for m in tutor.history[-20:]}
+    assert "new answer" in at.markdown[-1].value
+
+
+def shown_messages(at):
+    return [int(i) for i in re.findall(r"message (\d+)\s*</div>", at.markdown[-1].value)]
+
+
+def test_earlier_messages_load_a_page_at_a_time(monkeypatch):
+    import views.tutor
+    rendered = []
+    message_html = views.tutor._message_html
+    monkeypatch.setattr(views.tutor, "_message_html", lambda message: rendered.append(message) or message_html(message))
+
+    at = run_chat(30)
+    assert shown_messages(at) == list(range(10, 30))
+    assert at.button[0].label == "Load earlier messages (10 hidden)"
+    assert len(rendered) == 20
+
+    at.button[0].click().run()
+    assert shown_messages(at) == list(range(30))
+    # Only the newly revealed messages are rendered; the window already shown comes from the cache
+    assert len(rendered) == 30
+    assert not at.run().button
+
+
+def settings_script():
+    import streamlit as st
+    from types import SimpleNamespace
+    from utils.critical_thinking import CriticalThinkingFramework
+    from utils.seed_data import seed_session
+    from views.settings import display_settings
+    seed_session(st.session_state)
+    st.session_state.grader = SimpleNamespace(ct_framework=CriticalThinkingFramework())
+    display_settings()
+
+
+def labelled(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def test_blank_dimension_names_are_not_saved():
+    at = AppTest.from_function(settings_script).run()
+    at.text_input(key="dim_4").set_value(" ")
+    labelled(at.button, "Save Assessment Configuration").click().run()
+
+    assert at.error[0].value == "Every dimension needs a unique, non-empty name."
+    assert len(at.session_state["system_settings"]["critical_thinking_dimensions"]) == 5
+
+    at.text_input(key="dim_4").set_value("Future Impact")
+    labelled(at.button, "Save Assessment Configuration").click().run()
+    assert at.session_state["system_settings"]["critical_thinking_dimensions"][-1] == "Future Impact"
+
+
+def test_integration_settings_do_not_store_credentials():
+    at = AppTest.from_function(settings_script).run()
+    seeded = dict(at.session_state["system_settings"])
+    labelled(at.text_input, "API Key").set_value("secret")
+    labelled(at.text_input, "Database Connection String").set_value("postgresql://admin:secret@db/engai")
+    labelled(at.selectbox, "Backup Frequency").set_value("Weekly")
+    labelled(at.button, "Save System Integration Settings").click().run()
+
+    settings = at.session_state["system_settings"]
+    assert settings["backup_frequency"] == "Weekly"
+    assert settings["api_key"] == seeded["api_key"]
+    assert settings["database_connection"] == seeded["database_connection"]
+
+
+class CountingBank(ScenarioBank):
+    """Scenario bank that records which scenarios were loaded in full"""
+
+    def __init__(self):
+        super().__init__(db_path=":memory:")
+        self.loaded = []
+
+    def get(self, scenario_id):
+        self.loaded.append(scenario_id)
+        return super().get(scenario_id)
+
+
+def scenario_list_script():
+    import streamlit as st
+    from views.scenarios import display_scenario_list
+    display_scenario_list(st.session_state.bank)
+
+
+def test_scenario_list_keeps_ids_and_loads_only_the_opened_scenario():
+    bank = CountingBank()
+    ids = [bank.add({"scenario_text": f"Scenario {i} " + " ".join(f"unique{i}word{j}" for j in range(40)),
+                     "metadata": {"topic": f"Topic {i}", "difficulty": "Intermediate", "type": "Case Study",
+                                  "industry": "Energy"}})["id"] for i in range(12)]
+    at = AppTest.from_function(scenario_list_script)
+    at.session_state["bank"] = bank
+    at.session_state["scenarios"] = list(ids)
+    at.run()
+
+    # Newest first, ten per page, from headers only
+    assert [m.value for m in at.markdown if m.value.startswith("**Topic")][0].startswith("**Topic 11 - ")
+    assert "Page 1 of 2 (12 scenarios)" in "".join(m.value for m in at.markdown)
+    assert bank.loaded == []
+
+    labelled(at.button, "Open").click().run()
+    assert bank.loaded == [ids[-1]]
+    assert at.session_state["open_scenario"] == ids[-1]
+    assert at.session_state["scenarios"] == ids
@@ -1,9 +1,54 @@
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Dict
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger("EngE-AI.critical_thinking")
+
+# Token budget for a scaffold until enough scaffolds have been generated to learn one
+SCAFFOLD_MAX_TOKENS = 1536
+
+# JSON mode can pad a finished object with blank lines until num_predict runs out
+SCAFFOLD_STOP_SEQUENCES = ["\n\n\n"]
+
+
+def rubric_version(rubric_levels: List[Dict], dimensions: Dict[str, str]) -> str:
+    """Version of a rubric, derived from its levels and dimensions"""
+    rubric = {"rubric_levels": rubric_levels, "dimensions": dimensions}
+    return hashlib.sha256(json.dumps(rubric, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+class ScaffoldStage(BaseModel):
+    """Topic-specific scaffold for one critical thinking stage"""
+
+    topic_context: str = Field(min_length=1, description="What this stage means for the topic, in two or three sentences")
+    prompts: List[str] = Field(min_length=1, description="Guiding questions specific to the topic")
+
+
+class TopicScaffold(BaseModel):
+    """
+    Topic-specific context and guiding questions for every critical thinking stage
+    """
+
+    stages: Dict[str, ScaffoldStage] = Field(description="Scaffold for each stage, keyed by stage key")
+
+
 class CriticalThinkingFramework:
     """
     Framework for structured critical thinking in engineering education
     """
 
-    def __init__(self):
+    def __init__(self, ollama_manager=None, scaffold_cache=None):
+        """
+        Args:
+            ollama_manager (OllamaManager, optional): Used to generate topic-specific scaffolds
+            scaffold_cache (ScaffoldCache, optional): Persistent cache of generated scaffolds
+        """
+        self.ollama = ollama_manager
+        self.scaffold_cache = scaffold_cache
+
         # Critical thinking stages
         self.stages = {
             "identify": {
@@ -73,6 +118,19 @@ class CriticalThinkingFramework:
             "metacognitive": "Reflecting on the problem-solving process and one's own thinking"
         }
 
+        # Rubric levels used to grade written assessment responses
+        self.rubric_levels = [
+            {"name": "Exemplary", "description": "Demonstrates exceptional critical thinking with comprehensive analysis and creative solutions", "score_range": "85-100"},
+            {"name": "Proficient", "description": "Shows solid critical thinking with good analysis and reasonable solutions", "score_range": "70-84"},
+            {"name": "Developing", "description": "Shows basic critical thinking with partial analysis and some viable solutions", "score_range": "60-69"},
+            {"name": "Beginning", "description": "Shows minimal critical thinking with superficial analysis and limited solutions", "score_range": "0-59"}
+        ]
+        # Changes whenever the rubric levels or dimensions change, so cached grades are regraded
+        self.rubric_version = rubric_version(self.rubric_levels, self.dimensions)
+
+        # Changes whenever the stages change, so cached scaffolds are regenerated
+        self.version = hashlib.sha256(json.dumps(self.stages, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
     def get_stage_prompt(self, stage_key):
         """
         Get prompts for a specific critical thinking stage
@@ -88,14 +146,40 @@ class CriticalThinkingFramework:
             return "Stage not found. Available stages: identify, analyze, evaluate, create, reflect."
 
         # Format the stage information
-        prompt = f"# {stage['name']} Stage\n\n"
-        prompt += f"{stage['description']}\n\n"
-        prompt += "**Guiding Questions:**\n"
+        lines = [f"# {stage['name']} Stage", "", stage['description'], "", "**Guiding Questions:**"]
+        lines.extend(f"- {question}" for question in stage['prompts'])
 
-        for question in stage['prompts']:
-            prompt += f"- {question}\n"
+        return "\n".join(lines) + "\n"
 
-        return prompt
+    def get_rubric_prompt(self):
+        """
+        Get the rubric levels and dimensions formatted for a grading prompt
+
+        Returns:
+            str: Rubric text listing each level with its score range and each dimension
+        """
+        lines = ["**Rubric Levels:**"]
+        lines.extend(f"- {level['name']} ({level['score_range']}): {level['description']}"
+                     for level in self.rubric_levels)
+        lines.extend(["", "**Critical Thinking Dimensions:**"])
+        lines.extend(f"- {key}: {description}" for key, description in self.dimensions.items())
+        return "\n".join(lines) + "\n"
+
+    def get_rubric_level(self, score):
+        """
+        Get the rubric level whose score range contains a score
+
+        Args:
+            score (float): Score out of 100
+
+        Returns:
+            str: Rubric level name
+        """
+        for level in self.rubric_levels:
+            low, high = (float(v) for v in level["score_range"].split("-"))
+            if low <= score <= high or score > high:
+                return level["name"]
+        return self.rubric_levels[-1]["name"]
 
     def get_enhancement_prompt(self):
         """
@@ -117,19 +201,28 @@ When students provide answers, ask them to explain their reasoning rather than s
 
         return prompt
 
-    def get_scaffolded_approach(self, topic):
+    def get_scaffolded_approach(self, topic, course=None):
         """
         Generate a scaffolded critical thinking approach for a specific topic
 
+        All stages are filled by a single JSON-constrained LLM call and the
+        result is memoized per (topic, course, framework version). Without an
+        Ollama manager, or if generation fails, the generic stage prompts are
+        returned with a placeholder topic context.
+
         Args:
             topic (str): Engineering topic to create framework for
+            course (str, optional): Course the topic belongs to
 
         Returns:
             dict: Structured critical thinking framework for the topic
         """
-        # This would normally integrate with the LLM to generate
-        # topic-specific critical thinking frameworks, but for now
-        # we'll return a placeholder
+        if self.scaffold_cache is not None:
+            cached = self.scaffold_cache.get(topic, course, self.version)
+            if cached is not None:
+                return cached
+
+        scaffold = self._generate_scaffold(topic, course) if self.ollama is not None else None
 
         framework = {
             "topic": topic,
@@ -138,11 +231,76 @@ When students provide answers, ask them to explain their reasoning rather than s
 
         # Add each stage with topic context
         for key, stage in self.stages.items():
+            generated = scaffold.stages.get(key) if scaffold else None
             framework["stages"].append({
                 "name": stage["name"],
                 "description": stage["description"],
-                "topic_context": f"For {topic}, this means...",
-                "prompts": stage["prompts"]
+                "topic_context": generated.topic_context if generated else f"For {topic}, this means...",
+                "prompts": generated.prompts if generated else stage["prompts"]
             })
 
-        return framework
\ No newline at end of file
+        if scaffold is not None and self.scaffold_cache is not None:
+            self.scaffold_cache.put(topic, course, self.version, framework)
+
+        return framework
+
+    def _generate_scaffold(self, topic, course=None, max_retries=1):
+        """Fill every stage for a topic with one JSON-constrained LLM call"""
+        stages = "\n".join(f"- {key}: {stage['name']} - {stage['description']}" for key, stage in self.stages.items())
+        schema = json.dumps(TopicScaffold.model_json_schema())
+        prompt = (f"Topic: {topic}\n" + (f"Course: {course}\n" if course else "") +
+                  f"\nCritical thinking stages:\n{stages}\n\n"
+                  f"For every stage, explain what it means for this topic and write three to five guiding "
+                  f"questions specific to the topic.\n"
+                  f"Respond only with a JSON object that matches this JSON schema:\n{schema}\n"
+                  f"stages must contain exactly these keys: {', '.join(self.stages)}.")
+
+        budget_key = ("generate_scaffold", None, course)
+        max_tokens = self.ollama.budget.get_budget(*budget_key, default=SCAFFOLD_MAX_TOKENS)
+        for attempt in range(max_retries + 1):
+            result = self.ollama.generate_with_context(prompt=prompt, system_prompt=self.get_enhancement_prompt(),
+                                                       temperature=0.4, format="json", max_tokens=max_tokens,
+                                                       stop=SCAFFOLD_STOP_SEQUENCES, budget_key=budget_key)
+            if result.get("error"):
+                break
+            try:
+                scaffold = TopicScaffold.model_validate_json(result["response"])
+            except ValidationError as e:
+                logger.warning(f"Scaffold for {topic} failed validation (attempt {attempt + 1}): {e.error_count()} errors")
+                if result.get("done_reason") == "length":
+                    # Cut-off JSON cannot be continued; retry with room to finish
+                    max_tokens *= 2
+                continue
+            if set(self.stages) <= set(scaffold.stages):
+                return scaffold
+            logger.warning(f"Scaffold for {topic} is missing stages (attempt {attempt + 1})")
+
+        logger.error(f"Scaffold generation failed for {topic}; using generic stage prompts")
+        return None
+
+    def warm_scaffolds(self, topics, course=None):
+        """
+        Generate scaffolds for topics in a background thread
+
+        Args:
+            topics (list): Topic names, or (topic, course) pairs
+            course (str, optional): Course for plain topic names
+
+        Returns:
+            threading.Thread: The warming thread (None if there is nothing to warm)
+        """
+        if self.ollama is None or not topics:
+            return None
+
+        def warm():
+            for item in topics:
+                topic, topic_course = item if isinstance(item, tuple) else (item, course)
+                try:
+                    self.get_scaffolded_approach(topic, topic_course)
+                except Exception as e:
+                    logger.error(f"Error warming scaffold for {topic}: {str(e)}")
+            logger.info(f"Warmed scaffolds for {len(topics)} topics")
+
+        thread = threading.Thread(target=warm, name="scaffold-warmer", daemon=True)
+        thread.start()
+        return thread
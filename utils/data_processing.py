@@ -0,0 +1,307 @@
+import os
+import re
+import json
+import mmap
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterator, Tuple, List
+
+logger = logging.getLogger("EngE-AI.course_data")
+
+# Section name -> course data file
+COURSE_FILES = {
+    "topics": "topics.json",
+    "problems": "problems.json",
+    "objectives": "learning_objectives.json",
+}
+
+# Fields that name an entry of a topic/problem/objective list
+_NAME_FIELDS = ("name", "topic", "title", "id")
+
+# Bump whenever the layout of the saved .idx files changes
+INDEX_VERSION = 2
+
+# Entry index key for lists that are not under a course
+_SHARED = ""
+
+_WHITESPACE = re.compile(rb"\s*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURAL = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb"[\s,\]}]")
+
+
+def _skip_whitespace(buf, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_value(buf, pos: int) -> int:
+    """Return the offset just past the JSON value starting at pos, without decoding it"""
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        return _STRING.match(buf, pos).end()
+    if first not in (b"{", b"["):
+        match = _SCALAR_END.search(buf, pos)
+        return match.start() if match else len(buf)
+
+    depth = 0
+    while True:
+        match = _STRUCTURAL.search(buf, pos)
+        if match is None:
+            raise ValueError(f"Unterminated JSON container at offset {pos}")
+        char = match.group()
+        if char == b'"':
+            pos = _STRING.match(buf, match.start()).end()
+            continue
+        depth += 1 if char in (b"{", b"[") else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+
+def _members(buf, pos: int, children: Optional[Dict[Optional[str], list]] = None) -> Tuple[list, int]:
+    """
+    Split the object or array starting at pos into its members
+
+    Args:
+        buf: File contents (bytes or mmap)
+        pos (int): Offset of the opening brace or bracket
+        children (dict, optional): When given, members whose value is an array are split
+                                   in the same pass and their elements stored under the member key
+
+    Returns:
+        tuple: ([(key, start, end), ...], offset just past the container); keys are None for array elements
+    """
+    is_object = buf[pos:pos + 1] == b"{"
+    members = []
+    pos = _skip_whitespace(buf, pos + 1)
+    while buf[pos:pos + 1] not in (b"}", b"]"):
+        key = None
+        if is_object:
+            end = _STRING.match(buf, pos).end()
+            key = json.loads(bytes(buf[pos:end]))
+            pos = _skip_whitespace(buf, end) + 1  # ':'
+            pos = _skip_whitespace(buf, pos)
+        if children is not None and buf[pos:pos + 1] == b"[":
+            children[key], end = _members(buf, pos)
+        else:
+            end = _skip_value(buf, pos)
+        members.append((key, pos, end))
+        pos = _skip_whitespace(buf, end)
+        if buf[pos:pos + 1] == b",":
+            pos = _skip_whitespace(buf, pos + 1)
+    return members, pos + 1
+
+
+def _entry_name(buf, pos: int) -> Optional[str]:
+    """Name of the object entry starting at pos, decoding only its keys and the name value"""
+    values = {key: (start, end) for key, start, end in _members(buf, pos)[0]}
+    for field in _NAME_FIELDS:
+        if field in values:
+            value = json.loads(buf[values[field][0]:values[field][1]])
+            if value is not None:
+                return str(value)
+    return None
+
+
+class CourseDataLoader:
+    """
+    Lazy, memory-mapped access to the course data files.
+
+    Each file is scanned once, without decoding it, into a compact index of
+    byte offsets: per course when the file is an object keyed by course, and
+    per (course, name) entry (e.g. topic) inside the top-level or per-course
+    lists; only entry keys and name values are decoded. The index is saved
+    next to the file and rebuilt only when the file changes.
+    A course's data is decoded from its byte range on first access and kept in
+    an LRU cache of max_courses courses; single entries can be fetched without
+    decoding the rest of the file.
+    """
+
+    def __init__(self, course_data_path="database/course_data", max_courses=4):
+        """
+        Initialize the loader (no data is read until it is needed)
+
+        Args:
+            course_data_path (str): Directory with topics.json, problems.json and learning_objectives.json
+            max_courses (int): Courses kept decoded in memory before the least recently used is evicted
+        """
+        self.course_data_path = course_data_path
+        self.max_courses = max_courses
+        self._indexes = {}
+        self._courses = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def _path(self, section: str) -> str:
+        return os.path.join(self.course_data_path, COURSE_FILES[section])
+
+    def _read(self, section: str, start: int, end: int) -> Any:
+        """Decode one byte range of a course data file"""
+        with open(self._path(section), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return json.loads(buf[start:end])
+
+    def _build_index(self, section: str) -> Dict[str, Any]:
+        """Scan a file for course and entry offsets without decoding it as a whole"""
+        index = {"version": INDEX_VERSION, "courses": {}, "entries": {}, "root": None}
+        with open(self._path(section), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            root = _skip_whitespace(buf, 0)
+            # Per-course lists (or the top-level list) are split into entries in the same pass
+            lists = {}
+            if buf[root:root + 1] == b"{":
+                members, end = _members(buf, root, children=lists)
+                index["courses"] = {course: [start, stop] for course, start, stop in members}
+            else:
+                lists[None], end = _members(buf, root)
+            index["root"] = [root, end]
+
+            for course, entries in lists.items():
+                named = {}
+                for _, start, stop in entries:
+                    if buf[start:start + 1] != b"{":
+                        continue
+                    name = _entry_name(buf, start)
+                    if name is not None:
+                        named.setdefault(name, [start, stop])
+                if named:
+                    index["entries"][_SHARED if course is None else course] = named
+        return index
+
+    def _index(self, section: str) -> Optional[Dict[str, Any]]:
+        """Load the saved index of a file, rebuilding it if the file changed"""
+        with self._lock:
+            path = self._path(section)
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                return None
+            stat = os.stat(path)
+            signature = [stat.st_size, stat.st_mtime_ns]
+            index = self._indexes.get(section)
+            if index is not None and index["signature"] == signature:
+                return index
+
+            index_path = path + ".idx"
+            try:
+                with open(index_path, "r") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+
+            if index is None or index.get("signature") != signature or index.get("version") != INDEX_VERSION:
+                index = self._build_index(section)
+                index["signature"] = signature
+                try:
+                    with open(index_path, "w") as f:
+                        json.dump(index, f, separators=(",", ":"))
+                except OSError as e:
+                    logger.warning(f"Could not save course data index {index_path}: {str(e)}")
+                entries = sum(len(named) for named in index["entries"].values())
+                logger.info(f"Indexed {path}: {len(index['courses'])} courses, {entries} entries")
+
+            self._indexes[section] = index
+            # Cached courses may come from the old version of the file
+            self._courses.clear()
+            return index
+
+    def courses(self) -> List[str]:
+        """Course names found in any course data file"""
+        names = {}
+        for section in COURSE_FILES:
+            index = self._index(section)
+            if index is not None:
+                names.update(dict.fromkeys(index["courses"]))
+        return list(names)
+
+    def _course_key(self, index: Dict[str, Any], course: str) -> Optional[str]:
+        """Match a course by its full name or by its code ("CHBE 220 - ..." -> "CHBE 220")"""
+        if course in index["courses"]:
+            return course
+        code = course.split(" - ")[0]
+        return code if code in index["courses"] else None
+
+    def get(self, course: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Data of one course, decoded on first access and cached with LRU eviction
+
+        Files that are not keyed by course are shared by every course.
+
+        Args:
+            course (str, optional): Course name; None for the shared data only
+
+        Returns:
+            dict: {"topics": ..., "problems": ..., "objectives": ...}
+        """
+        with self._lock:
+            if course in self._courses:
+                self._courses.move_to_end(course)
+                self.stats["hits"] += 1
+                return self._courses[course]
+
+        data = {}
+        for section in COURSE_FILES:
+            data[section] = []
+            try:
+                index = self._index(section)
+                if index is None:
+                    continue
+                if index["courses"]:
+                    key = self._course_key(index, course) if course else None
+                    if key is not None:
+                        data[section] = self._read(section, *index["courses"][key])
+                else:
+                    data[section] = self._read(section, *index["root"])
+            except Exception as e:
+                logger.error(f"Error loading {section} for {course}: {str(e)}")
+
+        with self._lock:
+            self._courses[course] = data
+            self.stats["loads"] += 1
+            while len(self._courses) > self.max_courses:
+                evicted, _ = self._courses.popitem(last=False)
+                self.stats["evictions"] += 1
+                logger.info(f"Evicted course data for {evicted}")
+        return data
+
+    def get_entry(self, section: str, name: str, course: Optional[str] = None) -> Optional[Any]:
+        """
+        Fetch one named entry (e.g. a topic) by its byte offsets
+
+        Args:
+            section (str): "topics", "problems" or "objectives"
+            name (str): Entry name, title or id
+            course (str, optional): Course to look in; without it the first course
+                                    (in file order) with an entry of that name is used.
+                                    Ignored for files that are not keyed by course.
+
+        Returns:
+            The decoded entry, or None if it is not indexed
+        """
+        index = self._index(section)
+        if index is None:
+            return None
+        entries = index["entries"]
+        if course is not None and index["courses"]:
+            key = self._course_key(index, course)
+            candidates = [key] if key is not None else []
+        else:
+            candidates = list(entries)
+        for key in candidates:
+            offsets = entries.get(key, {}).get(name)
+            if offsets is not None:
+                return self._read(section, *offsets)
+        return None
+
+    def iter_section(self, section: str) -> Iterator[Tuple[Optional[str], Any]]:
+        """
+        Stream a file one course at a time without caching it
+
+        Yields:
+            tuple: (course, data) per course, or (None, data) once for files not keyed by course
+        """
+        index = self._index(section)
+        if index is None:
+            return
+        if not index["courses"]:
+            yield None, self._read(section, *index["root"])
+            return
+        for course, (start, end) in index["courses"].items():
+            yield course, self._read(section, start, end)
@@ -0,0 +1,153 @@
+import os
+import json
+import math
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger("EngE-AI.budget")
+
+# Where observed output lengths are persisted between restarts
+DEFAULT_BUDGET_PATH = os.getenv("ENGE_AI_BUDGET_PATH", os.path.join("database", "generation_budgets.json"))
+
+
+class GenerationBudget:
+    """
+    Learns num_predict budgets from observed output lengths.
+
+    Output lengths are recorded per (call site, mode, course). The budget for a
+    key is a high percentile of its recent lengths plus some headroom, falling
+    back to broader keys (and finally a caller-supplied default) until enough
+    samples exist. Answers that hit the budget are continued by the caller
+    rather than reserving a large budget up front.
+    """
+
+    def __init__(self, store_path=DEFAULT_BUDGET_PATH, percentile=95, headroom=1.1, min_samples=20,
+                 window=500, min_tokens=64, max_tokens=2048, save_every=20):
+        """
+        Args:
+            store_path (str, optional): JSON file for persisting samples (None keeps them in memory only)
+            percentile (float): Percentile of observed lengths used as the budget
+            headroom (float): Multiplier applied to the percentile
+            min_samples (int): Samples needed before a key's learned budget is used
+            window (int): Number of recent samples kept per key
+            min_tokens (int): Lower bound for learned budgets
+            max_tokens (int): Upper bound for learned budgets
+            save_every (int): Persist after this many new samples
+        """
+        self.store_path = store_path
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.window = window
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.save_every = save_every
+        self.samples = {}
+        self.truncations = {}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(call_site, mode=None, course=None):
+        return f"{call_site}|{mode or '*'}|{course or '*'}"
+
+    def _load(self):
+        """Load persisted samples"""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path, "r") as f:
+                data = json.load(f)
+            for key, values in data.get("samples", {}).items():
+                self.samples[key] = deque(values, maxlen=self.window)
+            self.truncations = data.get("truncations", {})
+        except Exception as e:
+            logger.error(f"Error loading generation budgets: {str(e)}")
+
+    def save(self):
+        """Persist samples to store_path"""
+        if not self.store_path:
+            return
+        with self._lock:
+            data = {"samples": {k: list(v) for k, v in self.samples.items()}, "truncations": dict(self.truncations)}
+            self._unsaved = 0
+        try:
+            directory = os.path.dirname(self.store_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.store_path, "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error(f"Error saving generation budgets: {str(e)}")
+
+    def record(self, call_site, mode=None, course=None, output_tokens=0, truncated=False):
+        """
+        Record the length of a finished generation
+
+        The sample is added to the exact key and its broader fallbacks.
+
+        Args:
+            call_site (str): Calling method, e.g. "answer_question"
+            mode (str, optional): Interaction mode or scenario type
+            course (str, optional): Course the request belongs to
+            output_tokens (int): Total tokens generated, including continuations
+            truncated (bool): Whether the answer was still cut off at the end
+        """
+        keys = {self._key(call_site, mode, course), self._key(call_site, mode), self._key(call_site)}
+        with self._lock:
+            for key in keys:
+                self.samples.setdefault(key, deque(maxlen=self.window)).append(int(output_tokens))
+            if truncated:
+                exact = self._key(call_site, mode, course)
+                self.truncations[exact] = self.truncations.get(exact, 0) + 1
+            self._unsaved += 1
+            should_save = self._unsaved >= self.save_every
+        if should_save:
+            self.save()
+
+    def _percentile(self, values):
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def get_budget(self, call_site, mode=None, course=None, default=1024) -> int:
+        """
+        Get the num_predict budget for a call
+
+        Args:
+            call_site (str): Calling method
+            mode (str, optional): Interaction mode or scenario type
+            course (str, optional): Course the request belongs to
+            default (int): Budget used until enough samples exist
+
+        Returns:
+            int: Tokens to reserve for the generation
+        """
+        with self._lock:
+            for key in (self._key(call_site, mode, course), self._key(call_site, mode), self._key(call_site)):
+                values = self.samples.get(key)
+                if values and len(values) >= self.min_samples:
+                    # Rounded first so float error (e.g. 400 * 1.1) does not add a token
+                    budget = math.ceil(round(self._percentile(values) * self.headroom, 6))
+                    return max(self.min_tokens, min(self.max_tokens, budget))
+        return default
+
+    def get_report(self):
+        """
+        Summarize learned budgets per key
+
+        Returns:
+            dict: key -> samples, budget and truncation count
+        """
+        report = {}
+        for key in list(self.samples):
+            call_site, mode, course = key.split("|")
+            report[key] = {
+                "samples": len(self.samples[key]),
+                "budget": self.get_budget(call_site, None if mode == "*" else mode,
+                                          None if course == "*" else course, default=None),
+                "truncations": self.truncations.get(key, 0)
+            }
+        return report
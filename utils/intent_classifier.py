@@ -0,0 +1,172 @@
+import os
+import pickle
+import logging
+import threading
+
+logger = logging.getLogger("EngE-AI.intent")
+
+# Location of the trained classifier artifact
+DEFAULT_ARTIFACT_PATH = os.getenv("ENGE_AI_INTENT_MODEL", os.path.join("assets", "models", "intent_classifier.pkl"))
+
+# Labelled examples used to train the classifier offline
+SEED_EXAMPLES = [
+    # concept_explanation
+    ("What is enthalpy?", "concept_explanation"),
+    ("Can you explain entropy in simple terms?", "concept_explanation"),
+    ("Explain the second law of thermodynamics with real-world examples", "concept_explanation"),
+    ("What's the relationship between Gibbs free energy and spontaneity?", "concept_explanation"),
+    ("What does fugacity mean physically?", "concept_explanation"),
+    ("Define chemical potential", "concept_explanation"),
+    ("Why is the Carnot efficiency the maximum possible?", "concept_explanation"),
+    ("What is the difference between a state function and a path function?", "concept_explanation"),
+    ("Explain Raoult's law and when it applies", "concept_explanation"),
+    ("What are the practical applications of the Carnot cycle?", "concept_explanation"),
+    ("How does a heat pump work?", "concept_explanation"),
+    ("What is an activity coefficient?", "concept_explanation"),
+    # problem_solving
+    ("How do I solve problems involving phase equilibria?", "problem_solving"),
+    ("How do I apply the first law to open systems?", "problem_solving"),
+    ("Calculate the work done by an isothermal expansion of 2 mol of ideal gas from 1 to 5 L", "problem_solving"),
+    ("I'm stuck on question 3 of the problem set about a steam turbine", "problem_solving"),
+    ("Find the dew point temperature of a 30% benzene toluene mixture", "problem_solving"),
+    ("My energy balance doesn't close, what am I missing?", "problem_solving"),
+    ("How do I set up the mass balance for a reactor with recycle?", "problem_solving"),
+    ("What steps should I follow to compute the equilibrium constant at 500 K?", "problem_solving"),
+    ("Solve for the outlet temperature of the heat exchanger", "problem_solving"),
+    ("Can you check my answer of 45 kJ for this compressor work problem?", "problem_solving"),
+    ("How many degrees of freedom does this flash problem have?", "problem_solving"),
+    ("Help me with homework on the Rankine cycle efficiency", "problem_solving"),
+    # critical_thinking
+    ("Is it better to use biofuels or fossil fuels in this process? What are the trade-offs?", "critical_thinking"),
+    ("What assumptions am I making if I treat this gas as ideal, and are they justified?", "critical_thinking"),
+    ("How would I evaluate whether this plant design is safe and sustainable?", "critical_thinking"),
+    ("A startup claims their catalyst improves efficiency by 40%. How should I judge that claim?", "critical_thinking"),
+    ("What are the ethical implications of siting a refinery near a town?", "critical_thinking"),
+    ("Which design would you choose and why, given cost and environmental impact?", "critical_thinking"),
+    ("How could I critique the approach taken in this case study?", "critical_thinking"),
+    ("What might go wrong if we scale up this reactor?", "critical_thinking"),
+    ("Compare two separation strategies and argue which is more robust", "critical_thinking"),
+    ("How do I reflect on whether my solution process was effective?", "critical_thinking"),
+    ("What are the limitations of using this model for real plant data?", "critical_thinking"),
+    ("Should engineers prioritize efficiency over safety margins here?", "critical_thinking"),
+    # general
+    ("Hi there", "general"),
+    ("Thanks, that helps!", "general"),
+    ("What topics are covered in this course?", "general"),
+    ("Can you help me study for the midterm?", "general"),
+    ("What should I review before next week's lecture?", "general"),
+    ("Hello, I have a question about the course", "general"),
+    ("How should I prepare for the final exam?", "general"),
+    ("Can you recommend resources for learning thermodynamics?", "general"),
+    ("What's the best way to take notes in this class?", "general"),
+    ("I don't understand anything in this course", "general"),
+]
+
+
+def train_intent_classifier(examples=None, artifact_path=DEFAULT_ARTIFACT_PATH):
+    """
+    Train the TF-IDF + logistic regression intent classifier and pickle it
+
+    Args:
+        examples (list, optional): (question, mode) pairs (defaults to SEED_EXAMPLES)
+        artifact_path (str): Where to write the pickled pipeline
+
+    Returns:
+        sklearn.pipeline.Pipeline: Trained classifier
+    """
+    from sklearn.pipeline import make_pipeline
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    examples = examples or SEED_EXAMPLES
+    pipeline = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, lowercase=True),
+        LogisticRegression(max_iter=1000, C=5.0)
+    )
+    pipeline.fit([q for q, _ in examples], [mode for _, mode in examples])
+
+    directory = os.path.dirname(artifact_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(artifact_path, "wb") as f:
+        pickle.dump(pipeline, f)
+    logger.info(f"Trained intent classifier on {len(examples)} examples -> {artifact_path}")
+    return pipeline
+
+
+class IntentClassifier:
+    """
+    Classifier that maps a student question to a tutor mode.
+
+    The artifact is loaded (or trained, when missing) by load() at startup;
+    predict() never trains, and falls back to default_mode until a classifier
+    is available.
+    """
+
+    def __init__(self, artifact_path=DEFAULT_ARTIFACT_PATH, min_confidence=0.4, default_mode="general"):
+        """
+        Args:
+            artifact_path (str): Path to the pickled classifier
+            min_confidence (float): Predictions below this probability fall back to default_mode
+            default_mode (str): Mode used when the classifier is unsure or unavailable
+        """
+        self.artifact_path = artifact_path
+        self.min_confidence = min_confidence
+        self.default_mode = default_mode
+        self._pipeline = None
+        self._checked = False
+        self._lock = threading.Lock()
+
+    def load(self, train_if_missing=False):
+        """
+        Load the pickled classifier
+
+        Args:
+            train_if_missing (bool): Train from the seed examples (and write the artifact) if there is none;
+                                     meant for startup, never for the request path
+
+        Returns:
+            The classifier pipeline, or None if no artifact exists and training was not requested
+        """
+        with self._lock:
+            if self._pipeline is None:
+                if os.path.exists(self.artifact_path):
+                    with open(self.artifact_path, "rb") as f:
+                        self._pipeline = pickle.load(f)
+                elif train_if_missing:
+                    logger.warning(f"No intent classifier at {self.artifact_path}; training from seed examples")
+                    self._pipeline = train_intent_classifier(artifact_path=self.artifact_path)
+                elif not self._checked:
+                    logger.warning(f"No intent classifier at {self.artifact_path}; using {self.default_mode} mode. "
+                                   f"Train it with python -m utils.intent_classifier")
+            self._checked = True
+        return self._pipeline
+
+    def predict(self, question: str) -> str:
+        """
+        Pick the tutor mode for a question
+
+        Args:
+            question (str): The student's question
+
+        Returns:
+            str: Tutor mode
+        """
+        try:
+            pipeline = self._pipeline if self._checked else self.load()
+            if pipeline is None:
+                return self.default_mode
+            probabilities = pipeline.predict_proba([question])[0]
+        except Exception as e:
+            logger.error(f"Error classifying intent: {str(e)}")
+            return self.default_mode
+
+        best = probabilities.argmax()
+        if probabilities[best] < self.min_confidence:
+            return self.default_mode
+        return pipeline.classes_[best]
+
+
+if __name__ == "__main__":
+    # Train the classifier offline
+    train_intent_classifier()
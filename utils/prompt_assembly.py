@@ -0,0 +1,112 @@
+from utils.prompt_templates import TutorPromptTemplates
+from utils.critical_thinking import CriticalThinkingFramework
+
+# Stop sequences that keep the model from writing the student's next turn
+TURN_STOP_SEQUENCES = ["\nStudent:", "\nUser:"]
+
+# Per-mode generation limits: short conceptual answers should not reserve 1024 tokens
+GENERATION_PROFILES = {
+    "general": {"num_predict": 512, "stop": TURN_STOP_SEQUENCES},
+    "concept_explanation": {"num_predict": 640, "stop": TURN_STOP_SEQUENCES},
+    "problem_solving": {"num_predict": 1024, "stop": TURN_STOP_SEQUENCES},
+    "critical_thinking": {"num_predict": 768, "stop": TURN_STOP_SEQUENCES},
+}
+
+
+class PromptAssembler:
+    """
+    Precompiled prompts for the Engineering Tutor.
+
+    Every mode x critical-thinking combination is assembled once, so each request
+    reuses the same string and Ollama sees a byte-identical prefix it can serve
+    from its prompt cache.
+    """
+
+    def __init__(self, templates=None, ct_framework=None):
+        """
+        Precompile system prompts and stage prompts
+
+        Args:
+            templates (TutorPromptTemplates, optional): Tutor prompt templates
+            ct_framework (CriticalThinkingFramework, optional): Critical thinking framework
+        """
+        self.templates = templates or TutorPromptTemplates()
+        self.ct_framework = ct_framework or CriticalThinkingFramework()
+
+        mode_prompts = {
+            "general": self.templates.general_tutor_prompt,
+            "concept_explanation": self.templates.concept_explanation_prompt,
+            "problem_solving": self.templates.problem_solving_prompt,
+            "critical_thinking": self.templates.critical_thinking_prompt,
+        }
+        ct_enhancement = self.ct_framework.get_enhancement_prompt()
+
+        self.system_prompts = {}
+        for mode, prompt in mode_prompts.items():
+            self.system_prompts[(mode, False)] = prompt
+            # The critical thinking prompt already covers the enhancement
+            if mode == "critical_thinking":
+                self.system_prompts[(mode, True)] = prompt
+            else:
+                self.system_prompts[(mode, True)] = f"{prompt}\n\n{ct_enhancement}"
+
+        self.stage_prompts = {
+            key: self.ct_framework.get_stage_prompt(key) for key in self.ct_framework.stages
+        }
+
+    @property
+    def modes(self):
+        """Available interaction modes"""
+        return sorted({mode for mode, _ in self.system_prompts})
+
+    def get_system_prompt(self, mode="general", include_critical_thinking=False) -> str:
+        """
+        Get the precompiled system prompt for a mode
+
+        Args:
+            mode (str): Interaction mode; unknown modes fall back to 'general'
+            include_critical_thinking (bool): Whether to include the critical thinking enhancement
+
+        Returns:
+            str: System prompt for the LLM
+        """
+        key = (mode, bool(include_critical_thinking))
+        if key not in self.system_prompts:
+            key = ("general", bool(include_critical_thinking))
+        return self.system_prompts[key]
+
+    def get_generation_options(self, mode="general") -> dict:
+        """
+        Get the generation budget and stop sequences for a mode
+
+        Args:
+            mode (str): Interaction mode; unknown modes fall back to 'general'
+
+        Returns:
+            dict: {"num_predict": int, "stop": list}
+        """
+        return GENERATION_PROFILES.get(mode, GENERATION_PROFILES["general"])
+
+    def get_stage_prompt(self, thinking_stage: str) -> str:
+        """Get the precompiled prompt for a critical thinking stage"""
+        stage_prompt = self.stage_prompts.get(thinking_stage.lower())
+        if stage_prompt is None:
+            return self.ct_framework.get_stage_prompt(thinking_stage)
+        return stage_prompt
+
+    def build_stage_context(self, problem: str, thinking_stage: str) -> str:
+        """
+        Build the user prompt for stage guidance
+
+        The problem comes first so that requests for different stages of the
+        same problem share the longest possible prefix.
+
+        Args:
+            problem (str): The problem or scenario to analyze
+            thinking_stage (str): Critical thinking stage key
+
+        Returns:
+            str: Prompt combining the problem and the stage guidance
+        """
+        stage = thinking_stage.lower()
+        return f"Problem: {problem}\n\nStage: {stage}\n\n{self.get_stage_prompt(stage)}"
@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any
+
+
+class RerunProfiler:
+    """
+    Opt-in timing of named sections of a Streamlit rerun.
+
+    Streamlit runs each session's script in its own thread, so the rerun in
+    progress is tracked per thread. Durations are kept in rolling windows per
+    section and per page; when profiling is disabled, section() costs one
+    attribute check.
+    """
+
+    def __init__(self, enabled=False, window=500):
+        """
+        Args:
+            enabled (bool): Whether sections are timed
+            window (int): Number of recent samples kept per section and per page
+        """
+        self.enabled = enabled
+        self.window = window
+        self.sections = {}
+        self.pages = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def rerun(self, page_getter):
+        """
+        Time a whole rerun
+
+        Args:
+            page_getter (callable): Returns the page that was rendered (read when the rerun ends)
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        self._local.active = True
+        try:
+            yield
+        finally:
+            self._local.active = False
+            self._record(self.pages, page_getter() or "unknown", time.perf_counter() - start)
+
+    @contextmanager
+    def section(self, name: str):
+        """
+        Time a named section of the current rerun
+
+        Args:
+            name (str): Section name, e.g. "load_css" or "dashboard.charts"
+        """
+        if not self.enabled or not getattr(self._local, "active", False):
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(self.sections, name, time.perf_counter() - start)
+
+    def _record(self, store, name, seconds):
+        with self._lock:
+            store.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    @staticmethod
+    def _summarize(samples) -> Dict[str, Any]:
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2)
+        }
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Rolling percentiles per section (slowest p95 first) and per page
+
+        Returns:
+            dict: {"sections": {name: stats}, "pages": {page: stats}}
+        """
+        with self._lock:
+            sections = {name: self._summarize(s) for name, s in self.sections.items() if s}
+            pages = {name: self._summarize(s) for name, s in self.pages.items() if s}
+        return {
+            "sections": dict(sorted(sections.items(), key=lambda item: item[1]["p95_ms"], reverse=True)),
+            "pages": pages
+        }
+
+    def reset(self):
+        """Drop all recorded samples"""
+        with self._lock:
+            self.sections.clear()
+            self.pages.clear()
+
+
+# Process-wide profiler shared by every session
+profiler = RerunProfiler(enabled=os.getenv("ENGE_AI_PROFILE_RERUNS", "0") == "1")
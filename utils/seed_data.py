@@ -0,0 +1,175 @@
+from types import MappingProxyType
+from typing import Any, MutableMapping
+
+
+def freeze(value: Any) -> Any:
+    """
+    Convert nested dicts and lists into read-only mapping proxies and tuples
+
+    Args:
+        value: Data built from dicts, lists and scalars
+
+    Returns:
+        Read-only equivalent of value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Convert frozen data back into plain mutable dicts and lists
+
+    Args:
+        value: Data returned by freeze
+
+    Returns:
+        Mutable deep copy of value
+    """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def is_frozen(value: Any) -> bool:
+    """Whether a value is shared, read-only seed data"""
+    return isinstance(value, (MappingProxyType, tuple))
+
+
+# Sample reference data, built once per process and shared read-only by every session
+SEED_DATA = freeze({
+    # Sample usage data for initial visualization
+    "usage_data": {
+        "daily_queries": [12, 18, 25, 15, 22, 30, 27],
+        "engagement_hours": [5.2, 8.4, 10.1, 6.8, 9.3, 12.5, 11.2],
+        "satisfaction": [4.2, 4.3, 4.5, 4.3, 4.6, 4.7, 4.5]
+    },
+    # Sample critical thinking assessment data
+    "critical_thinking_scores": {
+        "before": [65, 70, 58, 75, 62, 68, 72, 60, 73, 67],
+        "after": [78, 82, 75, 85, 76, 80, 84, 73, 86, 79]
+    },
+    # Sample critical thinking assessment questions
+    "assessment_questions": [
+        {
+            "id": 1,
+            "question": "A chemical plant is experiencing irregular pressure drops in a heat exchanger. What are the possible causes of this issue and how would you systematically investigate them?",
+            "dimension": "Problem Analysis",
+            "points": 10
+        },
+        {
+            "id": 2,
+            "question": "Compare and contrast the environmental impacts of using fossil fuels versus biofuels in industrial processes. What assumptions are you making in your comparison?",
+            "dimension": "Evaluation of Evidence",
+            "points": 10
+        },
+        {
+            "id": 3,
+            "question": "A startup claims their new catalyst improves reaction efficiency by 40%. How would you verify this claim and what additional information would you need?",
+            "dimension": "Inference and Reasoning",
+            "points": 10
+        },
+        {
+            "id": 4,
+            "question": "Design an experiment to determine the optimal operating temperature for a batch reactor. What control variables would you include and why?",
+            "dimension": "Experimental Design",
+            "points": 10
+        },
+        {
+            "id": 5,
+            "question": "How might advances in AI impact the role of chemical engineers in process design over the next decade? Support your answer with evidence.",
+            "dimension": "Future Implications",
+            "points": 10
+        }
+    ],
+    # Default system settings
+    "system_settings": {
+        "ai_model": "llama3.2",
+        "temperature": 0.7,
+        "max_tokens": 1024,
+        "critical_thinking_dimensions": [
+            "Problem Analysis",
+            "Evaluation of Evidence",
+            "Inference and Reasoning",
+            "Experimental Design",
+            "Future Implications"
+        ],
+        "database_connection": "mongodb://localhost:27017/",
+        "api_key": "sk-engai-xxxxxxxxxxxxxxxxxxxxx",
+        "backup_frequency": "Daily",
+        "feedback_collection": True
+    }
+})
+
+
+# Sample student assessment results, indexed into a shared read-only StudentStore by the app
+SEED_STUDENTS = freeze([
+    {
+        "student_id": "S001",
+        "name": "Alex Johnson",
+        "pre_score": 65,
+        "post_score": 78,
+        "improvement": 13,
+        "strongest_dimension": "Problem Analysis",
+        "weakest_dimension": "Future Implications",
+        "date_completed": "2025-02-15"
+    },
+    {
+        "student_id": "S002",
+        "name": "Taylor Smith",
+        "pre_score": 70,
+        "post_score": 82,
+        "improvement": 12,
+        "strongest_dimension": "Experimental Design",
+        "weakest_dimension": "Evaluation of Evidence",
+        "date_completed": "2025-02-16"
+    },
+    {
+        "student_id": "S003",
+        "name": "Jordan Williams",
+        "pre_score": 58,
+        "post_score": 75,
+        "improvement": 17,
+        "strongest_dimension": "Inference and Reasoning",
+        "weakest_dimension": "Problem Analysis",
+        "date_completed": "2025-02-18"
+    }
+])
+
+
+def seed_session(state: MutableMapping[str, Any]):
+    """
+    Point a session at the shared seed data for every field it does not have yet
+
+    Sessions hold references, not copies; a field is only copied into the
+    session when it is first edited through editable().
+
+    Args:
+        state (MutableMapping): Session state
+    """
+    for name, value in SEED_DATA.items():
+        if name not in state:
+            state[name] = value
+
+
+def editable(state: MutableMapping[str, Any], name: str) -> Any:
+    """
+    Get a session-owned, mutable version of a field, copying shared seed data on first write
+
+    Args:
+        state (MutableMapping): Session state
+        name (str): Field name, e.g. "assessment_questions"
+
+    Returns:
+        Mutable dicts and lists owned by this session
+    """
+    value = state[name]
+    if is_frozen(value):
+        value = thaw(value)
+        state[name] = value
+    return value
@@ -0,0 +1,76 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+logger = logging.getLogger("EngE-AI.sessions")
+
+
+class SessionStore:
+    """
+    Per-session state shared by a process-wide component, bounded in size and idle time.
+
+    Components cached with st.cache_resource outlive the browser sessions
+    that use them, so their per-session state would otherwise never be freed.
+    Sessions idle for longer than idle_timeout are dropped, and the least
+    recently used sessions are evicted beyond max_sessions.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_sessions=500, idle_timeout=3600):
+        """
+        Initialize the store
+
+        Args:
+            factory (callable): Builds the state of a new session
+            max_sessions (int): Sessions kept before the least recently used is evicted
+            idle_timeout (int): Seconds without access after which a session is dropped
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()  # session_id -> (last used timestamp, state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id: Hashable):
+        with self._lock:
+            self._expire(time.monotonic())
+            return session_id in self._sessions
+
+    def _expire(self, now: float):
+        """Drop idle sessions; called with the lock held"""
+        while self._sessions:
+            session_id, (last_used, _) = next(iter(self._sessions.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._sessions[session_id]
+            logger.debug(f"Dropped idle session state for {session_id}")
+
+    def get(self, session_id: Hashable) -> Any:
+        """State of a session, created on first use; every call counts as activity"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.pop(session_id, None)
+            state = entry[1] if entry is not None else self.factory()
+            self._sessions[session_id] = (now, state)
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                logger.info(f"Evicted session state for {evicted}")
+            return state
+
+    def peek(self, session_id: Hashable) -> Optional[Any]:
+        """State of a session if it is still held, without counting as activity"""
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._sessions.get(session_id)
+            return entry[1] if entry is not None else None
+
+    def pop(self, session_id: Hashable) -> Optional[Any]:
+        """Forget a session, returning its state if it was held"""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            return entry[1] if entry is not None else None
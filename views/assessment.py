@@ -0,0 +1,565 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+from views.shared import COURSE_TOPICS
+from utils.rerun_profiler import profiler
+from database.student_store import SORT_FIELDS
+from utils.seed_data import editable
+
+# Rows per page of the student results table
+STUDENT_PAGE_SIZE = 25
+
+# Matches offered by the student search
+STUDENT_SEARCH_LIMIT = 20
+
+# Column labels of the student results table
+STUDENT_COLUMNS = {
+    "student_id": "Student ID",
+    "name": "Name",
+    "pre_score": "Pre-Score",
+    "post_score": "Post-Score",
+    "improvement": "Improvement",
+    "strongest_dimension": "Strongest Area",
+    "weakest_dimension": "Needs Improvement",
+    "date_completed": "Completed"
+}
+
+
+# Critical Thinking Assessment interface
+def display_critical_thinking(grader, practice):
+    st.markdown("<div class='sub-header'>Critical Thinking Assessment</div>", unsafe_allow_html=True)
+
+    # Introduction card
+    st.markdown("""
+    <div class="card">
+        <h3 style="margin-top: 0;">Measure Critical Thinking Development</h3>
+        <p>Track and assess students' critical thinking skills across multiple dimensions. This tool helps measure the impact of EngE-AI on developing higher-order cognitive abilities.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Assessment tabs
+    tab1, tab2, tab3 = st.tabs(["Assessment Overview", "Question Bank", "Student Results"])
+
+    with tab1:
+        display_assessment_overview()
+
+    with tab2:
+        display_question_bank()
+
+    with tab3:
+        st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+        # Student results display
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+        # Sorted, filtered and paginated through the student store's indexes
+        display_student_table(st.session_state.student_store)
+
+        display_grading(grader)
+        display_practice(practice)
+        display_student_detail(st.session_state.student_store)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Sample scores for each configured dimension, repeated or trimmed to match the dimension count
+def sample_dimension_scores(dimensions, scores):
+    return [scores[i % len(scores)] for i in range(len(dimensions))]
+
+
+# Cohort score comparison and dimension breakdown charts
+def display_assessment_overview():
+    st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+    # Summary metrics
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">15.2%</div>
+            <div class="metric-label">Average Score Improvement</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">78.5</div>
+            <div class="metric-label">Average Post-Assessment Score</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">82%</div>
+            <div class="metric-label">Students Showing Improvement</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Score distribution chart
+    st.markdown("<div class='card' style='margin-top: 20px;'>", unsafe_allow_html=True)
+
+    # Create data frame for pre and post scores
+    scores_df = pd.DataFrame({
+        'Student': [f'S{i:03d}' for i in range(1, 11)],
+        'Pre-Assessment': st.session_state.critical_thinking_scores['before'],
+        'Post-Assessment': st.session_state.critical_thinking_scores['after']
+    })
+
+    # Calculate improvement
+    scores_df['Improvement'] = scores_df['Post-Assessment'] - scores_df['Pre-Assessment']
+
+    # Melt the dataframe for easier plotting
+    scores_long = pd.melt(
+        scores_df,
+        id_vars=['Student'],
+        value_vars=['Pre-Assessment', 'Post-Assessment'],
+        var_name='Assessment',
+        value_name='Score'
+    )
+
+    # Plot score distribution
+    with profiler.section("assessment.charts"):
+        fig = px.bar(
+            scores_long,
+            x='Student',
+            y='Score',
+            color='Assessment',
+            barmode='group',
+            color_discrete_map={'Pre-Assessment': '#BFDBFE', 'Post-Assessment': '#3B82F6'},
+            labels={'Score': 'Critical Thinking Score', 'Student': 'Student ID'},
+            height=400
+        )
+
+        fig.update_layout(
+            title="Pre & Post Assessment Score Comparison",
+            margin=dict(l=20, r=20, t=40, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#1E293B'),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Dimension breakdown chart
+    st.markdown("<div class='card' style='margin-top: 20px;'>", unsafe_allow_html=True)
+
+    # Sample data for dimension breakdown
+    dimensions = st.session_state.system_settings['critical_thinking_dimensions']
+    pre_scores = sample_dimension_scores(dimensions, [65, 62, 70, 64, 68])
+    post_scores = sample_dimension_scores(dimensions, [78, 75, 82, 76, 80])
+
+    # Create dataframe for dimensions
+    dim_df = pd.DataFrame({
+        'Dimension': dimensions,
+        'Pre-Assessment': pre_scores,
+        'Post-Assessment': post_scores
+    })
+
+    # Calculate improvement for each dimension
+    dim_df['Improvement'] = dim_df['Post-Assessment'] - dim_df['Pre-Assessment']
+
+    # Create radar chart
+    with profiler.section("assessment.charts"):
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatterpolar(
+            r=dim_df['Pre-Assessment'],
+            theta=dim_df['Dimension'],
+            fill='toself',
+            name='Pre-Assessment',
+            line_color='#BFDBFE',
+            fillcolor='rgba(191, 219, 254, 0.5)'
+        ))
+
+        fig.add_trace(go.Scatterpolar(
+            r=dim_df['Post-Assessment'],
+            theta=dim_df['Dimension'],
+            fill='toself',
+            name='Post-Assessment',
+            line_color='#3B82F6',
+            fillcolor='rgba(59, 130, 246, 0.5)'
+        ))
+
+        fig.update_layout(
+            title="Critical Thinking by Dimension",
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[50, 100]
+                )
+            ),
+            height=450,
+            margin=dict(l=20, r=20, t=40, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#1E293B'),
+            showlegend=True,
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Question bank, assessment creation and guidance precomputation
+def display_question_bank():
+    st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+    # Question bank display
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    # Add new question form
+    with st.expander("Add New Assessment Question"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            new_question = st.text_area("Question", placeholder="Enter question text...")
+            dimension = st.selectbox("Critical Thinking Dimension", st.session_state.system_settings["critical_thinking_dimensions"])
+
+        with col2:
+            points = st.number_input("Points", min_value=1, max_value=20, value=10)
+            criteria = st.text_area("Grading Criteria", placeholder="Enter grading criteria...")
+
+        if st.button("Add Question to Bank"):
+            if new_question.strip():
+                # The first edit copies the shared seed question bank into this session
+                questions = editable(st.session_state, "assessment_questions")
+                question = {"id": max((q["id"] for q in questions), default=0) + 1,
+                            "question": new_question.strip(), "dimension": dimension, "points": int(points)}
+                if criteria.strip():
+                    question["grading_criteria"] = criteria.strip()
+                questions.append(question)
+                st.success("Question added successfully!")
+            else:
+                st.warning("Enter the question text first.")
+
+    # Display existing questions
+    st.markdown("<p style='font-weight: 500; font-size: 1.1rem; margin-top: 20px;'>Existing Assessment Questions</p>", unsafe_allow_html=True)
+
+    for q in st.session_state.assessment_questions:
+        st.markdown(f"""
+        <div style="border: 1px solid #E2E8F0; border-radius: 8px; padding: 15px; margin-bottom: 15px;">
+            <div style="display: flex; justify-content: space-between;">
+                <div style="font-weight: 500;">Question {q['id']}</div>
+                <div style="color: #3B82F6;">{q['dimension']} • {q['points']} points</div>
+            </div>
+            <div style="margin-top: 10px;">{q['question']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Assessment creation
+    st.markdown("<div style='margin-top: 30px;'>", unsafe_allow_html=True)
+    st.markdown("<p style='font-weight: 500; font-size: 1.1rem;'>Create Assessment</p>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.text_input("Assessment Name", "Critical Thinking Assessment - March 2025")
+        st.multiselect("Select Questions", [f"Q{q['id']}: {q['question'][:50]}..." for q in st.session_state.assessment_questions], default=[f"Q{q['id']}: {q['question'][:50]}..." for q in st.session_state.assessment_questions[:3]])
+
+    with col2:
+        st.selectbox("Target Course", [st.session_state.selected_course] + ["CHBE 241 - Material and Energy Balances", "CHBE 262 - Environmental Engineering"])
+        st.number_input("Time Limit (minutes)", min_value=30, max_value=180, value=60, step=15)
+
+    if st.button("Create Assessment", use_container_width=True):
+        st.success("Assessment created successfully!")
+
+    # Stage hints for the question bank and saved scenarios are served from the guidance cache
+    if st.button("Precompute Stage Guidance", use_container_width=True):
+        problems = [q["question"] for q in st.session_state.assessment_questions]
+        bank = st.session_state.scenario_gen.scenario_bank
+        if bank is not None:
+            problems += [s["scenario_text"] for s in bank.find(limit=50)]
+        with st.spinner("Generating guidance for every problem and stage..."):
+            report = st.session_state.tutor.precompute_guidance(problems, prune=True)
+        st.success(f"Stage guidance ready: {report['generated']} generated, {report['cached']} already cached, "
+                   f"{report['failed']} failed ({report['elapsed_seconds']} s)")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Auto-grade written responses for the cohort
+def display_grading(grader):
+    with st.expander("Grade Written Responses"):
+        st.markdown("Upload a CSV with `student_id`, `question_id`, `answer` and optionally `phase` (`pre` or `post`). "
+                    "Unchanged answers are served from the grade cache, so an interrupted batch can simply be re-run.")
+        responses_file = st.file_uploader("Student Responses", type=["csv"])
+
+        if responses_file is not None and st.button("Grade Responses", use_container_width=True):
+            responses_df = pd.read_csv(responses_file)
+            questions = {q["id"]: q for q in st.session_state.assessment_questions}
+            submissions = [
+                {
+                    "student_id": str(row["student_id"]),
+                    "question": questions[row["question_id"]],
+                    "answer": str(row["answer"]),
+                    "phase": row.get("phase", "post") if isinstance(row.get("phase"), str) else "post"
+                }
+                for _, row in responses_df.iterrows() if row["question_id"] in questions
+            ]
+
+            progress = st.progress(0.0)
+            batch = grader.grade_cohort(
+                submissions,
+                progress_callback=lambda done, total: progress.progress(done / total)
+            )
+
+            col1, col2, col3, col4, col5 = st.columns(5)
+            col1.metric("LLM Graded", batch["graded"])
+            col2.metric("Pre-scored", batch["prescored"], f"{batch['llm_call_reduction']:.0%} fewer LLM calls")
+            col3.metric("From Cache", batch["cached"])
+            col4.metric("Failed", batch["failed"])
+            col5.metric("Responses / min", batch["responses_per_minute"])
+
+            # LLM grades become exemplars; recalibrate the pre-score confidence threshold on them
+            if batch["graded"]:
+                calibration = grader.prescorer.calibrate(batch["results"])
+                if calibration["samples"]:
+                    st.caption(f"Pre-score threshold {calibration['threshold']:.3f}: "
+                               f"{calibration['coverage']:.0%} of held-out answers pre-scored "
+                               f"at {calibration['accuracy'] or 0:.0%} agreement with the LLM")
+
+            # Replace the sample scores with the graded ones; the shared store is copied on first write
+            store = st.session_state.student_store
+            if store.read_only:
+                store = store.copy()
+            for summary in grader.summarize_students(batch["results"]):
+                record = dict(store.get(summary["student_id"]) or {
+                    "student_id": summary["student_id"],
+                    "name": summary["student_id"],
+                    "date_completed": datetime.now().strftime("%Y-%m-%d")
+                })
+                record.update({k: v for k, v in summary.items() if v is not None})
+                store.upsert(record)
+            st.session_state.student_store = store
+            st.success(f"Graded {len(submissions)} responses in {batch['elapsed_seconds']} s")
+
+
+# Shared practice pools per (course, weakest dimension, difficulty) group
+def display_practice(practice):
+    with st.expander("Personalized Practice"):
+        practice.time_budget = st.number_input("Time Budget (seconds)", min_value=30, max_value=3600,
+                                               value=int(practice.time_budget), step=30)
+
+        if st.button("Generate Practice for Cohort", use_container_width=True):
+            with st.spinner("Generating practice scenarios for each student group..."):
+                run = practice.run(list(st.session_state.student_store),
+                                   course=st.session_state.selected_course, topics=COURSE_TOPICS)
+            st.session_state.practice_assignments = run["assignments"]
+
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Students", run["students"])
+            col2.metric("Groups", run["groups"])
+            col3.metric("Scenarios Generated", run["scenarios_generated"])
+            col4.metric("Seconds", run["elapsed_seconds"])
+            if run["unassigned"]:
+                st.warning(f"Time budget ran out before {len(run['unassigned'])} students got a scenario")
+
+
+# Individual student detailed view
+def display_student_detail(store):
+    st.markdown("<p style='font-weight: 500; font-size: 1.1rem; margin-top: 20px;'>Student Detailed View</p>", unsafe_allow_html=True)
+
+    # Typeahead search instead of a selectbox over the whole cohort
+    query = st.text_input("Search Student", placeholder="Type a student ID or name...")
+    matches = store.search(query, limit=STUDENT_SEARCH_LIMIT) if query else store.page(limit=STUDENT_SEARCH_LIMIT)[1]
+    selected_student = st.selectbox("Select Student", [f"{s['student_id']} - {s['name']}" for s in matches])
+    if not matches:
+        st.caption("No students match your search.")
+
+    # Get student details
+    student_data = store.get(selected_student.split(" - ")[0]) if selected_student else None
+
+    if student_data:
+        # Student performance chart
+        dimensions = st.session_state.system_settings["critical_thinking_dimensions"]
+
+        # Sample dimension scores for the selected student
+        pre_dim_scores = sample_dimension_scores(dimensions, [65, 60, 70, 62, 68])
+        post_dim_scores = sample_dimension_scores(dimensions, [78, 75, 80, 76, 82])
+
+        # Create a dataframe for the student's dimension scores
+        student_dims = pd.DataFrame({
+            "Dimension": dimensions,
+            "Pre-Assessment": pre_dim_scores,
+            "Post-Assessment": post_dim_scores
+        })
+
+        # Calculate improvement
+        student_dims["Improvement"] = student_dims["Post-Assessment"] - student_dims["Pre-Assessment"]
+
+        # Create bar chart
+        with profiler.section("assessment.charts"):
+            fig = go.Figure()
+
+            fig.add_trace(go.Bar(
+                x=student_dims["Dimension"],
+                y=student_dims["Pre-Assessment"],
+                name="Pre-Assessment",
+                marker_color="#BFDBFE"
+            ))
+
+            fig.add_trace(go.Bar(
+                x=student_dims["Dimension"],
+                y=student_dims["Post-Assessment"],
+                name="Post-Assessment",
+                marker_color="#3B82F6"
+            ))
+
+            fig.update_layout(
+                title=f"Critical Thinking Development: {student_data['name']}",
+                barmode="group",
+                height=400,
+                margin=dict(l=20, r=20, t=40, b=20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#1E293B'),
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                )
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Student feedback and recommendations
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("<div style='border: 1px solid #E2E8F0; border-radius: 8px; padding: 15px;'>", unsafe_allow_html=True)
+            st.markdown("<p style='font-weight: 500; margin-bottom: 10px;'>Strengths</p>", unsafe_allow_html=True)
+            st.markdown(f"""
+            <ul style='margin-top: 0; padding-left: 20px;'>
+                <li>Strong performance in {student_data['strongest_dimension']} with score improvement of {max(student_dims['Improvement']):.1f} points</li>
+                <li>Overall score improvement of {student_data['improvement']} points (20% increase)</li>
+                <li>Effective application of theoretical concepts to practical scenarios</li>
+            </ul>
+            """, unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("<div style='border: 1px solid #E2E8F0; border-radius: 8px; padding: 15px;'>", unsafe_allow_html=True)
+            st.markdown("<p style='font-weight: 500; margin-bottom: 10px;'>Areas for Growth</p>", unsafe_allow_html=True)
+            st.markdown(f"""
+            <ul style='margin-top: 0; padding-left: 20px;'>
+                <li>Additional practice needed in {student_data['weakest_dimension']}</li>
+                <li>More focus on identifying assumptions and biases in problem statements</li>
+                <li>Further development of interdisciplinary connections</li>
+            </ul>
+            """, unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # Recommendations
+        st.markdown("<div style='margin-top: 15px; border: 1px solid #E2E8F0; border-radius: 8px; padding: 15px;'>", unsafe_allow_html=True)
+        st.markdown("<p style='font-weight: 500; margin-bottom: 10px;'>Recommended Activities</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"""
+            <div style="margin-bottom: 10px;">
+                <div style="font-weight: 500;">Virtual Tutor Sessions</div>
+                <div style="font-size: 0.9rem; color: #64748B;">3 sessions focused on {student_data['weakest_dimension']}</div>
+            </div>
+
+            <div style="margin-bottom: 10px;">
+                <div style="font-weight: 500;">Interactive Case Studies</div>
+                <div style="font-size: 0.9rem; color: #64748B;">Waste heat recovery in chemical plants</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("""
+            <div style="margin-bottom: 10px;">
+                <div style="font-weight: 500;">Practice Scenarios</div>
+                <div style="font-size: 0.9rem; color: #64748B;">4 scenarios with focused feedback</div>
+            </div>
+
+            <div>
+                <div style="font-weight: 500;">Peer Collaboration</div>
+                <div style="font-size: 0.9rem; color: #64748B;">Group problem-solving with other students</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        assigned = st.session_state.get("practice_assignments", {}).get(student_data["student_id"])
+        if assigned:
+            with st.expander("Assigned Practice Scenario"):
+                st.markdown(assigned["scenario_text"])
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Student results table; only the current page is read from the store and rendered
+def display_student_table(store):
+    col1, col2, col3, col4 = st.columns([2, 1, 2, 2])
+    with col1:
+        sort_label = st.selectbox("Sort By", ["Added"] + [STUDENT_COLUMNS[field] for field in SORT_FIELDS],
+                                  key="student_sort")
+    with col2:
+        descending = st.toggle("Descending", value=True, key="student_descending")
+    with col3:
+        score_range = st.slider("Score Range", min_value=-100, max_value=100, value=(-100, 100),
+                                key="student_score_range", disabled=sort_label == "Added",
+                                help="Applies to the sort column")
+    with col4:
+        dimensions = st.session_state.system_settings["critical_thinking_dimensions"]
+        dimension = st.selectbox("Needs Improvement", ["All"] + list(dimensions), key="student_dimension")
+
+    sort_by = next((field for field in SORT_FIELDS if STUDENT_COLUMNS[field] == sort_label), None)
+    filters = (sort_label, descending, score_range, dimension)
+    if st.session_state.get("student_filters") != filters:
+        st.session_state.student_filters = filters
+        st.session_state.student_page = 1
+
+    # Score bounds only narrow the sorted index when they differ from the full range
+    bounded = sort_by is not None and score_range != (-100, 100)
+    total, rows = store.page(offset=(st.session_state.get("student_page", 1) - 1) * STUDENT_PAGE_SIZE,
+                             limit=STUDENT_PAGE_SIZE, sort_by=sort_by, descending=descending,
+                             min_value=score_range[0] if bounded else None,
+                             max_value=score_range[1] if bounded else None,
+                             dimension=None if dimension == "All" else dimension)
+    st.dataframe(
+        pd.DataFrame(rows, columns=list(STUDENT_COLUMNS)),
+        column_config={
+            **STUDENT_COLUMNS,
+            "improvement": st.column_config.NumberColumn(
+                "Improvement",
+                format="%.1f ↑",
+            )
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        pages = max(1, (total - 1) // STUDENT_PAGE_SIZE + 1)
+        st.number_input("Page", min_value=1, max_value=pages, key="student_page")
+    with col2:
+        st.caption(f"Page {st.session_state.student_page} of {pages} ({total} students)")
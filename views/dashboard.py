@@ -0,0 +1,289 @@
+import streamlit as st
+import plotly.graph_objects as go
+from datetime import datetime
+from utils.rerun_profiler import profiler
+
+
+# Dashboard overview page
+def display_dashboard():
+    st.markdown("<div class='sub-header'>EngE-AI System Overview</div>", unsafe_allow_html=True)
+
+    # Key metrics in cards
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">254</div>
+            <div class="metric-label">Student Users</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">1,423</div>
+            <div class="metric-label">Tutor Interactions</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">87</div>
+            <div class="metric-label">Scenarios Generated</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-value">4.7</div>
+            <div class="metric-label">Avg. Satisfaction (1-5)</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Usage charts
+    st.markdown("<div class='sub-header'>System Usage Analytics</div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+        dates = [datetime.now().strftime("%b %d") for _ in range(7)]
+
+        # Daily usage chart
+        with profiler.section("dashboard.charts"):
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=st.session_state.usage_data['daily_queries'],
+                mode='lines+markers',
+                name='Queries',
+                line=dict(color='#2563EB', width=3),
+                marker=dict(size=8, color='#1E40AF')
+            ))
+
+            fig.update_layout(
+                title="Daily Tutor Interactions",
+                xaxis_title="Date",
+                yaxis_title="Number of Queries",
+                height=350,
+                margin=dict(l=20, r=20, t=40, b=20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#1E293B')
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+        # Critical thinking improvement chart
+        with profiler.section("dashboard.charts"):
+            fig = go.Figure()
+
+            before = st.session_state.critical_thinking_scores['before']
+            after = st.session_state.critical_thinking_scores['after']
+
+            # Calculate average improvement
+            avg_before = sum(before) / len(before)
+            avg_after = sum(after) / len(after)
+            improvement = round(((avg_after - avg_before) / avg_before) * 100, 1)
+
+            fig.add_trace(go.Box(
+                y=before,
+                name='Before EngE-AI',
+                marker_color='#BFDBFE',
+                boxmean=True
+            ))
+
+            fig.add_trace(go.Box(
+                y=after,
+                name='After EngE-AI',
+                marker_color='#3B82F6',
+                boxmean=True
+            ))
+
+            fig.update_layout(
+                title=f"Critical Thinking Assessment Scores (↑ {improvement}%)",
+                yaxis_title="Score",
+                height=350,
+                margin=dict(l=20, r=20, t=40, b=20),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#1E293B')
+            )
+
+            st.plotly_chart(fig, use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # Course engagement section
+    st.markdown("<div class='sub-header'>Course Engagement by Module</div>", unsafe_allow_html=True)
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    # Course modules and their engagement data
+    modules = [
+        "Module 1: Fundamentals",
+        "Module 2: First Law",
+        "Module 3: Second Law",
+        "Module 4: Phase Equilibria",
+        "Module 5: Reaction Equilibria"
+    ]
+
+    engagement = [85, 92, 78, 65, 70]
+    tutor_usage = [120, 145, 105, 90, 80]
+    scenarios = [12, 15, 8, 7, 6]
+
+    # Create course engagement chart
+    with profiler.section("dashboard.charts"):
+        fig = go.Figure()
+
+        fig.add_trace(go.Bar(
+            x=modules,
+            y=engagement,
+            name='Student Engagement (%)',
+            marker_color='#3B82F6'
+        ))
+
+        fig.add_trace(go.Bar(
+            x=modules,
+            y=tutor_usage,
+            name='Tutor Interactions',
+            marker_color='#60A5FA',
+            visible='legendonly'
+        ))
+
+        fig.add_trace(go.Bar(
+            x=modules,
+            y=scenarios,
+            name='Scenarios Generated',
+            marker_color='#93C5FD',
+            visible='legendonly'
+        ))
+
+        fig.update_layout(
+            barmode='group',
+            height=400,
+            margin=dict(l=20, r=20, t=20, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#1E293B'),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    # Recent activity and system status
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("<div class='sub-header'>Recent Activity</div>", unsafe_allow_html=True)
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+        # Sample recent activities
+        activities = [
+            {"time": "10:23 AM", "user": "Student 173", "action": "Completed a critical thinking exercise in Module 3"},
+            {"time": "09:48 AM", "user": "Prof. Johnson", "action": "Generated 3 new scenario problems for Module 2"},
+            {"time": "09:15 AM", "user": "Student 042", "action": "Asked 5 questions about phase equilibria concepts"},
+            {"time": "Yesterday", "user": "Student 108", "action": "Improved critical thinking score by 18%"},
+            {"time": "Yesterday", "user": "Prof. Chen", "action": "Updated system prompts for thermodynamics tutor"}
+        ]
+
+        for activity in activities:
+            st.markdown(f"""
+            <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                <div style="color: #64748B; width: 80px;">{activity['time']}</div>
+                <div style="font-weight: 500; width: 120px;">{activity['user']}</div>
+                <div style="flex-grow: 1;">{activity['action']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("<div class='sub-header'>System Status</div>", unsafe_allow_html=True)
+        st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+        # System status metrics
+        st.markdown("""
+        <div style="margin-bottom: 15px;">
+            <div style="display: flex; justify-content: space-between;">
+                <div>AI Model</div>
+                <div style="font-weight: 500; color: #10B981;">Active</div>
+            </div>
+            <div style="font-size: 0.9rem; color: #64748B;">llama2-7b</div>
+        </div>
+
+        <div style="margin-bottom: 15px;">
+            <div style="display: flex; justify-content: space-between;">
+                <div>Response Time</div>
+                <div style="font-weight: 500; color: #10B981;">2.4s avg</div>
+            </div>
+            <div style="font-size: 0.9rem; color: #64748B;">Last 24 hours</div>
+        </div>
+
+        <div style="margin-bottom: 15px;">
+            <div style="display: flex; justify-content: space-between;">
+                <div>System Load</div>
+                <div style="font-weight: 500; color: #10B981;">32%</div>
+            </div>
+            <div style="font-size: 0.9rem; color: #64748B;">Normal operation</div>
+        </div>
+
+        <div style="margin-bottom: 15px;">
+            <div style="display: flex; justify-content: space-between;">
+                <div>Database</div>
+                <div style="font-weight: 500; color: #10B981;">Connected</div>
+            </div>
+            <div style="font-size: 0.9rem; color: #64748B;">Last sync: 5 min ago</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        if 'ollama_manager' in st.session_state:
+            load_report = st.session_state.ollama_manager.keep_alive_manager.get_load_report()
+            st.markdown(f"""
+            <div style="margin-bottom: 15px;">
+                <div style="display: flex; justify-content: space-between;">
+                    <div>Model Loads</div>
+                    <div style="font-weight: 500; color: #10B981;">{load_report['warm']} warm / {load_report['cold']} cold</div>
+                </div>
+                <div style="font-size: 0.9rem; color: #64748B;">Cold-load ratio: {load_report['cold_ratio']:.0%}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            routing = st.session_state.tutor.router.get_report() if st.session_state.tutor.router else None
+            if routing:
+                routed = routing['small']['routed'] + routing['large']['routed']
+                p50 = routing['small']['p50_latency']
+                st.markdown(f"""
+                <div style="margin-bottom: 15px;">
+                    <div style="display: flex; justify-content: space-between;">
+                        <div>Model Routing</div>
+                        <div style="font-weight: 500; color: #10B981;">{routing['small']['hit_rate']:.0%} small tier</div>
+                    </div>
+                    <div style="font-size: 0.9rem; color: #64748B;">{routed} routed, {routing['small']['escalated']} escalated{f", small p50 {p50:.1f}s" if p50 is not None else ""}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            nodes = st.session_state.ollama_manager.pool.get_status()
+            healthy = sum(1 for node in nodes if node['healthy'])
+            st.markdown(f"""
+            <div style="margin-bottom: 15px;">
+                <div style="display: flex; justify-content: space-between;">
+                    <div>Inference Nodes</div>
+                    <div style="font-weight: 500; color: {'#10B981' if healthy == len(nodes) else '#F59E0B'};">{healthy}/{len(nodes)} healthy</div>
+                </div>
+                <div style="font-size: 0.9rem; color: #64748B;">{sum(node['outstanding'] for node in nodes)} requests in flight</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,255 @@
+import streamlit as st
+from views.shared import COURSE_TOPICS
+from models.scenario_generator import ScenarioGenerationError
+
+# Scenario headers shown per page of the generated scenarios list
+SCENARIO_PAGE_SIZE = 10
+
+
+# Scenario Generator interface
+def display_scenario_generator(scenario_gen):
+    st.markdown("<div class='sub-header'>Engineering Scenario Generator</div>", unsafe_allow_html=True)
+
+    # Introduction card
+    st.markdown("""
+    <div class="card">
+        <h3 style="margin-top: 0;">Create Real-World Engineering Scenarios</h3>
+        <p>Generate contextually rich, realistic engineering problems that promote critical thinking and connect abstract concepts to practical applications. These scenarios can be directly incorporated into course materials, assignments, or exams.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Scenario generator controls
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("<p style='font-weight: 500;'>Scenario Parameters</p>", unsafe_allow_html=True)
+
+        # Get topics based on selected course
+        selected_course = st.session_state.selected_course
+        topics = COURSE_TOPICS.get(selected_course, COURSE_TOPICS["CHBE 220 - Chemical Engineering Thermodynamics"])
+
+        topic = st.selectbox("Topic Area", topics)
+
+        # Difficulty level
+        difficulty = st.select_slider(
+            "Difficulty Level",
+            options=["Introductory", "Intermediate", "Challenging", "Advanced"],
+            value="Intermediate"
+        )
+
+        # Problem type
+        problem_type = st.radio(
+            "Problem Type",
+            ["Conceptual Understanding", "Numerical Analysis", "Design Challenge", "Case Study"]
+        )
+
+        # Industry context
+        industry = st.selectbox(
+            "Industry Context",
+            ["Oil & Gas", "Pharmaceuticals", "Food Processing", "Environmental", "Materials Science", "Biotechnology"]
+        )
+
+    with col2:
+        st.markdown("<p style='font-weight: 500;'>Learning Objectives</p>", unsafe_allow_html=True)
+
+        # Learning objectives and skills to target
+        critical_thinking = st.checkbox("Promote Critical Thinking", value=True)
+        problem_solving = st.checkbox("Enhance Problem-Solving", value=True)
+        real_world = st.checkbox("Connect to Real-World Applications", value=True)
+        interdisciplinary = st.checkbox("Encourage Interdisciplinary Thinking", value=False)
+
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Output Format</p>", unsafe_allow_html=True)
+
+        # Output format options
+        include_solution = st.checkbox("Include Detailed Solution", value=True)
+        include_rubric = st.checkbox("Include Grading Rubric", value=False)
+        include_variations = st.checkbox("Generate Problem Variations", value=False)
+
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Additional Instructions (Optional)</p>",
+                    unsafe_allow_html=True)
+
+        # Custom instructions
+        custom_instructions = st.text_area("",
+                                           placeholder="Any specific requirements or constraints for the scenario...")
+
+        # Scenarios already served to this instructor are not served again from the bank
+        instructor = st.text_input("Instructor", value=st.session_state.instructor_id,
+                                   help="Scenarios you have already been served are skipped").strip()
+        if instructor and instructor != st.session_state.instructor_id:
+            st.session_state.instructor_id = instructor
+            # Kept in the URL so it survives reloads
+            st.query_params["instructor"] = instructor
+
+    # Generate button
+    if st.button("Generate Engineering Scenario", use_container_width=True):
+        with st.spinner("Creating engineering scenario... This may take a moment."):
+            # Construct additional instructions from the remaining parameters
+            objectives = ', '.join([obj for obj, checked in zip(["Promote Critical Thinking", "Enhance Problem-Solving", "Connect to Real-World Applications", "Encourage Interdisciplinary Thinking"], [critical_thinking, problem_solving, real_world, interdisciplinary]) if checked])
+            includes = ', '.join([item for item, checked in zip(["Detailed Solution", "Grading Rubric", "Problem Variations"], [include_solution, include_rubric, include_variations]) if checked])
+            instructions = f"""
+            Course: {st.session_state.selected_course}
+            Learning Objectives: {objectives}
+            Include: {includes}
+            {custom_instructions}
+            """
+
+            try:
+                if custom_instructions.strip():
+                    # Custom requirements always need a fresh scenario from the model
+                    scenario = scenario_gen.generate_scenario(
+                        topic=topic,
+                        difficulty=difficulty,
+                        scenario_type=problem_type,
+                        industry_context=industry,
+                        structured=True,
+                        additional_instructions=instructions,
+                        model=st.session_state.model_name
+                    )
+                else:
+                    # Standard requests are served from the scenario bank when possible
+                    scenario = scenario_gen.get_scenario(
+                        topic=topic,
+                        difficulty=difficulty,
+                        scenario_type=problem_type,
+                        industry_context=industry,
+                        instructor_id=st.session_state.instructor_id,
+                        structured=True,
+                        additional_instructions=instructions,
+                        model=st.session_state.model_name
+                    )
+            except ScenarioGenerationError as e:
+                st.error(f"The scenario could not be generated: {str(e)}")
+            else:
+                if scenario.get("duplicate_of"):
+                    st.warning("This scenario is a near-duplicate of one already in the scenario bank.")
+
+                # Only the id is kept in the session; content is loaded from the scenario bank when opened
+                scenario_id = scenario.get("id") or scenario.get("duplicate_of")
+                if scenario_id:
+                    if scenario_id in st.session_state.scenarios:
+                        st.session_state.scenarios.remove(scenario_id)
+                    st.session_state.scenarios.append(scenario_id)
+                    st.session_state.open_scenario = scenario_id
+                    st.session_state.scenario_page = 0
+                else:
+                    st.warning("The scenario could not be saved to the scenario bank.")
+                    render_scenario(scenario)
+
+    # Display previously generated scenarios
+    if st.session_state.scenarios and scenario_gen.scenario_bank is not None:
+        display_scenario_list(scenario_gen.scenario_bank)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Paginated, searchable list of the session's scenarios; only the opened one is loaded in full
+def display_scenario_list(bank):
+    st.markdown("<div style='margin-top: 30px;'>", unsafe_allow_html=True)
+    st.markdown("<p style='font-weight: 500; font-size: 1.2rem;'>Generated Scenarios</p>", unsafe_allow_html=True)
+
+    scenario_ids = filter_scenario_ids(bank)
+    if not scenario_ids:
+        st.info("No scenarios match your search.")
+        st.markdown("</div>", unsafe_allow_html=True)
+        return
+
+    pages = (len(scenario_ids) - 1) // SCENARIO_PAGE_SIZE + 1
+    page = min(st.session_state.get("scenario_page", 0), pages - 1)
+    page_ids = scenario_ids[page * SCENARIO_PAGE_SIZE:(page + 1) * SCENARIO_PAGE_SIZE]
+    headers = bank.headers(page_ids)
+
+    for scenario_id in page_ids:
+        if scenario_id in headers:
+            render_scenario_row(bank, headers[scenario_id])
+
+    if pages > 1:
+        render_scenario_pagination(page, pages, len(scenario_ids))
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+# Session scenario ids, newest first, narrowed by the search box
+def filter_scenario_ids(bank):
+    query = st.text_input("Search scenarios", key="scenario_search",
+                          placeholder="Filter by topic, industry or scenario text...").strip()
+    if query != st.session_state.get("scenario_search_last", ""):
+        st.session_state.scenario_search_last = query
+        st.session_state.scenario_page = 0
+
+    scenario_ids = st.session_state.scenarios[::-1]
+    if query:
+        matches = bank.search_ids(scenario_ids, query)
+        scenario_ids = [scenario_id for scenario_id in scenario_ids if scenario_id in matches]
+    return scenario_ids
+
+
+# One scenario header with its Open/Close toggle; the scenario itself is loaded only when open
+def render_scenario_row(bank, header):
+    scenario_id = header["id"]
+    is_open = st.session_state.get("open_scenario") == scenario_id
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.markdown(f"**{header['topic']} - {header['difficulty']}** "
+                    f"({header['created_at'][:16].replace('T', ' ')})")
+    with col2:
+        if st.button("Close" if is_open else "Open", key=f"open_{scenario_id}", use_container_width=True):
+            st.session_state.open_scenario = None if is_open else scenario_id
+            st.rerun()
+
+    if not is_open:
+        return
+    scenario = bank.get(scenario_id)
+    if scenario is None:
+        st.warning("This scenario is no longer in the scenario bank.")
+        return
+    render_scenario(scenario)
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if st.button("Export as PDF", key=f"export_{scenario_id}"):
+            st.info("Export functionality would be implemented here.")
+    with col2:
+        if st.button("Save to Database", key=f"save_{scenario_id}"):
+            st.success("Scenario saved to database.")
+
+
+# Previous/Next controls for the scenario list
+def render_scenario_pagination(page, pages, total):
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("Previous", disabled=page == 0, use_container_width=True):
+            st.session_state.scenario_page = page - 1
+            st.rerun()
+    with col2:
+        st.markdown(f"<p style='text-align: center;'>Page {page + 1} of {pages} "
+                    f"({total} scenarios)</p>", unsafe_allow_html=True)
+    with col3:
+        if st.button("Next", disabled=page == pages - 1, use_container_width=True):
+            st.session_state.scenario_page = page + 1
+            st.rerun()
+
+
+# Render one scenario's details and content
+def render_scenario(scenario):
+    metadata = scenario.get("metadata", {})
+    st.markdown(f"**Industry Context:** {metadata.get('industry')}")
+    st.markdown(f"**Problem Type:** {metadata.get('type')}")
+    if scenario.get('sections'):
+        render_scenario_sections(scenario['sections'])
+    else:
+        st.markdown(scenario['scenario_text'])
+
+
+# Render a structured scenario section by section
+def render_scenario_sections(sections):
+    st.markdown(f"#### {sections['title']}")
+    st.markdown("**Context**")
+    st.markdown(sections['context'])
+    st.markdown("**Problem Statement**")
+    st.markdown(sections['problem_statement'])
+    st.markdown("**Available Data**")
+    st.markdown("\n".join(f"- {item}" for item in sections['available_data']))
+    st.markdown("**Expected Deliverables**")
+    st.markdown("\n".join(f"{i}. {item}" for i, item in enumerate(sections['deliverables'], 1)))
@@ -0,0 +1,260 @@
+import os
+import streamlit as st
+from utils.rerun_profiler import profiler
+from utils.seed_data import editable
+
+
+# Settings page
+def display_settings():
+    st.markdown("<div class='sub-header'>System Settings</div>", unsafe_allow_html=True)
+
+    # Settings card
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    # Tabs for different settings categories
+    tab1, tab2, tab3, tab4 = st.tabs(["AI Model Settings", "Assessment Configuration", "System Integration", "User Management"])
+
+    with tab1:
+        st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+        # AI model settings
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.selectbox("Default AI Model", ["llama3.2", "mistral"], index=0)
+            st.slider("Temperature", min_value=0.1, max_value=1.0, value=0.7, step=0.1)
+            st.slider("Max Tokens", min_value=256, max_value=4096, value=1024, step=256)
+
+        with col2:
+            st.selectbox("Backup Model (Fallback)", ["llama3.2", "mistral"], index=1)
+            st.number_input("Response Timeout (seconds)", min_value=10, max_value=120, value=30, step=5)
+            st.selectbox("Model Hosting", ["Local (Ollama)", "API Service", "Hybrid"], index=0)
+
+        # Advanced settings
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Advanced Settings</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.text_area("System Prompt Prefix",
+                         """You are EngE-AI, an engineering education assistant designed to help students develop critical thinking skills. Focus on guiding students to solutions rather than providing answers directly.""",
+                         height=100)
+            st.checkbox("Use Chain-of-Thought Prompting", value=True)
+
+        with col2:
+            st.number_input("Rate Limit (queries per minute)", min_value=5, max_value=60, value=20, step=5)
+            st.checkbox("Enforce Content Safety Filters", value=True)
+            st.checkbox("Log All Interactions", value=True)
+
+        if st.button("Save AI Model Settings", use_container_width=True):
+            st.success("AI model settings saved successfully!")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with tab2:
+        st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+        # Critical thinking dimensions
+        st.markdown("<p style='font-weight: 500;'>Critical Thinking Dimensions</p>", unsafe_allow_html=True)
+
+        dimensions = st.session_state.system_settings["critical_thinking_dimensions"]
+        dimension_names = []
+        for i, dim in enumerate(dimensions):
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                dimension_names.append(st.text_input(f"Dimension {i+1}", dim, key=f"dim_{i}"))
+            with col2:
+                st.selectbox("Weight", ["High", "Medium", "Low"], index=0, key=f"weight_{i}")
+
+        col1, col2 = st.columns([1, 4])
+        with col1:
+            if st.button("+ Add", use_container_width=True):
+                st.info("New dimension would be added here.")
+
+        # Assessment settings
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Assessment Settings</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.selectbox("Assessment Frequency", ["Weekly", "Bi-weekly", "Monthly", "Start/End of Term"], index=3)
+            st.number_input("Minimum Questions per Assessment", min_value=3, max_value=15, value=5)
+
+        with col2:
+            st.selectbox("Scoring Method", ["Numeric (0-100)", "Rubric Based", "Dimensional Analysis"], index=0)
+            st.checkbox("Require Written Justification", value=True)
+
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Rubric Configuration</p>", unsafe_allow_html=True)
+
+        rubric_levels = st.session_state.grader.ct_framework.rubric_levels
+
+        for level in rubric_levels:
+            st.markdown(f"""
+            <div style="display: flex; margin-bottom: 10px; border: 1px solid #E2E8F0; border-radius: 5px; padding: 10px;">
+                <div style="font-weight: 500; width: 120px;">{level['name']}</div>
+                <div style="flex-grow: 1;">{level['description']}</div>
+                <div style="width: 80px; text-align: right;">{level['score_range']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        if st.button("Save Assessment Configuration", use_container_width=True):
+            names = [name.strip() for name in dimension_names]
+            # Dimensions can be renamed but not removed, so the dimension charts keep one score per dimension
+            if not all(names) or len(set(names)) != len(names):
+                st.error("Every dimension needs a unique, non-empty name.")
+            else:
+                # The first edit copies the shared seed settings into this session
+                settings = editable(st.session_state, "system_settings")
+                settings["critical_thinking_dimensions"] = names
+                st.success("Assessment configuration saved successfully!")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with tab3:
+        st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+        # System integration settings
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.text_input("Database Connection String", st.session_state.system_settings["database_connection"])
+            st.selectbox("Database Type", ["MongoDB", "PostgreSQL", "SQLite", "MySQL"], index=0)
+            st.text_input("API Key", st.session_state.system_settings["api_key"], type="password")
+
+        with col2:
+            backup_options = ["Hourly", "Daily", "Weekly", "Monthly"]
+            backup_frequency = st.selectbox(
+                "Backup Frequency", backup_options,
+                index=backup_options.index(st.session_state.system_settings.get("backup_frequency", "Daily")))
+            st.text_input("Backup Location", "/srv/data/engai/backups")
+            st.selectbox("Integration Mode", ["Standalone", "LMS Integration", "API Service"], index=0)
+
+        # LMS integration
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Learning Management System Integration</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.selectbox("LMS Platform", ["Canvas", "Moodle", "Blackboard", "D2L Brightspace", "None"], index=4)
+            st.text_input("LMS API Endpoint", "https://canvas.ubc.ca/api/v1")
+
+        with col2:
+            st.text_input("LMS API Key", "lms_api_xxxxxxxxxxxxx", type="password")
+            st.multiselect("Data to Sync", ["Grades", "Assignments", "Student Roster", "Course Materials"], default=[])
+
+        # Analytics & logging
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Analytics & Logging</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.checkbox("Collect Usage Analytics", value=True)
+            st.checkbox("Log Student Interactions", value=True)
+            st.checkbox("Performance Monitoring", value=True)
+
+        with col2:
+            st.selectbox("Log Level", ["DEBUG", "INFO", "WARNING", "ERROR"], index=1)
+            st.text_input("Log File Path", "/var/log/engai/")
+            st.checkbox("Enable GDPR Compliance Mode", value=True)
+
+        if st.button("Save System Integration Settings", use_container_width=True):
+            # Credentials are not kept in session state; only the non-secret backup schedule is saved
+            editable(st.session_state, "system_settings")["backup_frequency"] = backup_frequency
+            st.success("System integration settings saved successfully!")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with tab4:
+        st.markdown("<div class='tab-content'>", unsafe_allow_html=True)
+
+        # User management
+        st.markdown("<p style='font-weight: 500;'>User Roles & Permissions</p>", unsafe_allow_html=True)
+
+        roles = [
+            {"role": "Administrator", "description": "Full system access", "users": 2},
+            {"role": "Instructor", "description": "Course management, scenario creation, assessment access", "users": 5},
+            {"role": "Teaching Assistant", "description": "Student assistance, limited assessment access", "users": 12},
+            {"role": "Student", "description": "Virtual tutor access, scenario practice", "users": 254}
+        ]
+
+        # Role management
+        for role in roles:
+            col1, col2, col3 = st.columns([2, 5, 1])
+            with col1:
+                st.markdown(f"""<div style="font-weight: 500;">{role['role']}</div>""", unsafe_allow_html=True)
+            with col2:
+                st.markdown(f"""{role['description']}""", unsafe_allow_html=True)
+            with col3:
+                st.markdown(f"""{role['users']} users""", unsafe_allow_html=True)
+
+        st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
+
+        # User import/export
+        col1, col2 = st.columns(2)
+        with col1:
+            st.file_uploader("Import Users from CSV", type=["csv"])
+        with col2:
+            st.selectbox("Export Format", ["CSV", "JSON", "Excel"])
+            st.button("Export Users", use_container_width=True)
+
+        # Single user management
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>User Management</p>", unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            st.text_input("Email", "user@example.com")
+        with col2:
+            st.selectbox("Role", ["Administrator", "Instructor", "Teaching Assistant", "Student"], index=3)
+        with col3:
+            st.button("Add User", use_container_width=True)
+
+        # Security settings
+        st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Security Settings</p>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.checkbox("Require Two-Factor Authentication for Admins", value=True)
+            st.number_input("Session Timeout (minutes)", min_value=15, max_value=240, value=60, step=15)
+        with col2:
+            st.checkbox("Enforce Strong Password Policy", value=True)
+            st.checkbox("Allow Single Sign-On (SSO)", value=True)
+
+        if st.button("Save User Management Settings", use_container_width=True):
+            st.success("User management settings saved successfully!")
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    display_performance_panel()
+
+
+# Admin-only rerun timing panel
+def display_performance_panel():
+    admin_key = os.getenv("ENGE_AI_ADMIN_KEY")
+    if not admin_key:
+        return
+
+    with st.expander("Performance (Admin)"):
+        if st.text_input("Admin Key", type="password", key="admin_key") != admin_key:
+            st.caption("Enter the admin key to view rerun timings.")
+            return
+
+        profiler.enabled = st.toggle("Profile reruns", value=profiler.enabled,
+                                     help="Applies to every session on this server")
+        report = profiler.get_report()
+        if not report["pages"]:
+            st.info("No reruns recorded yet. Enable profiling and use the app to collect timings.")
+        else:
+            st.markdown("<p style='font-weight: 500;'>Total Rerun Time by Page</p>", unsafe_allow_html=True)
+            st.dataframe([{"page": name, **stats} for name, stats in report["pages"].items()],
+                         use_container_width=True, hide_index=True)
+
+            st.markdown("<p style='font-weight: 500; margin-top: 20px;'>Sections (slowest p95 first)</p>",
+                        unsafe_allow_html=True)
+            st.dataframe([{"section": name, **stats} for name, stats in report["sections"].items()],
+                         use_container_width=True, hide_index=True)
+
+        if st.button("Reset Timings"):
+            profiler.reset()
+            st.rerun()
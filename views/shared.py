@@ -0,0 +1,24 @@
+# Scenario topics offered for each course
+COURSE_TOPICS = {
+    "CHBE 220 - Chemical Engineering Thermodynamics": [
+        "First Law of Thermodynamics",
+        "Second Law of Thermodynamics",
+        "Thermodynamic Cycles",
+        "Phase Equilibria",
+        "Chemical Reaction Equilibria"
+    ],
+    "CHBE 241 - Material and Energy Balances": [
+        "Mass Balances",
+        "Energy Balances",
+        "Reactive Systems",
+        "Multiple Unit Operations",
+        "Recycle Streams"
+    ],
+    "CHBE 262 - Environmental Engineering": [
+        "Air Pollution Control",
+        "Water Treatment",
+        "Solid Waste Management",
+        "Environmental Impact Assessment",
+        "Sustainability Analysis"
+    ]
+}
@@ -0,0 +1,137 @@
+import streamlit as st
+from utils.rerun_profiler import profiler
+
+
+# Messages shown per page of chat history
+CHAT_PAGE_SIZE = 20
+
+
+# Render one chat message to HTML
+def _message_html(message):
+    if message.role == "user":
+        return f"""
+        <div class="chat-message user-message">
+            <div style="font-weight: 500; margin-bottom: 5px;">You</div>
+            {message.content}
+        </div>
+        """
+    return f"""
+    <div class="chat-message ai-message">
+        <div style="font-weight: 500; margin-bottom: 5px;">EngE-AI Tutor</div>
+        {message.content}
+    </div>
+    """
+
+
+# Render the latest chat window from per-message HTML cached by message id
+def display_chat_history(tutor):
+    # The tutor's history is rendered directly, so each turn is stored once
+    history = tutor.get_history(st.session_state.session_id)
+    cache = st.session_state.get("chat_html", {})
+    window = st.session_state.setdefault("chat_window", CHAT_PAGE_SIZE)
+
+    hidden = max(0, len(history) - window)
+    if hidden and st.button(f"Load earlier messages ({hidden} hidden)", key="chat_load_earlier"):
+        st.session_state.chat_window = window = window + CHAT_PAGE_SIZE
+        hidden = max(0, len(history) - window)
+
+    visible = {}
+    for message in history[hidden:]:
+        visible[message.id] = cache.get(message.id) or _message_html(message)
+    # Only the rendered window stays cached, so the cache never outgrows what is on screen
+    st.session_state.chat_html = visible
+    if visible:
+        st.markdown("".join(visible.values()), unsafe_allow_html=True)
+
+
+# Send a question to the tutor, which records both turns in its history, and rerun to show the answer
+def ask_tutor(tutor, question):
+    with st.spinner("EngE-AI is thinking..."):
+        tutor.answer_question(
+            question,
+            mode="auto",  # Intent classifier picks the tutor mode
+            session_id=st.session_state.session_id,
+            model=st.session_state.model_name,
+            course=st.session_state.selected_course
+        )
+    # Rerun to refresh the chat display
+    st.rerun()
+
+
+# Virtual Tutor interface
+def display_virtual_tutor(tutor):
+    st.markdown("<div class='sub-header'>Virtual Engineering Tutor</div>", unsafe_allow_html=True)
+
+    # Course information
+    st.markdown(f"""
+    <div class="card">
+        <h3 style="margin-top: 0;">{st.session_state.selected_course}</h3>
+        <p>Ask questions about course concepts, problem-solving strategies, or request help with specific topics. The AI tutor adapts to your learning style and promotes critical thinking.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Chat interface
+    st.markdown("<div class='card'>", unsafe_allow_html=True)
+
+    # Display the most recent window of the chat history
+    with profiler.section("tutor.chat_rendering"):
+        display_chat_history(tutor)
+
+    # Input area; typing inside a form does not rerun the page until the question is sent
+    with st.form("chat_input", clear_on_submit=True, border=False):
+        user_input = st.text_area("Your question:", height=100)
+        col1, col2 = st.columns([1, 5])
+        with col1:
+            send = st.form_submit_button("Send", use_container_width=True)
+    if send and user_input:
+        ask_tutor(tutor, user_input)
+
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        if st.button("Clear Chat", use_container_width=True):
+            st.session_state.chat_html = {}
+            st.session_state.chat_window = CHAT_PAGE_SIZE
+            tutor.reset_conversation(st.session_state.session_id)
+            st.rerun()
+
+    # Suggested questions
+    st.markdown("<div style='margin-top: 20px;'>", unsafe_allow_html=True)
+    st.markdown("<p style='font-weight: 500; margin-bottom: 10px;'>Suggested questions:</p>", unsafe_allow_html=True)
+
+    sample_questions = [
+        "Explain the second law of thermodynamics with real-world examples",
+        "How do I solve problems involving phase equilibria?",
+        "What's the relationship between Gibbs free energy and spontaneity?",
+        "Can you explain entropy in simple terms?",
+        "How do I apply the first law to open systems?",
+        "What are practical applications of the Carnot cycle?"
+    ]
+
+    for i, column in enumerate(st.columns(3)):
+        with column:
+            for n, q in enumerate(sample_questions[i * 2:i * 2 + 2], start=i * 2):
+                if st.button(q, key=f"q_{n}", use_container_width=True):
+                    ask_tutor(tutor, q)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    display_walkthrough(tutor)
+
+
+# Critical thinking walkthrough: every stage is generated concurrently and shown as soon as it finishes
+def display_walkthrough(tutor):
+    with st.expander("Critical Thinking Walkthrough"):
+        problem = st.text_area("Problem or scenario", height=120, key="walkthrough_problem",
+                               placeholder="Paste a problem to work through identify, analyze, evaluate, create and reflect...")
+
+        if st.button("Start Walkthrough", use_container_width=True) and problem:
+            placeholders = {}
+            for key, stage in tutor.ct_framework.stages.items():
+                st.markdown(f"<p style='font-weight: 500; margin: 10px 0 0;'>{stage['name']}</p>", unsafe_allow_html=True)
+                placeholders[key] = st.empty()
+                placeholders[key].caption("Generating...")
+
+            for key, guidance in tutor.walkthrough(problem, model=st.session_state.model_name,
+                                                   course=st.session_state.selected_course):
+                placeholders[key].markdown(guidance)